@@ -4,8 +4,10 @@ import { NextResponse } from "next/server";
 import fs from "fs";
 import path from "path";
 import Papa from "papaparse";
+import { serveArtifact } from "../../lib/artifacts";
+import { latestDataFile } from "../../lib/manifest";
 
-// 🔧 CRITICAL: Disable all caching for dynamic data
+// Rendered per request; the published artifact is cached by ETag (see lib/artifacts)
 export const dynamic = "force-dynamic";
 export const revalidate = 0;
 
@@ -14,8 +16,12 @@ const USE_GITHUB_RAW = process.env.USE_GITHUB_RAW === "true";
 const GITHUB_REPO = process.env.GITHUB_REPO; // e.g., "username/liberian-pulse"
 const GITHUB_BRANCH = process.env.GITHUB_BRANCH || "main";
 
-export async function GET() {
+export async function GET(request) {
   try {
+    // Precomputed payload from update_latest_files.py, when published
+    const artifact = await serveArtifact(request, "artists");
+    if (artifact) return artifact;
+
     // OPTION 1: GitHub Raw URLs (for production on Vercel)
     if (USE_GITHUB_RAW && GITHUB_REPO) {
       return await fetchFromGitHub();
@@ -121,14 +127,20 @@ async function fetchFromLocalFiles() {
     });
   }
 
-  // Get all artist CSV files
-  const files = fs
-    .readdirSync(dataDir)
-    .filter(
-      (file) => file.startsWith("audiomack_artists_") && file.endsWith(".csv")
-    )
-    .sort()
-    .reverse();
+  // The manifest's latest file, else every artist CSV, newest name first
+  const listed = latestDataFile("artists");
+  const files = listed
+    ? [listed]
+    : fs
+        .readdirSync(dataDir)
+        .filter(
+          (file) =>
+            file.startsWith("audiomack_artists_") &&
+            file.endsWith(".csv") &&
+            !file.includes("with_growth")
+        )
+        .sort()
+        .reverse();
 
   // Fallback to old naming convention
   if (files.length === 0) {
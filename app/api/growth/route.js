@@ -4,13 +4,19 @@ import { NextResponse } from "next/server";
 import fs from "fs";
 import path from "path";
 import Papa from "papaparse";
+import { serveArtifact } from "../../lib/artifacts";
+import { latestDataFile } from "../../lib/manifest";
 
-// 🔧 CRITICAL: Disable all caching for dynamic data
+// Rendered per request; the published artifact is cached by ETag (see lib/artifacts)
 export const dynamic = "force-dynamic";
 export const revalidate = 0;
 
-export async function GET() {
+export async function GET(request) {
   try {
+    // Precomputed payload from update_latest_files.py, when published
+    const artifact = await serveArtifact(request, "growth");
+    if (artifact) return artifact;
+
     const dataDir = path.join(process.cwd(), "data");
 
     if (!fs.existsSync(dataDir)) {
@@ -22,26 +28,22 @@ export async function GET() {
       });
     }
 
-    // Find growth-enhanced CSV files
-    const artistFiles = fs
-      .readdirSync(dataDir)
-      .filter(
-        (file) =>
-          file.startsWith("audiomack_artists_with_growth_") &&
-          file.endsWith(".csv")
-      )
-      .sort()
-      .reverse();
-
-    const trackFiles = fs
-      .readdirSync(dataDir)
-      .filter(
-        (file) =>
-          file.startsWith("audiomack_tracks_with_growth_") &&
-          file.endsWith(".csv")
-      )
-      .sort()
-      .reverse();
+    // Find growth-enhanced CSV files (from the manifest when there is one)
+    const findGrowthFiles = (kind) => {
+      const listed = latestDataFile(`${kind}_with_growth`);
+      if (listed) return [listed];
+      return fs
+        .readdirSync(dataDir)
+        .filter(
+          (file) =>
+            file.startsWith(`audiomack_${kind}_with_growth_`) &&
+            file.endsWith(".csv")
+        )
+        .sort()
+        .reverse();
+    };
+    const artistFiles = findGrowthFiles("artists");
+    const trackFiles = findGrowthFiles("tracks");
 
     let artistGrowthData = [];
     let trackGrowthData = [];
@@ -0,0 +1,31 @@
+// app/api/summary/route.js - Per-artist rollups, leaderboards and sorted indexes
+// (precomputed by update_latest_files.py; indexes are positions in /api/data and /api/tracks)
+
+import { NextResponse } from "next/server";
+import { serveArtifact } from "../../lib/artifacts";
+
+export const dynamic = "force-dynamic";
+
+export async function GET(request) {
+  try {
+    const artifact = await serveArtifact(request, "summary");
+    if (artifact) return artifact;
+
+    return NextResponse.json(
+      {
+        error: "Summary not published",
+        message: "Run python update_latest_files.py --publish-only",
+      },
+      { status: 404 }
+    );
+  } catch (error) {
+    console.error("Error reading summary:", error);
+    return NextResponse.json(
+      {
+        error: "Failed to load summary",
+        message: error.message,
+      },
+      { status: 500 }
+    );
+  }
+}
@@ -4,8 +4,10 @@ import { NextResponse } from "next/server";
 import fs from "fs";
 import path from "path";
 import Papa from "papaparse";
+import { serveArtifact } from "../../lib/artifacts";
+import { latestDataFile } from "../../lib/manifest";
 
-// 🔧 CRITICAL: Disable all caching for dynamic data
+// Rendered per request; the published artifact is cached by ETag (see lib/artifacts)
 export const dynamic = "force-dynamic";
 export const revalidate = 0;
 
@@ -13,8 +15,12 @@ const USE_GITHUB_RAW = process.env.USE_GITHUB_RAW === "true";
 const GITHUB_REPO = process.env.GITHUB_REPO;
 const GITHUB_BRANCH = process.env.GITHUB_BRANCH || "main";
 
-export async function GET() {
+export async function GET(request) {
   try {
+    // Precomputed payload from update_latest_files.py, when published
+    const artifact = await serveArtifact(request, "tracks");
+    if (artifact) return artifact;
+
     if (USE_GITHUB_RAW && GITHUB_REPO) {
       return await fetchFromGitHub();
     }
@@ -110,13 +116,19 @@ async function fetchFromLocalFiles() {
     });
   }
 
-  const files = fs
-    .readdirSync(dataDir)
-    .filter(
-      (file) => file.startsWith("audiomack_tracks_") && file.endsWith(".csv")
-    )
-    .sort()
-    .reverse();
+  const listed = latestDataFile("tracks");
+  const files = listed
+    ? [listed]
+    : fs
+        .readdirSync(dataDir)
+        .filter(
+          (file) =>
+            file.startsWith("audiomack_tracks_") &&
+            file.endsWith(".csv") &&
+            !file.includes("with_growth")
+        )
+        .sort()
+        .reverse();
 
   if (files.length === 0) {
     return NextResponse.json({
@@ -120,6 +120,7 @@ export default function ArtistsTab({
                 <ArtistAvatar
                   name={artist.artist_name}
                   imageUrl={artist.profile_image}
+                  thumbUrl={artist.profile_image_thumb}
                   size="md"
                   className="group-hover:scale-110 transition-transform duration-300"
                 />
@@ -188,6 +189,7 @@ export default function ArtistsTab({
                 <ArtistAvatar
                   name={artist.artist_name}
                   imageUrl={artist.profile_image}
+                  thumbUrl={artist.profile_image_thumb}
                   size="lg"
                   className="group-hover:scale-110 transition-transform duration-300"
                 />
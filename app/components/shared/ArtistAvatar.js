@@ -8,10 +8,12 @@ import { User } from "lucide-react";
 export default function ArtistAvatar({
   name,
   imageUrl,
+  thumbUrl = null,
   size = "md",
   className = "",
 }) {
   const [imageError, setImageError] = useState(false);
+  const [thumbError, setThumbError] = useState(false);
 
   // Size configurations
   const sizes = {
@@ -50,18 +52,22 @@ export default function ArtistAvatar({
     .join("")
     .toUpperCase();
 
-  // Check if we should show image
-  const shouldShowImage = imageUrl && imageUrl !== "N/A" && !imageError;
+  // Prefer the local thumbnail; fall back to the full-size CDN image
+  const useThumb = thumbUrl && !thumbError;
+  const shouldShowImage =
+    useThumb || (imageUrl && imageUrl !== "N/A" && !imageError);
 
   return (
     <div className={`relative ${sizes[size]} ${className}`}>
       {shouldShowImage ? (
         <>
           <img
-            src={imageUrl}
+            src={useThumb ? thumbUrl : imageUrl}
             alt={name}
             className="w-full h-full rounded-full object-cover ring-2 ring-white/20 shadow-lg"
-            onError={() => setImageError(true)}
+            onError={() =>
+              useThumb ? setThumbError(true) : setImageError(true)
+            }
           />
           {/* Glow effect on hover */}
           <div className="absolute inset-0 rounded-full bg-gradient-to-br from-white/0 to-white/0 hover:from-white/10 hover:to-white/5 transition-all duration-300" />
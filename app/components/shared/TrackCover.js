@@ -9,12 +9,14 @@ export default function TrackCover({
   title,
   artist,
   imageUrl,
+  thumbUrl = null,
   size = "md",
   showPlayButton = false,
   onClick = null,
   className = "",
 }) {
   const [imageError, setImageError] = useState(false);
+  const [thumbError, setThumbError] = useState(false);
 
   // Size configurations
   const sizes = {
@@ -52,8 +54,10 @@ export default function TrackCover({
     .reduce((acc, char) => acc + char.charCodeAt(0), 0);
   const gradient = gradients[titleHash % gradients.length];
 
-  // Check if we should show image
-  const shouldShowImage = imageUrl && imageUrl !== "N/A" && !imageError;
+  // Prefer the local thumbnail; fall back to the full-size CDN image
+  const useThumb = thumbUrl && !thumbError;
+  const shouldShowImage =
+    useThumb || (imageUrl && imageUrl !== "N/A" && !imageError);
 
   const containerClasses = `relative ${
     sizes[size]
@@ -67,10 +71,12 @@ export default function TrackCover({
         <>
           {/* Album Art */}
           <img
-            src={imageUrl}
+            src={useThumb ? thumbUrl : imageUrl}
             alt={`${title} by ${artist}`}
             className="w-full h-full object-cover"
-            onError={() => setImageError(true)}
+            onError={() =>
+              useThumb ? setThumbError(true) : setImageError(true)
+            }
           />
 
           {/* Hover Overlay */}
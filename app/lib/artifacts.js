@@ -0,0 +1,73 @@
+// lib/artifacts.js - Serve the precomputed API payloads from data/api/
+// (written by update_latest_files.py after every scrape)
+
+import fs from "fs";
+import path from "path";
+import crypto from "crypto";
+
+const ARTIFACT_DIR = path.join(process.cwd(), "data", "api");
+
+const USE_GITHUB_RAW = process.env.USE_GITHUB_RAW === "true";
+const GITHUB_REPO = process.env.GITHUB_REPO;
+const GITHUB_BRANCH = process.env.GITHUB_BRANCH || "main";
+
+// Browsers revalidate every time (cheap 304 via ETag); the CDN may serve a
+// copy for a few minutes while it refetches in the background
+export const ARTIFACT_CACHE_CONTROL =
+  "public, max-age=0, s-maxage=300, stale-while-revalidate=3600";
+
+// name -> { etag, body }, reused while index.json says the ETag is unchanged
+const memory = new Map();
+
+function contentEtag(body) {
+  const digest = crypto.createHash("sha256").update(body).digest("hex");
+  return `"${digest.slice(0, 32)}"`;
+}
+
+function readLocalArtifact(name) {
+  const indexPath = path.join(ARTIFACT_DIR, "index.json");
+  if (!fs.existsSync(indexPath)) return null;
+
+  const index = JSON.parse(fs.readFileSync(indexPath, "utf-8"));
+  const entry = index.artifacts && index.artifacts[name];
+  if (!entry) return null;
+
+  const cached = memory.get(name);
+  if (cached && cached.etag === entry.etag) return cached;
+
+  const filePath = path.join(ARTIFACT_DIR, entry.file);
+  if (!fs.existsSync(filePath)) return null;
+  const artifact = { etag: entry.etag, body: fs.readFileSync(filePath) };
+  memory.set(name, artifact);
+  return artifact;
+}
+
+async function fetchGitHubArtifact(name) {
+  const url = `https://raw.githubusercontent.com/${GITHUB_REPO}/${GITHUB_BRANCH}/data/api/${name}.json`;
+  const response = await fetch(url, { next: { revalidate: 300 } });
+  if (!response.ok) return null;
+
+  const body = Buffer.from(await response.arrayBuffer());
+  return { etag: contentEtag(body), body };
+}
+
+// Response for a published artifact (304 when the client already has it),
+// or null when it has not been published, so the route can fall back to the CSVs
+export async function serveArtifact(request, name) {
+  const artifact =
+    USE_GITHUB_RAW && GITHUB_REPO
+      ? await fetchGitHubArtifact(name)
+      : readLocalArtifact(name);
+  if (!artifact) return null;
+
+  const headers = {
+    ETag: artifact.etag,
+    "Cache-Control": ARTIFACT_CACHE_CONTROL,
+  };
+  if (request.headers.get("if-none-match") === artifact.etag) {
+    return new Response(null, { status: 304, headers });
+  }
+  return new Response(artifact.body, {
+    headers: { ...headers, "Content-Type": "application/json; charset=utf-8" },
+  });
+}
@@ -0,0 +1,37 @@
+// lib/manifest.js - Look data files up in data/manifest.json
+// (written by update_latest_files.py) instead of scanning data/ per request
+
+import fs from "fs";
+import path from "path";
+
+const DATA_DIR = path.join(process.cwd(), "data");
+const MANIFEST_PATH = path.join(DATA_DIR, "manifest.json");
+
+// Parsed manifest, reused until the file is replaced
+let cached = null;
+
+function readManifest() {
+  let stat;
+  try {
+    stat = fs.statSync(MANIFEST_PATH);
+  } catch {
+    return null;
+  }
+  if (!cached || cached.mtimeMs !== stat.mtimeMs) {
+    cached = {
+      mtimeMs: stat.mtimeMs,
+      manifest: JSON.parse(fs.readFileSync(MANIFEST_PATH, "utf-8")),
+    };
+  }
+  return cached.manifest;
+}
+
+// File name in data/ for kind ("artists", "tracks", "artists_with_growth",
+// "tracks_with_growth"), or null when there is no manifest entry, so the
+// route can fall back to scanning the directory
+export function latestDataFile(kind) {
+  const manifest = readManifest();
+  const latest = manifest && manifest.latest && manifest.latest[kind];
+  if (!latest || !fs.existsSync(path.join(DATA_DIR, latest.file))) return null;
+  return latest.file;
+}
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Artwork cache for the Audiomack dashboard
+Album art and profile images are keyed by their normalized URL
+(artwork_key, written to the album_art_key / profile_image_key columns), so a
+cover shared by a single and its album, or served at several ?width= sizes,
+is one entry; any other query parameter (a new artwork version) makes a new
+key. Each key is downloaded once; its thumbnails are stored content-addressed
+under public/artwork/ (<sha256 of the image>-<size>.webp) and index.json maps
+keys to them. Keys already in the index are never fetched
+again, and identical images under different URLs share their thumbnail files.
+
+Cache the artwork of the newest snapshots in data/ (needs requests and Pillow):
+    python audiomack_artwork.py --data-dir data
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from audiomack_history import snapshot_info
+from audiomack_scheduler import NavigationError, RequestScheduler, RetryBudget
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+DEFAULT_ARTWORK_DIR = 'public/artwork'
+ARTWORK_URL_PREFIX = '/artwork'  # Where DEFAULT_ARTWORK_DIR is served by Next.js
+INDEX_FILE = 'index.json'
+
+# Thumbnail edge lengths in pixels; md covers every avatar/cover size the cards use (up to 192px)
+THUMBNAIL_SIZES = {'md': 256}
+THUMBNAIL_QUALITY = 80
+
+IMAGE_COLUMNS = {'artists': 'profile_image', 'tracks': 'album_art'}
+
+# Query parameters that only pick a rendition of the same image
+SIZE_PARAMS = frozenset({'width', 'height', 'w', 'h', 'size', 'max', 'quality', 'q', 'format'})
+
+FETCH_RATE = 4.0  # Image downloads per second
+FETCH_TIMEOUT = 20
+
+
+def normalize_image_url(url):
+    """
+    Scheme/host lowercased, fragment and SIZE_PARAMS dropped; other query
+    parameters (an artwork version, say) are kept, in sorted order
+    """
+    parts = urlsplit(url.strip())
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if name.lower() not in SIZE_PARAMS)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), ''))
+
+
+def artwork_key(url):
+    """Stable local key of an image URL, or 'N/A' when there is no image"""
+    if not url or not url.startswith('http'):
+        return 'N/A'
+    return hashlib.sha1(normalize_image_url(url).encode('utf-8')).hexdigest()[:16]
+
+
+class ArtworkCache:
+    """Thumbnails by artwork key, content-addressed on disk"""
+
+    def __init__(self, directory=DEFAULT_ARTWORK_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self.index_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.index_path)
+
+    def thumbnail_url(self, key, size='md'):
+        """Public URL of a key's thumbnail, or None if it is not cached"""
+        entry = self.index.get(key)
+        if not entry or size not in entry.get('thumbnails', {}):
+            return None
+        return f"{ARTWORK_URL_PREFIX}/{entry['thumbnails'][size]}"
+
+    def add(self, key, url, data):
+        """Store the thumbnails of one downloaded image under key"""
+        digest = hashlib.sha256(data).hexdigest()[:24]
+        thumbnails = {}
+        image = None
+        for size, edge in THUMBNAIL_SIZES.items():
+            name = f"{digest}-{size}.webp"
+            path = os.path.join(self.directory, name)
+            if not os.path.exists(path):
+                if image is None:
+                    image = Image.open(io.BytesIO(data))
+                    image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+                thumbnail = image.copy()
+                thumbnail.thumbnail((edge, edge))
+                thumbnail.save(path, 'WEBP', quality=THUMBNAIL_QUALITY)
+            thumbnails[size] = name
+        self.index[key] = {'url': url, 'sha256': digest, 'bytes': len(data), 'thumbnails': thumbnails}
+
+    def sync(self, urls, scheduler=None):
+        """
+        Download and thumbnail every image URL whose key is not cached yet,
+        once per key. Returns (cached, fetched, failed) counts.
+        """
+        if requests is None or Image is None:
+            print("⚠️  Artwork cache needs requests and Pillow (pip install requests pillow)")
+            return 0, 0, 0
+
+        pending = {}
+        for url in urls:
+            key = artwork_key(url)
+            if key != 'N/A' and key not in self.index:
+                pending.setdefault(key, url)
+        cached = len({artwork_key(url) for url in urls} - {'N/A'}) - len(pending)
+
+        os.makedirs(self.directory, exist_ok=True)
+        scheduler = scheduler or RequestScheduler(FETCH_RATE, retry_budget=RetryBudget())
+        session = requests.Session()
+        fetched = failed = 0
+        for key, url in pending.items():
+            try:
+                response = scheduler.fetch(url, lambda: session.get(url, timeout=FETCH_TIMEOUT))
+                if response.status_code != 200:
+                    raise NavigationError(url, f"HTTP {response.status_code}")
+                self.add(key, url, response.content)
+                fetched += 1
+                if fetched % 50 == 0:
+                    self.save()
+            except Exception as e:
+                print(f"   ⚠️  Artwork {url[:60]}: {e}")
+                failed += 1
+        self.save()
+        return cached, fetched, failed
+
+
+def image_urls(path, kind):
+    """Image URLs in a snapshot CSV of kind 'artists' or 'tracks'"""
+    column = IMAGE_COLUMNS[kind]
+    with open(path, newline='', encoding='utf-8') as f:
+        return [row.get(column) for row in csv.DictReader(f)]
+
+
+def newest_snapshot(data_dir, kind):
+    """Newest timestamped snapshot of kind in data_dir, else its latest file, else None"""
+    snapshots = sorted((info[1], name) for name in os.listdir(data_dir)
+                       if (info := snapshot_info(name)) and info[0] == kind)
+    if snapshots:
+        return os.path.join(data_dir, snapshots[-1][1])
+    latest = os.path.join(data_dir, f"audiomack_{kind}_latest.csv")
+    return latest if os.path.exists(latest) else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache thumbnails of the artwork in the newest snapshots")
+    parser.add_argument('--data-dir', default='data', help="directory with the snapshot CSVs")
+    parser.add_argument('--artwork-dir', default=DEFAULT_ARTWORK_DIR, help="thumbnail cache directory")
+    args = parser.parse_args()
+
+    urls = []
+    for kind in IMAGE_COLUMNS:
+        path = newest_snapshot(args.data_dir, kind)
+        if path:
+            urls.extend(image_urls(path, kind))
+
+    cache = ArtworkCache(args.artwork_dir)
+    cached, fetched, failed = cache.sync(urls)
+    print(f"🖼️  Artwork: {fetched} fetched, {cached} already cached, {failed} failed "
+          f"({len(cache.index)} images in {args.artwork_dir})")
+
+
+if __name__ == '__main__':
+    main()
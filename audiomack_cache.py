@@ -0,0 +1,176 @@
+"""
+On-disk response cache for the Audiomack scraper's browser
+Routing requests through Playwright (as the resource filter does) turns off
+Chromium's own HTTP cache, so every run downloaded every JS bundle and
+stylesheet again. This cache sits in the same route chain: static assets are
+stored by URL with their Cache-Control lifetime and validators, served from
+disk while fresh and revalidated with If-None-Match / If-Modified-Since once
+stale. The directory lives under state/, which CI restores between runs.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+DEFAULT_CACHE_DIR = 'state/http_cache'
+
+# Only static assets are cached; documents and API responses are always fetched
+CACHED_RESOURCE_TYPES = ('script', 'stylesheet', 'font')
+# Entries not used for this long are deleted by prune()
+MAX_IDLE_DAYS = 14
+
+MAX_AGE_RE = re.compile(r'(?:^|,)\s*max-age\s*=\s*(\d+)', re.I)
+# Describe the original transfer, not the decoded body that is stored
+DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection',
+                   'keep-alive', 'set-cookie', 'date', 'age'}
+
+
+def cache_lifetime(headers):
+    """Seconds a response may be served without revalidation, or None if it must not be stored"""
+    cache_control = headers.get('cache-control', '').lower()
+    if 'no-store' in cache_control or 'private' in cache_control:
+        return None
+    match = MAX_AGE_RE.search(cache_control)
+    if match and 'no-cache' not in cache_control:
+        return int(match.group(1))
+    if headers.get('etag') or headers.get('last-modified'):
+        return 0  # Stored, but revalidated on every use
+    return None
+
+
+class ResponseCache:
+    """
+    context.route handler serving static assets from disk. Requests it does
+    not cache are passed on with route.fallback(), so it must be installed
+    before the resource filter (Playwright runs the last installed handler first).
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, resource_types=CACHED_RESOURCE_TYPES):
+        self.directory = directory
+        self.resource_types = set(resource_types)
+        self._lock = threading.Lock()
+        self.counts = Counter()
+
+    def install(self, context):
+        os.makedirs(self.directory, exist_ok=True)
+        context.route('**/*', self.handle)
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        folder = os.path.join(self.directory, key[:2])
+        return os.path.join(folder, f"{key}.json"), os.path.join(folder, f"{key}.body")
+
+    def _load(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        return (meta, body) if meta.get('url') == url else (None, None)
+
+    def _store(self, url, status, headers, lifetime, body=None):
+        """Write an entry (body=None keeps the stored body and only refreshes the metadata)"""
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        if body is not None:
+            with open(body_path + suffix, 'wb') as f:
+                f.write(body)
+            os.replace(body_path + suffix, body_path)
+        meta = {
+            'url': url,
+            'status': status,
+            'headers': {name: value for name, value in headers.items() if name.lower() not in DROPPED_HEADERS},
+            'stored': time.time(),
+            'lifetime': lifetime,
+        }
+        with open(meta_path + suffix, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + suffix, meta_path)
+
+    def _count(self, outcome, size):
+        with self._lock:
+            self.counts[outcome] += 1
+            self.counts[f"{outcome}_bytes"] += size
+
+    def handle(self, route):
+        request = route.request
+        if request.method != 'GET' or request.resource_type not in self.resource_types:
+            route.fallback()
+            return
+
+        url = request.url
+        meta, body = self._load(url)
+        if meta is not None and time.time() - meta['stored'] < meta['lifetime']:
+            os.utime(self._paths(url)[0])
+            self._count('hit', len(body))
+            route.fulfill(status=meta['status'], headers=meta['headers'], body=body)
+            return
+
+        headers = dict(request.headers)
+        if meta is not None:
+            stored = {name.lower(): value for name, value in meta['headers'].items()}
+            if stored.get('etag'):
+                headers['if-none-match'] = stored['etag']
+            if stored.get('last-modified'):
+                headers['if-modified-since'] = stored['last-modified']
+
+        try:
+            response = route.fetch(headers=headers)
+        except Exception:
+            route.fallback()
+            return
+
+        if response.status == 304 and meta is not None:
+            lifetime = cache_lifetime(response.headers)
+            self._store(url, meta['status'], {**meta['headers'], **response.headers},
+                        meta['lifetime'] if lifetime is None else lifetime)
+            self._count('revalidated', len(body))
+            route.fulfill(status=meta['status'], headers=meta['headers'], body=body)
+            return
+
+        fetched = response.body()
+        lifetime = cache_lifetime(response.headers)
+        if response.status == 200 and lifetime is not None:
+            self._store(url, response.status, response.headers, lifetime, fetched)
+        self._count('miss', len(fetched))
+        route.fulfill(response=response, body=fetched)
+
+    def prune(self, max_idle_days=MAX_IDLE_DAYS):
+        """Delete entries not used for max_idle_days; returns how many were removed"""
+        cutoff = time.time() - max_idle_days * 86400
+        removed = 0
+        for folder, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                meta_path = os.path.join(folder, name)
+                if os.path.getmtime(meta_path) < cutoff:
+                    for path in (meta_path, meta_path[:-len('.json')] + '.body'):
+                        try:
+                            os.remove(path)
+                        except OSError:
+                            pass
+                    removed += 1
+        return removed
+
+    def summary(self):
+        with self._lock:
+            return dict(self.counts)
+
+    def print_summary(self):
+        counts = self.summary()
+        served = counts.get('hit', 0) + counts.get('revalidated', 0)
+        if not served and not counts.get('miss'):
+            return
+        saved = (counts.get('hit_bytes', 0) + counts.get('revalidated_bytes', 0)) / 1e6
+        print(f"💽 Response cache: {counts.get('hit', 0)} hits, {counts.get('revalidated', 0)} revalidated, "
+              f"{counts.get('miss', 0)} misses | {saved:.1f} MB served from disk, "
+              f"{counts.get('miss_bytes', 0) / 1e6:.1f} MB downloaded")
@@ -0,0 +1,66 @@
+"""
+Run-wide track registry for the Audiomack scraper
+Collaborations and features appear in the /songs catalog of every artist on
+them. The registry hands each canonical track URL to the first artist whose
+catalog lists it, so the song is scraped and written once per run, and
+records every artist-track pair for the audiomack_track_artists_<run_id> file.
+"""
+
+import threading
+from urllib.parse import urlsplit
+
+
+def canonical_track_url(url):
+    """Dedup key of a track URL: absolute, lowercased, without query, fragment or trailing slash"""
+    url = url.strip()
+    if url.startswith('/'):
+        url = f"https://audiomack.com{url}"
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return f"https://{host}{parts.path.rstrip('/')}".lower()
+
+
+class TrackRegistry:
+    """
+    Canonical track URL -> artists listing it, for one run. Every pair is
+    streamed to sink (if given) as a track_artists row; 'primary' marks the
+    artist whose tracks row carries the song.
+    """
+
+    def __init__(self, sink=None):
+        self.sink = sink
+        self._owners = {}
+        self._artists = {}
+        self._lock = threading.Lock()
+
+    def claim(self, track_url, artist_url, artist_name):
+        """Record that artist_url lists track_url; True if it is the first artist to, and so scrapes it"""
+        key = canonical_track_url(track_url)
+        with self._lock:
+            listed = self._artists.setdefault(key, set())
+            if artist_url in listed:
+                return False  # Listed twice in one catalog (e.g. with and without a trailing slash)
+            listed.add(artist_url)
+            primary = key not in self._owners
+            if primary:
+                self._owners[key] = artist_url
+            if self.sink is not None:
+                self.sink.write({'track_url': track_url, 'artist_url': artist_url,
+                                 'artist_name': artist_name, 'primary': primary})
+        return primary
+
+    def claim_all(self, artist_url, artist_name, track_urls):
+        """The track_urls this artist is the first to list, in catalog order"""
+        return [url for url in track_urls if self.claim(url, artist_url, artist_name)]
+
+    @property
+    def tracks(self):
+        return len(self._owners)
+
+    @property
+    def shared(self):
+        """Tracks listed by more than one artist"""
+        with self._lock:
+            return sum(1 for artists in self._artists.values() if len(artists) > 1)
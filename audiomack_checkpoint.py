@@ -0,0 +1,140 @@
+"""
+Checkpoint journal for long scrape runs
+Every artist and track result is appended to a JSON-lines journal as soon as
+it is scraped, so a crashed or timed-out run can be resumed with --resume
+"""
+
+import glob
+import json
+import os
+import threading
+from datetime import datetime
+
+from audiomack_records import ArtistRecord, TrackRecord
+
+DEFAULT_CHECKPOINT_DIR = 'checkpoints'
+
+
+class Checkpoint:
+    """
+    Append-only journal of one scrape run.
+
+    Records are {'type': 'run'|'artist'|'track', ...}. On resume, artists that
+    have a record are not visited again (their catalog is reused) and tracks
+    that have a record for that artist are skipped. Rows are journaled as
+    typed JSON (as_json) and restored as ArtistRecord / TrackRecord.
+    """
+
+    def __init__(self, path, run_id, started_at):
+        self.path = path
+        self.run_id = run_id
+        self.started_at = started_at
+        self._artists = {}
+        self._tracks = {}
+        self._lock = threading.Lock()
+        self._file = None
+
+    @classmethod
+    def start(cls, directory=DEFAULT_CHECKPOINT_DIR, run_id=None):
+        """Open a fresh journal for a new run"""
+        started_at = datetime.now()
+        run_id = run_id or started_at.strftime('%Y%m%d_%H%M%S')
+        os.makedirs(directory, exist_ok=True)
+
+        checkpoint = cls(os.path.join(directory, f"run_{run_id}.jsonl"), run_id,
+                         started_at.strftime('%Y-%m-%d %H:%M:%S'))
+        checkpoint._open('w')
+        checkpoint._write({'type': 'run', 'run_id': run_id, 'started_at': checkpoint.started_at})
+        return checkpoint
+
+    @classmethod
+    def resume(cls, path=None, directory=DEFAULT_CHECKPOINT_DIR):
+        """Reopen a journal (the newest one in directory if path is None) and load it"""
+        if path is None:
+            journals = sorted(glob.glob(os.path.join(directory, 'run_*.jsonl')))
+            if not journals:
+                return None
+            path = journals[-1]
+
+        checkpoint = None
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a half-written last line
+                    continue
+
+                if record['type'] == 'run':
+                    checkpoint = cls(path, record['run_id'], record['started_at'])
+                elif checkpoint is None:
+                    continue
+                elif record['type'] == 'artist':
+                    checkpoint._artists[record['url']] = (ArtistRecord.from_row(record['data']),
+                                                          record['track_urls'])
+                elif record['type'] == 'track':
+                    checkpoint._tracks[(record['artist_url'], record['data']['track_url'])] = \
+                        TrackRecord.from_row(record['data'])
+
+        if checkpoint is None:
+            return None
+
+        checkpoint._open('a')
+        if checkpoint._file.tell() and not line.endswith('\n'):
+            # Terminate a half-written last line before appending to it
+            checkpoint._file.write('\n')
+        return checkpoint
+
+    def _open(self, mode):
+        self._file = open(self.path, mode, encoding='utf-8')
+
+    def _write(self, record):
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._file.flush()
+
+    @property
+    def artist_count(self):
+        return len(self._artists)
+
+    @property
+    def track_count(self):
+        return len(self._tracks)
+
+    def artist(self, url):
+        """(artist_data, track_urls) recorded for an artist, or None"""
+        return self._artists.get(url)
+
+    def track(self, artist_url, track_url):
+        """Track row recorded for this artist's track, or None"""
+        return self._tracks.get((artist_url, track_url))
+
+    def record_artist(self, url, artist_data, track_urls):
+        """Journal a scraped artist; error rows are not kept so they get retried"""
+        if artist_data.failed:
+            return
+        with self._lock:
+            self._artists[url] = (artist_data, list(track_urls))
+        self._write({'type': 'artist', 'url': url, 'data': artist_data.as_json(extras=True),
+                     'track_urls': list(track_urls)})
+
+    def record_track(self, artist_url, track_data):
+        """Journal a track row (failed tracks are None and get retried)"""
+        if not track_data:
+            return
+        with self._lock:
+            self._tracks[(artist_url, track_data.track_url)] = track_data
+        self._write({'type': 'track', 'artist_url': artist_url, 'data': track_data.as_json()})
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def finish(self):
+        """The run's output is safely written: drop the journal"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
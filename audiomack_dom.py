@@ -0,0 +1,191 @@
+"""
+Batched DOM extraction for the Audiomack scraper
+Everything the scraper reads from a page's DOM (title, artwork, avatar,
+release date, sidebar, body text) comes back from one injected page.evaluate
+call configured by the selector lists below, instead of one Playwright
+round-trip per locator, count and attribute
+"""
+
+import re
+
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June',
+               'July', 'August', 'September', 'October', 'November', 'December']
+
+# Field specs, per page type. Every spec lists CSS selectors tried in order and
+# how to read the match:
+#   'text'  - innerText of the first matching element
+#   'texts' - innerText of every matching element
+#   'image' - first http(s) URL in src, data-src or a background-image style
+# 'has_text' keeps only elements whose text contains it (like Playwright's
+# :has-text) and 'inner' then reads a descendant of that element.
+TRACK_DOM = {
+    'h1': {'read': 'text', 'selectors': ['h1']},
+    'album_art': {'read': 'image', 'selectors': [
+        'img.SinglePageMusicCardImage',
+        'img[data-testid="SinglePageMusicCardImage"]',
+    ]},
+    'release_date': {'read': 'text', 'selectors': ['li.SinglePageMusicCardInfo-row'],
+                     'has_text': 'Release Date', 'inner': '.SinglePageMusicCardInfo-value span span'},
+    'info_values': {'read': 'texts', 'selectors': ['.SinglePageMusicCardInfo-row .TooltipTitle span']},
+}
+
+ARTIST_DOM = {
+    'sidebar_name': {'read': 'text', 'selectors': ['a.ArtistSidebar-name-link']},
+    'h1': {'read': 'text', 'selectors': ['h1']},
+    'profile_image': {'read': 'image', 'selectors': [
+        'img.ArtistAvatar',
+        # keep a fallback that still checks class contains ArtistAvatar if Audiomack varies
+        'img[class*="ArtistAvatar"]',
+    ]},
+    'sidebar': {'read': 'text', 'selectors': ['.ArtistSidebar-info, .artist-info, [class*="sidebar"]']},
+}
+
+EXTRACT_JS = """([fields, withBody]) => {
+    const isHttp = url => typeof url === 'string' && url.startsWith('http');
+    const imageUrl = el => {
+        for (const attr of ['src', 'data-src']) {
+            const url = el.getAttribute(attr);
+            if (isHttp(url)) return url;
+        }
+        const style = el.getAttribute('style');
+        if (style && style.includes('background-image')) {
+            const match = style.match(/url\\(["']?([^"']+)["']?\\)/);
+            if (match && isHttp(match[1])) return match[1];
+        }
+        return null;
+    };
+    const matches = (spec, selector) => {
+        let els = Array.from(document.querySelectorAll(selector));
+        if (spec.has_text) {
+            const needle = spec.has_text.toLowerCase();
+            els = els.filter(el => (el.textContent || '').toLowerCase().includes(needle));
+        }
+        if (spec.inner) {
+            els = els.map(el => el.querySelector(spec.inner)).filter(Boolean);
+        }
+        return els;
+    };
+
+    const record = {page_title: document.title, body: null};
+    for (const [name, spec] of Object.entries(fields)) {
+        let value = spec.read === 'texts' ? [] : null;
+        for (const selector of spec.selectors) {
+            // A selector that throws (e.g. invalid on this page) is skipped, like
+            // the per-locator path does, instead of failing every field
+            try {
+                const els = matches(spec, selector);
+                if (!els.length) continue;
+                if (spec.read === 'texts') {
+                    value = els.map(el => el.innerText.trim());
+                    break;
+                }
+                if (spec.read === 'image') {
+                    value = imageUrl(els[0]);
+                    if (value) break;
+                    continue;
+                }
+                value = els[0].innerText;
+                break;
+            } catch (e) {
+                continue;
+            }
+        }
+        record[name] = value;
+    }
+    if (withBody && document.body) record.body = document.body.innerText;
+    return record;
+}"""
+
+STYLE_URL_RE = re.compile(r'url\(["\']?([^"\']+)["\']?\)')
+
+
+def read_dom(page, fields, with_body=False, batched=True):
+    """
+    Read the fields of a page type (TRACK_DOM, ARTIST_DOM) plus the page
+    title and, if asked, the body text. Returns a dict with one key per field
+    ('texts' fields are lists, the rest a string or None) and 'page_title' /
+    'body'. batched=False reads them with individual locator calls instead,
+    which is also the fallback when the batched evaluate itself fails. A field
+    whose selectors all fail comes back empty (None / []), never failing the page.
+    """
+    if batched:
+        try:
+            return page.evaluate(EXTRACT_JS, [fields, with_body])
+        except Exception:
+            pass
+
+    record = {'page_title': page.title(), 'body': page.inner_text('body') if with_body else None}
+    for name, spec in fields.items():
+        if spec['read'] == 'image':
+            record[name] = extract_image_url(page, _locator_selectors(spec))
+            continue
+
+        value = [] if spec['read'] == 'texts' else None
+        for selector in _locator_selectors(spec):
+            try:
+                locator = page.locator(selector)
+                if locator.count() == 0:
+                    continue
+                if spec['read'] == 'texts':
+                    value = [element.inner_text().strip() for element in locator.all()]
+                else:
+                    value = locator.first.inner_text()
+                break
+            except Exception:
+                continue
+        record[name] = value
+    return record
+
+
+def _locator_selectors(spec):
+    """The spec's selectors as Playwright selectors (:has-text and the inner part folded in)"""
+    selectors = []
+    for selector in spec['selectors']:
+        if spec.get('has_text'):
+            selector = f'{selector}:has-text("{spec["has_text"]}")'
+        if spec.get('inner'):
+            selector = f"{selector} {spec['inner']}"
+        selectors.append(selector)
+    return selectors
+
+
+def extract_image_url(page, selectors):
+    """
+    Extract image URL from page using multiple selector strategies
+    Returns the first valid image URL found (None if there is none)
+    """
+    for selector in selectors:
+        try:
+            if page.locator(selector).count() > 0:
+                element = page.locator(selector).first
+
+                # Try getting src attribute
+                img_url = element.get_attribute('src')
+                if img_url and img_url.startswith('http'):
+                    return img_url
+
+                # Try getting data-src (lazy loaded images)
+                img_url = element.get_attribute('data-src')
+                if img_url and img_url.startswith('http'):
+                    return img_url
+
+                # Try getting background-image from style
+                style = element.get_attribute('style')
+                if style and 'background-image' in style:
+                    match = STYLE_URL_RE.search(style)
+                    if match:
+                        img_url = match.group(1)
+                        if img_url.startswith('http'):
+                            return img_url
+        except Exception:
+            continue
+
+    return None
+
+
+def first_month_text(texts):
+    """First text that mentions a month name (the release-date tooltip)"""
+    for text in texts or []:
+        if any(month in text for month in MONTH_NAMES):
+            return text
+    return None
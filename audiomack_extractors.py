@@ -0,0 +1,319 @@
+"""
+Stat extractors for Audiomack page text
+All patterns are compiled once at import. Each stat is located by a keyword
+found with a plain substring search, so the page text is no longer run
+through a dozen separate regex searches per page.
+
+parse_number / parse_number_column turn count strings like '1.2K' into exact
+integers (None when there is no number), for code that needs real values
+rather than the CSV text format.
+"""
+
+import re
+from decimal import Decimal
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+NUMBER = r'([\d,.KMB]+)'
+NUMBER_CHARS = set('0123456789,.KMB')
+MONTHS = r'(?:January|February|March|April|May|June|July|August|September|October|November|December)'
+
+# Every stat is located by a keyword. For each field the rules below list,
+# in priority order, where its value sits relative to the keyword:
+#   'before' - a number right before it     e.g. '1.49K Favorites'
+#   'after'  - a number right after it      e.g. 'Favorites: 1490'
+#   'date'   - a date right after it        e.g. 'Member since: June 14, 2016'
+#   'window' - a date on the keyword's line or one of the 4 lines after it
+# For each field the best-priority rule that matches anywhere wins, taking its
+# first match, exactly like running re.search over the old pattern lists in turn.
+#
+# The anchor is a lowercase literal every keyword match starts with; it is
+# located with str.find on the lowercased text and the exact keyword regex is
+# only tried at those positions.
+#
+# (field, anchor, keyword, ignore_case, [(priority, position), ...])
+TRACK_RULES = [
+    ('plays', 'total', r'[Tt]otal\s*[Pp]lays?', True, [(0, 'before'), (1, 'after')]),
+    ('likes', 'favorite', r'[Ff]avorites?', False, [(0, 'before'), (2, 'after')]),
+    ('likes', 'like', r'[Ll]ikes?', False, [(1, 'before'), (3, 'after')]),
+    ('playlist_adds', 'playlist', r'[Pp]laylist\s*[Aa]dds?', False, [(0, 'before'), (1, 'after')]),
+    ('reposts', 'repost', r'[Rr]eposts?', False, [(0, 'before'), (2, 'after')]),
+    ('reposts', 'share', r'[Ss]hares?', False, [(1, 'before')]),
+    ('release_date', 'release date', r'release date', True, [(0, 'window')]),
+]
+
+ARTIST_RULES = [
+    ('followers', 'follower', r'[Ff]ollowers?', False, [(0, 'before'), (1, 'after')]),
+    ('followers', 'fan', r'[Ff]ans?', False, [(2, 'before')]),
+    ('total_plays', 'total', r'[Tt]otal\s*[Aa]ccount\s*[Pp]lays?', False, [(0, 'before'), (1, 'after')]),
+    ('monthly_listeners', 'monthly', r'[Mm]onthly\s*[Ll]isteners?', False, [(0, 'before'), (1, 'after')]),
+    ('member_since', 'member since', r'member since', True, [(0, 'date')]),
+    ('member_since', 'joined', r'joined', True, [(1, 'date')]),
+]
+
+# Fields that hold counts (normalized with extract_number); the rest are dates
+NUMERIC_FIELDS = {'plays', 'likes', 'reposts', 'playlist_adds',
+                  'followers', 'total_plays', 'monthly_listeners'}
+
+NUMBER_RE = re.compile(r'([\d.]+)\s*([KMB]?)', re.IGNORECASE)
+# Whole part, fraction digits, suffix: the number extract_number reads ('.5K', '500.', '12Kb' -> K).
+# The lookarounds keep it non-empty and reject malformed runs like '1.2.3K' as a whole, as
+# extract_number does, instead of reading part of them.
+PARSE_NUMBER_PATTERN = r'(?<![.0-9])(?=\.?[0-9])([0-9]*)(?:\.([0-9]*))?(?![.0-9])\s*([KMB]?)'
+PARSE_NUMBER_RE = re.compile(PARSE_NUMBER_PATTERN, re.IGNORECASE)
+MULTIPLIERS = {'': 1, 'K': 1000, 'M': 1000000, 'B': 1000000000}
+ANY_NUMBER_RE = re.compile(NUMBER)
+AFTER_NUMBER_RE = re.compile(r'\s*[:\-]?\s*' + NUMBER)
+AFTER_NUMBER_RE_I = re.compile(r'\s*[:\-]?\s*' + NUMBER, re.IGNORECASE)
+AFTER_DATE_RE = re.compile(r':?\s*(\w+\s+\d{1,2},?\s+\d{4})', re.IGNORECASE)
+RELEASE_DATE_RE = re.compile(MONTHS + r'\s+\d{1,2},?\s+\d{4}', re.IGNORECASE)
+MEMBER_SINCE_RES = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'Member since:?\s*(\w+\s+\d{1,2},?\s+\d{4})',
+    r'Joined:?\s*(\w+\s+\d{1,2},?\s+\d{4})',
+)]
+
+
+def extract_number(text):
+    """Extract numbers from text like '1.2K', '500', '1M' etc."""
+    if not text or text == "N/A":
+        return "N/A"
+
+    text = text.replace(',', '').strip()
+
+    match = NUMBER_RE.search(text)
+    if match:
+        num = match.group(1)
+        suffix = match.group(2).upper()
+
+        if suffix:
+            try:
+                # Decimal, not float: int(1.15 * 1000) is 1149
+                return str(int(Decimal(num) * MULTIPLIERS[suffix]))
+            except ArithmeticError:
+                return text
+        return num
+
+    return text
+
+
+def parse_number(value):
+    """
+    Typed counterpart of extract_number: '1.2K' -> 1200, '131,000' -> 131000,
+    'N/A' / 'Error' / None -> None. Suffixes are applied exactly and any
+    remaining fraction is truncated.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return None if value != value else int(value)
+
+    match = PARSE_NUMBER_RE.search(str(value).replace(',', ''))
+    if not match:
+        return None
+    whole, fraction, suffix = match.groups()
+    number = Decimal(f"{whole or '0'}.{fraction or '0'}") * MULTIPLIERS[suffix.upper()]
+    return int(number)
+
+
+def parse_number_column(values):
+    """
+    Vectorized parse_number for a whole column (a pandas Series or any
+    sequence of strings), e.g. a year of audiomack_tracks_*.csv plays.
+    Returns a nullable Int64 Series with the same values parse_number gives,
+    computed in integer arithmetic (no float rounding).
+    """
+    if pd is None:
+        raise ImportError("pandas is required for parse_number_column (pip install pandas)")
+
+    text = pd.Series(values, dtype='string').str.replace(',', '', regex=False)
+    index = text.index
+    text = text.reset_index(drop=True)
+    result = pd.Series(pd.NA, index=text.index, dtype='Int64')
+
+    # Most stored values are already plain digits: convert those directly
+    digits = text.str.fullmatch('[0-9]+').fillna(False).astype(bool)
+    result[digits] = text[digits].astype('Int64')
+
+    # ...and values without any digit ('N/A', 'Error') stay null
+    rest = text[~digits & text.str.contains('[0-9]').fillna(False).astype(bool)]
+    if len(rest):
+        parts = rest.str.extract(PARSE_NUMBER_PATTERN, flags=re.IGNORECASE)
+        # Values with digits but no well-formed number ('1.2.3K') stay null too
+        parts = parts[parts[0].notna()]
+        whole, fraction, suffix = parts[0].replace('', '0'), parts[1], parts[2]
+        multiplier = suffix.fillna('').str.upper().map(MULTIPLIERS).astype('Int64')
+        # Nine fraction digits are enough for exact truncation with multipliers up to 1e9
+        nanos = fraction.fillna('').str.slice(0, 9).str.pad(9, side='right', fillchar='0').astype('Int64')
+        result[parts.index] = whole.astype('Int64') * multiplier + nanos * multiplier // 1000000000
+    result.index = index
+    return result
+
+
+def normalize_number_columns(frame, columns):
+    """Replace the given count columns of a DataFrame (read as text) with Int64 columns, in place"""
+    for column in columns:
+        if column in frame:
+            frame[column] = parse_number_column(frame[column])
+    return frame
+
+
+def _number_before(text, start, ignore_case):
+    """The run of number characters ending just before text[start] (whitespace allowed between)"""
+    end = start
+    while end > 0 and text[end - 1].isspace():
+        end -= 1
+    begin = end
+    while begin > 0 and (text[begin - 1] in NUMBER_CHARS or
+                         (ignore_case and text[begin - 1] in 'kmb')):
+        begin -= 1
+    return text[begin:end] or None
+
+
+def _date_in_window(text, start):
+    """First date on the line containing text[start] or one of the 4 lines after it"""
+    line_start = text.rfind('\n', 0, start) + 1
+    for _ in range(5):
+        line_end = text.find('\n', line_start)
+        if line_end == -1:
+            line_end = len(text)
+        match = RELEASE_DATE_RE.search(text, line_start, line_end)
+        if match:
+            return match.group(0)
+        if line_end == len(text):
+            return None
+        line_start = line_end + 1
+    return None
+
+
+class StatExtractor:
+    """
+    Compiled keyword rules for one page type. The text is lowercased once,
+    keyword anchors are found with str.find (C speed, no regex backtracking),
+    and values are read with small anchored matches at those positions only,
+    instead of running a dozen full-text re.search calls per page.
+    """
+
+    def __init__(self, rules):
+        self.fields = []
+        self._rules = []
+        for field, anchor, keyword, ignore_case, positions in rules:
+            if field not in self.fields:
+                self.fields.append(field)
+            self._rules.append((
+                field,
+                anchor,
+                re.compile(keyword, re.IGNORECASE if ignore_case else 0),
+                re.compile(re.escape(anchor), re.IGNORECASE),
+                ignore_case,
+                positions,
+            ))
+
+    def extract(self, text):
+        """Raw matched text per field (None where nothing matched)"""
+        lower = text.lower()
+        if len(lower) != len(text):
+            # A few characters change length when lowercased; positions would drift
+            lower = None
+
+        best = {}
+        for field, anchor, keyword_re, anchor_re, ignore_case, positions in self._rules:
+            # Positions this rule can still improve on, in priority order
+            wanted = positions if field not in best else [(p, w) for p, w in positions if p < best[field][0]]
+            if not wanted:
+                continue
+            for start in self._anchors(text, lower, anchor, anchor_re):
+                keyword = keyword_re.match(text, start)
+                if not keyword:
+                    continue
+                for priority, where in wanted:
+                    value = self._value(text, keyword, where, ignore_case)
+                    if value is not None:
+                        if field not in best or priority < best[field][0]:
+                            best[field] = (priority, value)
+                        wanted = [(p, w) for p, w in wanted if p < priority]
+                        break
+                if not wanted:
+                    break
+
+        return {field: best[field][1] if field in best else None for field in self.fields}
+
+    @staticmethod
+    def _anchors(text, lower, anchor, anchor_re):
+        if lower is None:
+            for match in anchor_re.finditer(text):
+                yield match.start()
+            return
+        start = lower.find(anchor)
+        while start != -1:
+            yield start
+            start = lower.find(anchor, start + 1)
+
+    @staticmethod
+    def _value(text, keyword, where, ignore_case):
+        if where == 'before':
+            return _number_before(text, keyword.start(), ignore_case)
+        if where == 'after':
+            regex = AFTER_NUMBER_RE_I if ignore_case else AFTER_NUMBER_RE
+            after = regex.match(text, keyword.end())
+            return after.group(1) if after else None
+        if where == 'date':
+            after = AFTER_DATE_RE.match(text, keyword.end())
+            return after.group(1) if after else None
+        return _date_in_window(text, keyword.start())
+
+
+TRACK_EXTRACTOR = StatExtractor(TRACK_RULES)
+ARTIST_EXTRACTOR = StatExtractor(ARTIST_RULES)
+
+
+def _normalize(raw):
+    stats = {}
+    for field, value in raw.items():
+        if value is None:
+            stats[field] = "N/A"
+        elif field in NUMERIC_FIELDS:
+            stats[field] = extract_number(value)
+        else:
+            stats[field] = value
+    return stats
+
+
+def extract_plays_from_lines(all_text):
+    """Fallback: a number next to a line mentioning 'Plays' (not playlists)"""
+    lines = all_text.split('\n')
+    for i, line in enumerate(lines):
+        if 'Plays' in line and 'Playlist' not in line and 'Added' not in line:
+            for check_line in lines[max(0, i-1):i+2]:
+                match = ANY_NUMBER_RE.search(check_line)
+                if match:
+                    potential_plays = extract_number(match.group(1))
+                    if potential_plays != "N/A":
+                        return potential_plays
+    return "N/A"
+
+
+def extract_track_stats(all_text):
+    """plays, likes, reposts, playlist_adds and release_date from track page text"""
+    stats = _normalize(TRACK_EXTRACTOR.extract(all_text))
+    if stats['plays'] == "N/A":
+        stats['plays'] = extract_plays_from_lines(all_text)
+    return stats
+
+
+def extract_artist_stats(all_text):
+    """followers, total_plays, monthly_listeners and member_since from artist page text"""
+    return _normalize(ARTIST_EXTRACTOR.extract(all_text))
+
+
+def extract_member_since(text):
+    """Member-since date from a smaller block of text (e.g. the sidebar)"""
+    for regex in MEMBER_SINCE_RES:
+        match = regex.search(text)
+        if match:
+            return match.group(1)
+    return "N/A"
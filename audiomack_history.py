@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Time-series history of every scraped artist and track
+A SQLite store that ingests each run's snapshot CSVs and keeps, per artist URL
+and track URL, one segment for every stretch of runs whose values did not
+change (first_run .. last_run). Unchanged rows only extend their segment, so
+a year of daily runs stays small, and a series for one entity is an index
+lookup instead of a scan over every snapshot file. The snapshot CSVs in data/
+can be deleted after 30 days without losing history, and the *_latest.csv
+views can be regenerated from the store (update_latest_files.py --from-history).
+
+Ingest every snapshot not in the store yet:
+    python audiomack_history.py --ingest data
+Print a track's series for the last year:
+    python audiomack_history.py --series https://audiomack.com/artist/song/track --days 365
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime, timedelta
+
+DEFAULT_HISTORY_DB = 'state/audiomack_history.db'
+
+SNAPSHOT_RE = re.compile(r'^audiomack_(artists|tracks)_(\d{8}_\d{6})\.csv$')
+RUN_ID_FORMAT = '%Y%m%d_%H%M%S'
+KEYS = {'artists': 'url', 'tracks': 'track_url'}
+
+# Count columns, stored per segment; every other column (names, URLs, artwork,
+# dates) is stored once per distinct value set in the attributes table
+STAT_COLUMNS = {
+    'artists': ('followers', 'total_plays', 'monthly_listeners', 'tracks_found'),
+    'tracks': ('plays', 'likes', 'reposts', 'playlist_adds'),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    kind TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    columns TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    PRIMARY KEY (kind, run_id)
+);
+CREATE TABLE IF NOT EXISTS entities (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    head INTEGER,
+    UNIQUE (kind, key)
+);
+CREATE TABLE IF NOT EXISTS attributes (
+    id INTEGER PRIMARY KEY,
+    data TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    entity INTEGER NOT NULL,
+    first_run TEXT NOT NULL,
+    last_run TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    timestamp TEXT,
+    attributes INTEGER NOT NULL,
+    stats TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_series ON segments (entity, last_run);
+CREATE INDEX IF NOT EXISTS segments_run ON segments (last_run, position);
+"""
+
+
+def entity_key(url):
+    """Join key of an artist or track URL (case and trailing slash ignored)"""
+    return (url or '').strip().rstrip('/').lower()
+
+
+def snapshot_info(path):
+    """(kind, run_id) of a snapshot file name, or None for any other file"""
+    match = SNAPSHOT_RE.match(os.path.basename(path))
+    return match.groups() if match else None
+
+
+class HistoryStore:
+    """Run-length encoded history of snapshot rows, per kind and entity"""
+
+    def __init__(self, path=DEFAULT_HISTORY_DB):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def last_run(self, kind):
+        """Newest ingested run id of a kind, or None"""
+        row = self._conn.execute('SELECT MAX(run_id) FROM runs WHERE kind = ?', (kind,)).fetchone()
+        return row[0]
+
+    def ingest(self, kind, run_id, columns, rows):
+        """
+        Add one run's rows. Runs must come in chronological order; a run that is
+        already stored or older than the newest one is skipped (returns False).
+        """
+        last = self.last_run(kind)
+        if last is not None and run_id <= last:
+            if run_id < last:
+                print(f"⚠️  Skipping {kind} run {run_id}: older than the newest stored run {last}")
+            return False
+
+        key_field = KEYS[kind]
+        stat_columns = STAT_COLUMNS[kind]
+        latest = {}
+        for position, row in enumerate(rows):
+            key = entity_key(row.get(key_field))
+            if key:
+                latest[key] = (position, row)
+
+        heads = {
+            row['key']: (row['id'], row['head'], row['attributes'], row['stats'])
+            for row in self._conn.execute(
+                'SELECT entities.id, key, head, attributes, stats FROM entities '
+                'LEFT JOIN segments ON segments.id = head WHERE kind = ?', (kind,))
+        }
+        extend, insert = [], []
+        with self._conn:
+            for key, (position, row) in latest.items():
+                attributes = self._attributes_id({c: row.get(c) for c in columns
+                                                  if c != 'timestamp' and c not in stat_columns})
+                stats = json.dumps([row.get(c) for c in stat_columns], ensure_ascii=False)
+                entity = heads.get(key)
+                if entity is not None and entity[1] is not None and entity[2:] == (attributes, stats):
+                    extend.append((run_id, position, row.get('timestamp'), entity[1]))
+                    continue
+                if entity is None:
+                    entity_id = self._conn.execute(
+                        'INSERT INTO entities (kind, key) VALUES (?, ?)', (kind, key)).lastrowid
+                else:
+                    entity_id = entity[0]
+                insert.append((entity_id, run_id, run_id, position, row.get('timestamp'), attributes, stats))
+
+            self._conn.executemany(
+                'UPDATE segments SET last_run = ?, position = ?, timestamp = ? WHERE id = ?', extend)
+            for values in insert:
+                segment = self._conn.execute(
+                    'INSERT INTO segments (entity, first_run, last_run, position, timestamp, attributes, stats) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)', values).lastrowid
+                self._conn.execute('UPDATE entities SET head = ? WHERE id = ?', (segment, values[0]))
+            self._conn.execute('INSERT INTO runs (kind, run_id, columns, rows) VALUES (?, ?, ?, ?)',
+                               (kind, run_id, json.dumps(list(columns)), len(latest)))
+        print(f"🗄️  {kind} {run_id}: {len(insert)} changed, {len(extend)} unchanged")
+        return True
+
+    def _attributes_id(self, attributes):
+        data = json.dumps(attributes, ensure_ascii=False)
+        row = self._conn.execute('SELECT id FROM attributes WHERE data = ?', (data,)).fetchone()
+        if row is not None:
+            return row[0]
+        return self._conn.execute('INSERT INTO attributes (data) VALUES (?)', (data,)).lastrowid
+
+    def _row(self, kind, segment):
+        """The snapshot row a segment stands for"""
+        row = json.loads(segment['data'])
+        row.update(zip(STAT_COLUMNS[kind], json.loads(segment['stats'])))
+        row['timestamp'] = segment['timestamp']
+        return row
+
+    def ingest_file(self, path):
+        """Ingest a snapshot CSV named audiomack_<kind>_<run_id>.csv"""
+        info = snapshot_info(path)
+        if info is None:
+            print(f"⚠️  Not a snapshot file: {path}")
+            return False
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+        return self.ingest(*info, reader.fieldnames or [], rows)
+
+    def ingest_paths(self, paths):
+        """Ingest snapshot files and directories of them, oldest run first; returns the count ingested"""
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                files.extend(glob.glob(os.path.join(path, 'audiomack_*.csv')))
+            else:
+                files.append(path)
+        snapshots = sorted((info[1], info[0], path) for path in files if (info := snapshot_info(path)))
+        return sum(1 for run_id, kind, path in snapshots
+                   if run_id > (self.last_run(kind) or '') and self.ingest_file(path))
+
+    def latest_rows(self, kind):
+        """(columns, rows) of the newest ingested run, rebuilt from the store in scrape order"""
+        run = self._conn.execute(
+            'SELECT run_id, columns FROM runs WHERE kind = ? ORDER BY run_id DESC LIMIT 1', (kind,)).fetchone()
+        if run is None:
+            return None
+        columns = json.loads(run['columns'])
+        rows = []
+        for segment in self._conn.execute(
+                'SELECT timestamp, data, stats FROM segments '
+                'JOIN entities ON entities.id = entity JOIN attributes ON attributes.id = segments.attributes '
+                'WHERE kind = ? AND last_run = ? ORDER BY position', (kind, run['run_id'])):
+            row = self._row(kind, segment)
+            rows.append({column: row.get(column) for column in columns})
+        return columns, rows
+
+    def series(self, kind, url, days=365, now=None):
+        """
+        Segments of one artist or track over the last days, oldest first:
+        [(first_run, last_run, row)], where row holds the values seen from
+        first_run through last_run (its timestamp is the last scrape's).
+        """
+        since = ((now or datetime.now()) - timedelta(days=days)).strftime(RUN_ID_FORMAT)
+        segments = self._conn.execute(
+            'SELECT first_run, last_run, timestamp, data, stats FROM segments '
+            'JOIN entities ON entities.id = entity JOIN attributes ON attributes.id = segments.attributes '
+            'WHERE kind = ? AND key = ? AND last_run >= ? ORDER BY first_run',
+            (kind, entity_key(url), since))
+        return [(segment['first_run'], segment['last_run'], self._row(kind, segment)) for segment in segments]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Artist/track history store")
+    parser.add_argument('--db', default=DEFAULT_HISTORY_DB, help="history database path")
+    parser.add_argument('--ingest', nargs='+', metavar='PATH',
+                        help="snapshot CSVs or directories to ingest (new runs only)")
+    parser.add_argument('--series', metavar='URL', help="print the history of an artist or track URL")
+    parser.add_argument('--days', type=int, default=365, help="how far back --series goes")
+    args = parser.parse_args()
+
+    store = HistoryStore(args.db)
+    try:
+        if args.ingest:
+            print(f"✅ Ingested {store.ingest_paths(args.ingest)} run(s) into {args.db}")
+        if args.series:
+            kind = 'tracks' if '/song/' in args.series or '/album/' in args.series else 'artists'
+            for first_run, last_run, row in store.series(kind, args.series, args.days):
+                stats = ', '.join(f"{k}={v}" for k, v in row.items()
+                                  if k not in ('timestamp', 'artist_name', 'track_title', 'url', 'track_url',
+                                               'album_art', 'profile_image'))
+                print(f"{first_run} .. {last_run}  {stats}")
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
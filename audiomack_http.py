@@ -0,0 +1,226 @@
+"""
+Browserless fast path for the Audiomack scraper
+Fetches artist and track pages over a pooled keep-alive HTTP client (httpx
+with HTTP/2 when httpx and h2 are installed, requests otherwise) and reads
+the fields straight from the server-rendered HTML: embedded page state
+(__NEXT_DATA__ / window.__*__ assignments / JSON-LD), meta tags and the page
+text. Callers fall back to the Playwright path when a required field is
+missing, so a page that only renders client-side costs one cheap request.
+"""
+
+import html as html_lib
+import json
+import re
+import threading
+
+from audiomack_extractors import (extract_artist_stats, extract_member_since, extract_number,
+                                  extract_track_stats)
+from audiomack_network import extract_artist_image, extract_track_data
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+TIMEOUT = 20  # Seconds per request
+POOL_SIZE = 16  # Keep-alive connections kept open per host
+
+# Fields a page must yield for its fast-path row to be used instead of the browser
+REQUIRED_TRACK_FIELDS = ('track_title', 'plays', 'likes')
+REQUIRED_ARTIST_FIELDS = ('artist_name', 'followers', 'total_plays')
+
+NEXT_DATA_RE = re.compile(r'<script[^>]*\bid=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.S | re.I)
+LD_JSON_RE = re.compile(r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.S | re.I)
+STATE_ASSIGN_RE = re.compile(r'window\.__[A-Za-z_]+__\s*=\s*')
+META_RE = re.compile(r'<meta\b[^>]*>', re.I)
+ATTR_RE = re.compile(r'([\w:-]+)\s*=\s*("([^"]*)"|\'([^\']*)\')')
+H1_RE = re.compile(r'<h1\b[^>]*>(.*?)</h1>', re.S | re.I)
+TITLE_RE = re.compile(r'<title\b[^>]*>(.*?)</title>', re.S | re.I)
+INVISIBLE_RE = re.compile(r'<(script|style|noscript|template)\b.*?</\1\s*>', re.S | re.I)
+BLOCK_TAG_RE = re.compile(r'<(?:br|/?(?:p|div|li|ul|ol|h[1-6]|section|article|header|footer|tr|td|span|a|button))\b[^>]*>', re.I)
+TAG_RE = re.compile(r'<[^>]+>')
+BLANK_LINES_RE = re.compile(r'[ \t]*\n\s*')
+
+_JSON = json.JSONDecoder()
+
+
+class HttpClient:
+    """
+    Pooled keep-alive HTTP client. httpx's client is shared by all threads;
+    with requests each thread gets its own Session (they are not thread-safe).
+    """
+
+    def __init__(self, pool_size=POOL_SIZE, timeout=TIMEOUT):
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._client = None
+        self._local = threading.local()
+        if httpx is not None:
+            limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+            try:
+                self._client = httpx.Client(http2=True, headers=HEADERS, limits=limits,
+                                            timeout=timeout, follow_redirects=True)
+                self.protocol = 'HTTP/2'
+            except ImportError:
+                # http2=True needs the h2 package
+                self._client = httpx.Client(headers=HEADERS, limits=limits,
+                                            timeout=timeout, follow_redirects=True)
+                self.protocol = 'HTTP/1.1'
+        elif requests is not None:
+            self.protocol = 'HTTP/1.1'
+        else:
+            raise ImportError("the HTTP fast path needs httpx or requests (pip install httpx[http2])")
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._local.session = session
+        return session
+
+    def get(self, url):
+        if self._client is not None:
+            return self._client.get(url)
+        return self._session().get(url, timeout=self.timeout)
+
+    def fetch_html(self, url, scheduler):
+        """The page's HTML, paced and retried by scheduler; None unless it is a 200 HTML response"""
+        response = scheduler.fetch(url, lambda: self.get(url))
+        if response.status_code != 200 or 'html' not in response.headers.get('content-type', ''):
+            return None
+        return response.text
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+
+
+def page_state(html):
+    """Every JSON blob embedded in the page: __NEXT_DATA__, window.__*__ state and JSON-LD"""
+    payloads = []
+    for match in NEXT_DATA_RE.finditer(html):
+        try:
+            payloads.append(json.loads(html_lib.unescape(match.group(1))))
+        except ValueError:
+            pass
+    for match in STATE_ASSIGN_RE.finditer(html):
+        try:
+            payloads.append(_JSON.raw_decode(html, match.end())[0])
+        except ValueError:
+            pass
+    for match in LD_JSON_RE.finditer(html):
+        try:
+            payloads.append(json.loads(match.group(1)))
+        except ValueError:
+            pass
+    return payloads
+
+
+def meta_tags(html):
+    """<meta property|name=... content=...> values, first one wins"""
+    tags = {}
+    for tag in META_RE.findall(html):
+        attrs = {name.lower(): html_lib.unescape(double or single)
+                 for name, _, double, single in ATTR_RE.findall(tag)}
+        key = attrs.get('property') or attrs.get('name') or attrs.get('itemprop')
+        if key and 'content' in attrs:
+            tags.setdefault(key.lower(), attrs['content'].strip())
+    return tags
+
+
+def page_text(html):
+    """Visible text, one block element per line, roughly like inner_text('body')"""
+    text = INVISIBLE_RE.sub(' ', html)
+    text = BLOCK_TAG_RE.sub('\n', text)
+    text = html_lib.unescape(TAG_RE.sub(' ', text))
+    return BLANK_LINES_RE.sub('\n', text).strip()
+
+
+def _inner_text(regex, html):
+    match = regex.search(html)
+    if not match:
+        return None
+    return html_lib.unescape(TAG_RE.sub('', match.group(1))).strip() or None
+
+
+def _title_part(html, meta, index):
+    """Part index of the '<artist> - <title> | Audiomack' page title, or None"""
+    title = meta.get('og:title') or _inner_text(TITLE_RE, html) or ''
+    parts = title.split(' - ')
+    if len(parts) > index:
+        return parts[index].split('|')[0].strip() or None
+    return None
+
+
+def parse_track_html(html, track_url):
+    """
+    Track fields from a server-rendered track page: track_title, album_art,
+    plays, likes, reposts, playlist_adds and release_date ("N/A" where not found)
+    """
+    meta = meta_tags(html)
+    data = extract_track_data(page_state(html), track_url)
+    text = None
+
+    stats = {}
+    for field in ('plays', 'likes', 'reposts', 'playlist_adds'):
+        stats[field] = extract_number(str(data[field])) if field in data else "N/A"
+    if any(value == "N/A" for value in stats.values()):
+        text = page_text(html)
+        text_stats = extract_track_stats(text)
+        for field, value in stats.items():
+            if value == "N/A":
+                stats[field] = text_stats[field]
+
+    release_date = data.get('release_date')
+    if not release_date:
+        text = text if text is not None else page_text(html)
+        release_date = extract_track_stats(text)['release_date']
+
+    fields = {
+        'track_title': _inner_text(H1_RE, html) or _title_part(html, meta, 1) or "N/A",
+        'album_art': data.get('album_art') or meta.get('og:image') or "N/A",
+        'release_date': release_date or "N/A",
+    }
+    fields.update(stats)
+    return fields
+
+
+def parse_artist_html(html, artist_url):
+    """
+    Artist fields from a server-rendered artist page: artist_name,
+    profile_image, followers, total_plays, monthly_listeners and member_since.
+    profile_image is the avatar from the embedded page state, like the
+    browser path reads it; og:image (a share card) is only the fallback.
+    """
+    meta = meta_tags(html)
+    text = page_text(html)
+    fields = {
+        'artist_name': _inner_text(H1_RE, html) or _title_part(html, meta, 0) or "N/A",
+        'profile_image': extract_artist_image(page_state(html), artist_url) or meta.get('og:image') or "N/A",
+    }
+    fields.update(extract_artist_stats(text))
+    if fields['member_since'] == "N/A":
+        fields['member_since'] = extract_member_since(text)
+    return fields
+
+
+def missing_fields(fields, required):
+    """Required fields the fast path could not fill"""
+    return [field for field in required if fields.get(field) in (None, '', "N/A")]
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Snapshot manifest for data/
+data/manifest.json indexes every timestamped snapshot (run id, scrape time,
+row count, checksum and schema version) and records which file each 'latest'
+lookup resolves to. Newest means newest run id, never file times, which a
+git checkout resets; readers (update_latest_files.py, the API routes) look
+files up in the manifest instead of scanning the directory.
+
+Snapshots are immutable once written, so a refresh only reads files that are
+new or changed size. Everything here is written through a temp file and
+renamed into place, so a reader never sees half a file.
+
+Rebuild / inspect the manifest:
+    python audiomack_manifest.py [--data-dir data]
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+
+from audiomack_history import RUN_ID_FORMAT
+
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+
+SNAPSHOT_KINDS = ('artists', 'tracks', 'artists_with_growth', 'tracks_with_growth', 'track_artists')
+SNAPSHOT_FILE_RE = re.compile(
+    r'^audiomack_(' + '|'.join(sorted(SNAPSHOT_KINDS, key=len, reverse=True)) + r')_(\d{8}_\d{6})\.csv$')
+
+
+def atomic_write(path, write, binary=False):
+    """Call write(file) on a temp file next to path, then rename it over path"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        if binary:
+            with open(tmp, 'wb') as f:
+                write(f)
+        else:
+            with open(tmp, 'w', newline='', encoding='utf-8') as f:
+                write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def atomic_copy(source, dest):
+    """Copy source over dest atomically"""
+    def write(f):
+        with open(source, 'rb') as src:
+            shutil.copyfileobj(src, f)
+    atomic_write(dest, write, binary=True)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_header_and_count(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        columns = next(reader, [])
+        return columns, sum(1 for _ in reader)
+
+
+class Manifest:
+    """The snapshot index of one data directory"""
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, MANIFEST_FILE)
+        self.data = {'version': MANIFEST_VERSION, 'schemas': {}, 'snapshots': {}, 'latest': {}}
+
+    @classmethod
+    def load(cls, data_dir='data', refresh=True):
+        """The manifest of data_dir (empty if there is none yet), brought up to date with the files"""
+        manifest = cls(data_dir)
+        if os.path.exists(manifest.path):
+            with open(manifest.path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                manifest.data = data
+        if refresh:
+            manifest.refresh()
+        return manifest
+
+    def _schema(self, kind, columns):
+        """Schema version of a column list: 1 for the first one seen for kind, then 2, 3, ..."""
+        schemas = self.data['schemas'].setdefault(kind, [])
+        if columns not in schemas:
+            schemas.append(columns)
+        return schemas.index(columns) + 1
+
+    def refresh(self):
+        """Index new snapshot files and drop the ones that are gone; returns the number indexed"""
+        snapshots = self.data['snapshots']
+        present = set()
+        found = []
+        for name in os.listdir(self.data_dir):
+            match = SNAPSHOT_FILE_RE.match(name)
+            if match:
+                present.add(name)
+                found.append((match.group(2), match.group(1), name))
+
+        indexed = 0
+        for run_id, kind, name in sorted(found):
+            path = os.path.join(self.data_dir, name)
+            entry = snapshots.get(name)
+            if entry is not None and entry['bytes'] == os.path.getsize(path):
+                continue
+            columns, rows = _read_header_and_count(path)
+            snapshots[name] = {
+                'kind': kind,
+                'run_id': run_id,
+                'scraped_at': datetime.strptime(run_id, RUN_ID_FORMAT).isoformat(),
+                'rows': rows,
+                'bytes': os.path.getsize(path),
+                'sha256': file_sha256(path),
+                'schema': self._schema(kind, columns),
+            }
+            indexed += 1
+        for name in set(snapshots) - present:
+            del snapshots[name]
+        self.data['snapshots'] = dict(sorted(snapshots.items()))
+
+        # Derived files are served as they are: their latest is simply the newest run
+        for kind in SNAPSHOT_KINDS:
+            if kind in ('artists', 'tracks'):
+                continue
+            newest = self.newest(kind)
+            if newest is None:
+                self.data['latest'].pop(kind, None)
+            else:
+                self.data['latest'][kind] = {'file': newest, 'run_id': snapshots[newest]['run_id']}
+        return indexed
+
+    def snapshots(self, kind):
+        """File names of kind's snapshots, oldest run first"""
+        return [name for name, entry in self.data['snapshots'].items() if entry['kind'] == kind]
+
+    def newest(self, kind):
+        """File name of kind's newest snapshot, or None"""
+        names = self.snapshots(kind)
+        return max(names, key=lambda name: self.data['snapshots'][name]['run_id']) if names else None
+
+    def newest_path(self, kind):
+        name = self.newest(kind)
+        return os.path.join(self.data_dir, name) if name else None
+
+    def latest(self, kind):
+        """The 'latest' record of kind: {'file', 'source', 'run_id', ...}, or None"""
+        return self.data['latest'].get(kind)
+
+    def set_latest(self, kind, file, source=None, run_id=None):
+        """Record that file (e.g. audiomack_artists_latest.csv) now holds snapshot source / run run_id"""
+        path = os.path.join(self.data_dir, file)
+        columns, rows = _read_header_and_count(path)
+        entry = self.data['snapshots'].get(source, {})
+        self.data['latest'][kind] = {
+            'file': file,
+            'source': source,
+            'run_id': entry.get('run_id', run_id),
+            'rows': rows,
+            'sha256': file_sha256(path),
+            'schema': self._schema(kind, columns),
+        }
+
+    def save(self):
+        """Write the manifest atomically (content only depends on the files, so reruns are no-ops)"""
+        self.data['latest'] = dict(sorted(self.data['latest'].items()))
+        atomic_write(self.path, lambda f: json.dump(self.data, f, indent=1, ensure_ascii=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the snapshot manifest of a data directory")
+    parser.add_argument('--data-dir', default='data', help="directory with the snapshot CSVs")
+    args = parser.parse_args()
+
+    manifest = Manifest.load(args.data_dir, refresh=False)
+    indexed = manifest.refresh()
+    manifest.save()
+    print(f"🗂️  Manifest: {len(manifest.data['snapshots'])} snapshots ({indexed} newly indexed) in {manifest.path}")
+    for kind in SNAPSHOT_KINDS:
+        latest = manifest.latest(kind)
+        if latest:
+            print(f"   {kind:<20} {latest['file']} (run {latest['run_id']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Run instrumentation for the Audiomack scraper
+Timed spans around every stage of a page visit (navigation, readiness wait,
+DOM read, text extraction, catalog paging, output) and counters for retries,
+failures and fields that came back "N/A", per selector or pattern. At the end
+of a run the spans are written as JSON lines next to the CSVs, with a
+p50/p95 summary per stage, so slow nights can be traced to a stage and
+concurrency tuned from the numbers
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+MISSING_VALUES = ('N/A', 'Error', None, '', [])
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list (0.0 when empty)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class RunMetrics:
+    """Thread-safe spans and counters for one run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans = []
+        self.counters = Counter()
+
+    @contextmanager
+    def span(self, stage, **labels):
+        """Time the body as one span of stage; a body that raises is recorded with ok=False"""
+        start = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            record = {'stage': stage, 'seconds': round(time.perf_counter() - start, 4), 'ok': ok}
+            record.update(labels)
+            with self._lock:
+                self.spans.append(record)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def count_missing(self, source, record, fields=None):
+        """Count the fields of record (a dict from one selector set or pattern set) that came back empty"""
+        with self._lock:
+            for field in fields or record:
+                if record.get(field) in MISSING_VALUES:
+                    self.counters[f"missing.{source}.{field}"] += 1
+
+    def summary(self):
+        """Per stage: count, failures, total / p50 / p95 / max seconds"""
+        with self._lock:
+            spans = list(self.spans)
+
+        durations = {}
+        failures = Counter()
+        for span in spans:
+            durations.setdefault(span['stage'], []).append(span['seconds'])
+            if not span['ok']:
+                failures[span['stage']] += 1
+
+        summary = {}
+        for stage, values in sorted(durations.items()):
+            values.sort()
+            summary[stage] = {
+                'count': len(values),
+                'failures': failures[stage],
+                'total': round(sum(values), 3),
+                'p50': percentile(values, 50),
+                'p95': percentile(values, 95),
+                'max': values[-1],
+            }
+        return summary
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        print(f"\n📏 Stage timings:")
+        for stage, stats in summary.items():
+            print(f"  {stage:<12} n={stats['count']:<5} total={stats['total']:>8.1f}s p50={stats['p50']:.2f}s "
+                  f"p95={stats['p95']:.2f}s max={stats['max']:.2f}s failures={stats['failures']}")
+        with self._lock:
+            missing = sorted((name, n) for name, n in self.counters.items() if name.startswith('missing.'))
+        if missing:
+            print(f"  Empty fields: " + ', '.join(f"{name[8:]}={n}" for name, n in missing))
+
+    def write_report(self, prefix, extra=None):
+        """
+        Write prefix.jsonl (one line per span) and prefix_summary.json (stage
+        summary, counters and anything in extra). Returns both paths.
+        """
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(sorted(self.counters.items()))
+        spans_path = f"{prefix}.jsonl"
+        with open(spans_path, 'w', encoding='utf-8') as f:
+            for span in spans:
+                f.write(json.dumps(span, ensure_ascii=False) + '\n')
+
+        report = {'stages': self.summary(), 'counters': counters}
+        report.update(extra or {})
+        summary_path = f"{prefix}_summary.json"
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return spans_path, summary_path
+
+
+METRICS = RunMetrics()
@@ -0,0 +1,236 @@
+"""
+Network layer for the Audiomack scraper
+- Collects the JSON API payloads a page already loads and reads track stats,
+  release date and artwork (and artist avatars) straight from that structured data
+- Filters out assets the scraper never reads (images, media, fonts, trackers)
+"""
+
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from urllib.parse import urlparse
+
+# Keys Audiomack uses for each stat in its music objects, most precise first
+STAT_KEYS = {
+    'plays': ('plays-raw', 'plays_raw', 'plays'),
+    'likes': ('favorites-raw', 'favorites_raw', 'favorites', 'likes'),
+    'reposts': ('reposts-raw', 'reposts_raw', 'reposts'),
+    'playlist_adds': ('playlists-raw', 'playlists_raw', 'playlists', 'playlist_adds'),
+}
+RELEASE_KEYS = ('released', 'release_date', 'released_at')
+IMAGE_KEYS = ('image', 'image_base', 'artwork_url')
+
+# Only the src attributes of images are read, never the pixels
+BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font')
+
+# Ads, analytics and other third parties the pages pull in
+TRACKER_DOMAINS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googlesyndication.com',
+    'googleadservices.com',
+    'doubleclick.net',
+    'adservice.google.com',
+    'amazon-adsystem.com',
+    'adnxs.com',
+    'facebook.net',
+    'facebook.com',
+    'scorecardresearch.com',
+    'quantserve.com',
+    'quantcount.com',
+    'hotjar.com',
+    'branch.io',
+    'segment.io',
+    'sentry.io',
+    'nr-data.net',
+    'moatads.com',
+    'pubmatic.com',
+    'rubiconproject.com',
+    'criteo.com',
+    'taboola.com',
+)
+
+
+class ResponseCapture:
+    """
+    Records the Audiomack JSON responses a page receives while attached.
+    Bodies are only read in payloads(), after navigation, never inside the
+    event handler.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.responses = []
+
+    def __enter__(self):
+        self.page.on('response', self._on_response)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.page.remove_listener('response', self._on_response)
+
+    def _on_response(self, response):
+        try:
+            if response.request.resource_type not in ('xhr', 'fetch'):
+                return
+            if 'audiomack' not in urlparse(response.url).netloc:
+                return
+            if 'json' not in response.headers.get('content-type', ''):
+                return
+            self.responses.append(response)
+        except Exception:
+            pass
+
+    def payloads(self):
+        """Decoded JSON bodies of every captured response"""
+        payloads = []
+        for response in self.responses:
+            try:
+                payloads.append(response.json())
+            except Exception:
+                continue
+        return payloads
+
+
+def iter_dicts(value):
+    """Yield every dict nested anywhere inside a decoded JSON value"""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            yield item
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+
+
+def _slug(url):
+    return url.rstrip('/').split('/')[-1].lower()
+
+
+def find_music_item(payloads, track_url):
+    """The music object in payloads whose url_slug matches track_url, or None"""
+    slug = _slug(track_url)
+    for payload in payloads:
+        for item in iter_dicts(payload):
+            item_slug = item.get('url_slug') or item.get('slug')
+            if isinstance(item_slug, str) and item_slug.lower() == slug and (
+                    'stats' in item or 'title' in item):
+                return item
+    return None
+
+
+def find_artist_item(payloads, artist_url):
+    """The artist object in payloads whose url_slug matches artist_url, or None"""
+    slug = _slug(artist_url)
+    for payload in payloads:
+        for item in iter_dicts(payload):
+            item_slug = item.get('url_slug') or item.get('slug')
+            if isinstance(item_slug, str) and item_slug.lower() == slug and (
+                    'name' in item and 'title' not in item):
+                return item
+    return None
+
+
+def format_release_date(value):
+    """Unix timestamps become 'Month D, YYYY' like the page shows; text is kept"""
+    if value in (None, '', 0, '0'):
+        return None
+    try:
+        released = datetime.fromtimestamp(int(value), tz=timezone.utc)
+        return f"{released:%B} {released.day}, {released.year}"
+    except (TypeError, ValueError, OverflowError, OSError):
+        return str(value).strip() or None
+
+
+def _first(mapping, keys):
+    for key in keys:
+        value = mapping.get(key)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def extract_track_data(payloads, track_url):
+    """
+    Pull stats, release date and artwork for track_url out of captured payloads.
+    Returns a dict with whichever of plays, likes, reposts, playlist_adds,
+    release_date and album_art were found (raw stat values, not normalized).
+    """
+    item = find_music_item(payloads, track_url)
+    if item is None:
+        return {}
+
+    data = {}
+    stats = item.get('stats') if isinstance(item.get('stats'), dict) else item
+    for field, keys in STAT_KEYS.items():
+        value = _first(stats, keys)
+        if value is not None and not isinstance(value, (dict, list)):
+            data[field] = value
+
+    release_date = format_release_date(_first(item, RELEASE_KEYS))
+    if release_date:
+        data['release_date'] = release_date
+
+    image = _first(item, IMAGE_KEYS)
+    if isinstance(image, str) and image.startswith('http'):
+        data['album_art'] = image
+
+    return data
+
+
+def extract_artist_image(payloads, artist_url):
+    """The avatar URL of the artist at artist_url in captured payloads, or None"""
+    item = find_artist_item(payloads, artist_url)
+    image = _first(item, IMAGE_KEYS) if item is not None else None
+    return image if isinstance(image, str) and image.startswith('http') else None
+
+
+class ResourceFilter:
+    """
+    context.route handler that aborts images, media, fonts and tracker requests.
+    Allowlist entries are either a resource type (e.g. 'font') or a URL glob
+    (e.g. '*://i.audiomack.com/*'); anything matching one is always let through.
+    """
+
+    def __init__(self, allow=(), block_types=BLOCKED_RESOURCE_TYPES, block_domains=TRACKER_DOMAINS):
+        self.allow = tuple(allow)
+        self.block_types = set(block_types) - set(self.allow)
+        self.block_domains = tuple(block_domains)
+        self._lock = threading.Lock()
+        self.blocked = Counter()
+
+    def install(self, context):
+        context.route('**/*', self.handle)
+
+    def handle(self, route):
+        request = route.request
+        reason = self.block_reason(request.url, request.resource_type)
+        if reason is None:
+            # Hands the request to the handlers installed before this one (the response cache), if any
+            route.fallback()
+            return
+
+        with self._lock:
+            self.blocked[reason] += 1
+        route.abort()
+
+    def block_reason(self, url, resource_type):
+        """'tracker', the blocked resource type, or None if the request may load"""
+        if any(fnmatch(url, pattern) for pattern in self.allow if '/' in pattern or '*' in pattern):
+            return None
+
+        host = urlparse(url).netloc.lower()
+        if any(host == domain or host.endswith('.' + domain) for domain in self.block_domains):
+            return 'tracker'
+        if resource_type in self.block_types:
+            return resource_type
+        return None
+
+    def print_summary(self):
+        with self._lock:
+            blocked = dict(self.blocked)
+        if blocked:
+            details = ', '.join(f"{reason}: {count}" for reason, count in sorted(blocked.items()))
+            print(f"🚫 Blocked {sum(blocked.values())} requests ({details})")
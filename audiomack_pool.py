@@ -0,0 +1,118 @@
+"""
+Concurrent scraping engine for the Audiomack scraper
+Runs scrape_artist_page / scrape_track_page calls across a pool of browser pages
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:
+    sync_playwright = None
+
+
+class PagePool:
+    """
+    Pool of worker threads, each driving its own Playwright browser and page.
+    The Playwright sync API is not thread-safe, so every worker starts its own
+    sync_playwright() instance and only ever touches its own page.
+
+    Tasks are called as fn(page, *args) on whichever worker is free. The number
+    of workers is the global concurrency cap.
+    """
+
+    def __init__(self, workers, launch):
+        self.workers = max(1, int(workers))
+        self.launch = launch  # launch(playwright) -> (browser, context)
+        self._tasks = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._alive = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def start(self):
+        """Start all worker threads"""
+        self._alive = self.workers
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker, args=(index,), name=f"scraper-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def close(self):
+        """Stop workers once the queue drains and close their browsers"""
+        for _ in self._threads:
+            self._tasks.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def submit(self, fn, *args):
+        """
+        Queue fn(page, *args) and return a Future for its result. Once every
+        worker has stopped the Future fails right away instead of waiting forever.
+        """
+        future = Future()
+        with self._lock:
+            if self._alive == 0:
+                future.set_exception(RuntimeError("All scraper workers have stopped"))
+                return future
+            self._tasks.put((future, fn, args))
+        return future
+
+    def _worker(self, index):
+        try:
+            with sync_playwright() as p:
+                browser, context = self.launch(p)
+                try:
+                    self._run(context)
+                finally:
+                    browser.close()
+        except Exception as e:
+            print(f"  ❌ Worker {index} stopped: {e}")
+        finally:
+            with self._lock:
+                self._alive -= 1
+                last_worker = self._alive == 0
+            if last_worker:
+                self._fail_pending(RuntimeError("All scraper workers have stopped"))
+
+    def _run(self, context):
+        page = context.new_page()
+        while True:
+            item = self._tasks.get()
+            if item is None:
+                return
+
+            future, fn, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            if page.is_closed():
+                page = context.new_page()
+
+            try:
+                future.set_result(fn(page, *args))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _fail_pending(self, error):
+        while True:
+            try:
+                item = self._tasks.get_nowait()
+            except queue.Empty:
+                return
+            if item is None:
+                continue
+            future = item[0]
+            if future.set_running_or_notify_cancel():
+                future.set_exception(error)
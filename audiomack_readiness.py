@@ -0,0 +1,139 @@
+"""
+Readiness waits for the Audiomack scraper
+Waits for the elements each extractor actually needs instead of fixed sleeps,
+and records how long every wait took so the timeouts can be tuned from data
+"""
+
+import json
+import threading
+import time
+
+from audiomack_metrics import percentile
+
+# Per page type: selectors that must be attached, an optional body-text regex
+# the stat extractors rely on, the timeout for the whole wait (ms) and a short
+# network-idle fallback (ms) used when the page never becomes ready.
+READINESS = {
+    'track': {
+        'selectors': ['h1'],
+        'text': r'plays?\b',
+        'timeout': 10000,
+        'fallback': 2000,
+    },
+    'artist': {
+        'selectors': ['h1'],
+        'text': r'followers?\b',
+        'timeout': 10000,
+        'fallback': 3000,
+    },
+    'catalog': {
+        'selectors': ['a[href*="/song/"]'],
+        'timeout': 10000,
+        'fallback': 3000,
+    },
+    'load_more': {
+        'timeout': 5000,
+    },
+}
+
+TEXT_READY_JS = "pattern => new RegExp(pattern, 'i').test(document.body ? document.body.innerText : '')"
+COUNT_GREW_JS = "([selector, count]) => document.querySelectorAll(selector).length > count"
+
+
+class WaitRecorder:
+    """Thread-safe log of readiness waits: page type, seconds waited, ready or not"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records = []
+
+    def record(self, page_type, seconds, ready):
+        with self._lock:
+            self.records.append({'page_type': page_type, 'seconds': round(seconds, 3), 'ready': ready})
+
+    def summary(self):
+        """Per page type: count, timeouts, p50/p95/max seconds"""
+        with self._lock:
+            records = list(self.records)
+
+        summary = {}
+        for page_type in sorted({r['page_type'] for r in records}):
+            durations = sorted(r['seconds'] for r in records if r['page_type'] == page_type)
+            summary[page_type] = {
+                'count': len(durations),
+                'timeouts': sum(1 for r in records if r['page_type'] == page_type and not r['ready']),
+                'p50': percentile(durations, 50),
+                'p95': percentile(durations, 95),
+                'max': durations[-1],
+            }
+        return summary
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        print(f"\n⏱️  Readiness waits:")
+        for page_type, stats in summary.items():
+            print(f"  {page_type:<10} n={stats['count']:<5} p50={stats['p50']:.2f}s "
+                  f"p95={stats['p95']:.2f}s max={stats['max']:.2f}s timeouts={stats['timeouts']}")
+
+    def write(self, path):
+        """Write every recorded wait as JSON lines"""
+        with self._lock:
+            records = list(self.records)
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+
+
+WAIT_LOG = WaitRecorder()
+
+
+def _remaining_ms(deadline):
+    # Playwright treats a timeout of 0 as "wait forever", so never pass 0
+    return max(1, int((deadline - time.monotonic()) * 1000))
+
+
+def wait_until_ready(page, page_type):
+    """
+    Wait until the page has what the extractors for page_type need.
+    Falls back to a short network-idle wait if the page never gets there.
+    Returns True if the page became ready within its timeout.
+    """
+    config = READINESS[page_type]
+    start = time.monotonic()
+    deadline = start + config['timeout'] / 1000
+    ready = True
+
+    try:
+        for selector in config.get('selectors', []):
+            page.wait_for_selector(selector, state='attached', timeout=_remaining_ms(deadline))
+        if config.get('text'):
+            page.wait_for_function(TEXT_READY_JS, arg=config['text'], polling=200,
+                                   timeout=_remaining_ms(deadline))
+    except Exception:
+        ready = False
+        try:
+            page.wait_for_load_state('networkidle', timeout=config['fallback'])
+        except Exception:
+            pass
+
+    WAIT_LOG.record(page_type, time.monotonic() - start, ready)
+    return ready
+
+
+def wait_for_more(page, selector, previous_count):
+    """
+    Wait until more elements match selector than before (e.g. after 'Load More').
+    The check re-runs on DOM mutations, so it returns as soon as rows are inserted.
+    """
+    start = time.monotonic()
+    try:
+        page.wait_for_function(COUNT_GREW_JS, arg=[selector, previous_count], polling='mutation',
+                               timeout=READINESS['load_more']['timeout'])
+        ready = True
+    except Exception:
+        ready = False
+
+    WAIT_LOG.record('load_more', time.monotonic() - start, ready)
+    return ready
@@ -0,0 +1,228 @@
+"""
+Typed artist and track records for the Audiomack scraper
+Each output file has one slotted dataclass, and that class is the file's
+schema: the column order and which columns are counts, dates or flags. The
+CSV, JSON Lines and columnar sinks all serialize from it, so no separate
+field lists have to be kept in sync.
+
+Values are converted once, when the record is built: counts become ints
+(None when the page had none) and timestamps / release dates become
+datetime / date. to_row() renders the historical CSV text, with 'N/A' for a
+missing count and 'Error' on a failed artist row.
+
+A slotted record needs a fraction of the memory of the equivalent dict, which
+matters when a whole snapshot or months of them are loaded for analysis:
+    tracks = list(read_records('data/audiomack_tracks_latest.csv', 'tracks'))
+"""
+
+import csv
+import functools
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime
+
+from audiomack_artwork import artwork_key
+from audiomack_extractors import parse_number
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+RELEASE_DATE_FORMAT = '%B %d, %Y'
+
+# Fields kept on a record but not written as a column
+EXTRA = {'column': False}
+
+
+def now():
+    """Scrape timestamp of a new record (whole seconds, like the CSV column)"""
+    return datetime.now().replace(microsecond=0)
+
+
+def parse_timestamp(value):
+    """'2026-08-22 04:01:10' -> datetime; anything else is kept as it is"""
+    if not isinstance(value, str):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return value
+
+
+def parse_release_date(value):
+    """'July 4, 2023' (or an ISO date) -> date; text that is no date, like 'N/A', is kept as it is"""
+    if not isinstance(value, str):
+        return value.date() if isinstance(value, datetime) else value
+    try:
+        return datetime.strptime(value.strip(), RELEASE_DATE_FORMAT).date()
+    except ValueError:
+        pass
+    try:
+        return date.fromisoformat(value.strip())
+    except ValueError:
+        return value
+
+
+def parse_flag(value):
+    if value is None or isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('true', '1', 'yes')
+
+
+def parse_text(value):
+    return value if value is None or isinstance(value, str) else str(value)
+
+
+PARSERS = {int: parse_number, datetime: parse_timestamp, date: parse_release_date,
+           bool: parse_flag, str: parse_text}
+
+
+def render_text(value, missing='N/A'):
+    """CSV text of one value; missing is used for a count that is None"""
+    if value is None:
+        return missing
+    if isinstance(value, datetime):
+        return value.strftime(TIMESTAMP_FORMAT)
+    if isinstance(value, date):
+        return f"{value:%B} {value.day}, {value.year}"
+    return str(value)
+
+
+def render_json(value):
+    """JSON value of one field: ints stay ints, dates become ISO strings"""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def schema(record_class):
+    """(columns, int columns, every field name, (field, parser) pairs) of a record class"""
+    all_fields = fields(record_class)
+    columns = tuple(f.name for f in all_fields if f.metadata.get('column', True))
+    int_columns = frozenset(f.name for f in all_fields if f.name in columns and f.type is int)
+    parsers = tuple((f.name, PARSERS[f.type]) for f in all_fields)
+    return columns, int_columns, tuple(f.name for f in all_fields), parsers
+
+
+class Record:
+    """Shared behaviour of the record classes below: parsing on construction and rendering"""
+
+    __slots__ = ()
+    KIND = None
+    DERIVED = {}
+
+    def __post_init__(self):
+        for name, parse in schema(type(self))[3]:
+            setattr(self, name, parse(getattr(self, name)))
+        for name, (source, derive) in self.DERIVED.items():
+            if not getattr(self, name):
+                setattr(self, name, derive(getattr(self, source)))
+
+    @classmethod
+    def columns(cls):
+        """Output columns, in file order"""
+        return list(schema(cls)[0])
+
+    @classmethod
+    def int_columns(cls):
+        return schema(cls)[1]
+
+    @classmethod
+    def from_row(cls, row):
+        """Record from a dict: a CSV row, a checkpoint or state-store entry, or as_json() output"""
+        return cls(**{name: row[name] for name in schema(cls)[2] if name in row})
+
+    @property
+    def missing_count(self):
+        """Text of a count that is None"""
+        return 'N/A'
+
+    def csv_values(self):
+        missing = self.missing_count
+        return [render_text(getattr(self, name), missing) for name in schema(type(self))[0]]
+
+    def to_row(self):
+        """The historical CSV text row, as a dict"""
+        return dict(zip(schema(type(self))[0], self.csv_values()))
+
+    def as_json(self, extras=False):
+        """Typed row for JSON (with the non-column fields too if extras)"""
+        columns, _, names, _ = schema(type(self))
+        return {name: render_json(getattr(self, name)) for name in (names if extras else columns)}
+
+
+@dataclass(slots=True)
+class ArtistRecord(Record):
+    KIND = 'artists'
+    DERIVED = {'profile_image_key': ('profile_image', artwork_key)}
+
+    timestamp: datetime = field(default_factory=now)
+    artist_name: str = 'Unknown'
+    url: str = 'N/A'
+    profile_image: str = 'N/A'
+    followers: int = None
+    total_plays: int = None
+    monthly_listeners: int = None
+    member_since: str = 'N/A'
+    tracks_found: int = 0
+    profile_image_key: str = None
+    # Reported in the run summary
+    catalog_complete: bool = field(default=None, metadata=EXTRA)
+    error: str = field(default=None, metadata=EXTRA)
+
+    @classmethod
+    def failure(cls, url, error):
+        """Row written for an artist whose page could not be scraped"""
+        return cls(artist_name='Error', url=url, error=str(error))
+
+    @property
+    def failed(self):
+        return self.artist_name == 'Error'
+
+    @property
+    def missing_count(self):
+        return 'Error' if self.failed else 'N/A'
+
+
+@dataclass(slots=True)
+class TrackRecord(Record):
+    KIND = 'tracks'
+    DERIVED = {'album_art_key': ('album_art', artwork_key)}
+
+    timestamp: datetime = field(default_factory=now)
+    artist_name: str = 'N/A'
+    track_title: str = 'Unknown'
+    track_url: str = 'N/A'
+    album_art: str = 'N/A'
+    plays: int = None
+    likes: int = None
+    reposts: int = None
+    playlist_adds: int = None
+    release_date: date = 'N/A'
+    album_art_key: str = None
+
+
+@dataclass(slots=True)
+class TrackArtistRecord(Record):
+    """An artist whose catalog lists a track (primary: the artist its tracks row is under)"""
+    KIND = 'track_artists'
+
+    track_url: str = 'N/A'
+    artist_url: str = 'N/A'
+    artist_name: str = 'N/A'
+    primary: bool = False
+
+
+RECORDS = {cls.KIND: cls for cls in (ArtistRecord, TrackRecord, TrackArtistRecord)}
+
+
+def to_record(kind, row):
+    """row as a record of kind (records are returned as they are)"""
+    return row if isinstance(row, Record) else RECORDS[kind].from_row(row)
+
+
+def read_records(path, kind):
+    """Records of a snapshot CSV, one at a time"""
+    record_class = RECORDS[kind]
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield record_class.from_row(row)
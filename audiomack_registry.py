@@ -0,0 +1,139 @@
+"""
+Artist registry for the Audiomack scraper
+The tracked artists live in artists.csv instead of a hard-coded list, keyed
+by normalized (lowercased) slug, with a tier (or an explicit refresh interval) that
+decides how often each artist is scraped
+
+artists.csv columns:
+    slug          Audiomack artist slug or profile URL; its case is kept for the
+                  profile URL, lookups ignore it
+    tier          hot | regular | long_tail (see TIER_REFRESH_DAYS)
+    refresh_days  optional override of the tier's interval, in days
+    active        yes/no; inactive artists are kept but never scraped
+"""
+
+import csv
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+DEFAULT_REGISTRY = 'artists.csv'
+ARTIST_URL = 'https://audiomack.com/{slug}'
+
+# Days between scrapes per tier; hot artists are scraped on every run
+TIER_REFRESH_DAYS = {
+    'hot': 0,
+    'regular': 3,
+    'long_tail': 7,
+}
+DEFAULT_TIER = 'regular'
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def artist_slug(value):
+    """'https://audiomack.com/KELLz/' or ' KELLz ' -> 'KELLz'"""
+    value = (value or '').strip()
+    if '://' in value:
+        value = urlparse(value).path
+    return value.strip('/').split('/')[0]
+
+
+def normalize_slug(value):
+    """Lookup key of a slug or profile URL: 'https://audiomack.com/KELLz/' -> 'kellz'"""
+    return artist_slug(value).lower()
+
+
+class ArtistEntry:
+    """One registry row (slug as written in the file; key is its normalized form)"""
+
+    def __init__(self, slug, tier=DEFAULT_TIER, refresh_days=None, active=True):
+        self.slug = artist_slug(slug)
+        self.key = self.slug.lower()
+        self.tier = tier
+        self.refresh_days = TIER_REFRESH_DAYS[tier] if refresh_days is None else refresh_days
+        self.active = active
+
+    @property
+    def url(self):
+        return ARTIST_URL.format(slug=self.slug)
+
+    def is_due(self, last_scraped, now):
+        """Whether the artist should be scraped on a run at now, given its last scrape time"""
+        if last_scraped is None or self.refresh_days <= 0:
+            return True
+        try:
+            then = datetime.strptime(last_scraped, TIMESTAMP_FORMAT)
+        except (TypeError, ValueError):
+            return True
+        # A little slack so a daily job that runs a few minutes early still counts
+        return now - then >= timedelta(days=self.refresh_days) - timedelta(hours=1)
+
+
+class ArtistRegistry:
+    """Artists indexed by normalized slug, in file order"""
+
+    def __init__(self, entries=()):
+        self._entries = {}
+        for entry in entries:
+            self.add(entry)
+
+    @classmethod
+    def load(cls, path=DEFAULT_REGISTRY):
+        registry = cls()
+        with open(path, newline='', encoding='utf-8') as f:
+            for line, row in enumerate(csv.DictReader(f), 2):
+                slug = artist_slug(row.get('slug'))
+                if not slug:
+                    continue
+                tier = (row.get('tier') or DEFAULT_TIER).strip().lower()
+                if tier not in TIER_REFRESH_DAYS:
+                    print(f"⚠️  {path}:{line}: unknown tier {tier!r} for {slug}, using {DEFAULT_TIER}")
+                    tier = DEFAULT_TIER
+                refresh_days = (row.get('refresh_days') or '').strip()
+                try:
+                    refresh_days = float(refresh_days) if refresh_days else None
+                except ValueError:
+                    print(f"⚠️  {path}:{line}: invalid refresh_days {refresh_days!r} for {slug}, "
+                          f"using the {tier} tier's")
+                    refresh_days = None
+                active = (row.get('active') or 'yes').strip().lower() not in ('no', 'false', '0')
+                if slug in registry:
+                    print(f"⚠️  {path}:{line}: duplicate artist {slug}, keeping the first entry")
+                    continue
+                registry.add(ArtistEntry(slug, tier, refresh_days, active))
+        return registry
+
+    def add(self, entry):
+        self._entries[entry.key] = entry
+
+    def __contains__(self, slug):
+        return normalize_slug(slug) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, slug_or_url):
+        return self._entries.get(normalize_slug(slug_or_url))
+
+    def active(self):
+        return [entry for entry in self._entries.values() if entry.active]
+
+    def urls(self):
+        """Profile URLs of all active artists, in registry order"""
+        return [entry.url for entry in self.active()]
+
+    def work_set(self, urls, last_scraped, now=None):
+        """
+        Split artist URLs into (due, not_due) for a run at now.
+        last_scraped maps slug -> timestamp of the artist's last successful scrape.
+        """
+        now = now or datetime.now()
+        due, not_due = [], []
+        for url in urls:
+            entry = self.get(url)
+            slug = normalize_slug(url)
+            if entry is None or entry.is_due(last_scraped.get(slug), now):
+                due.append(url)
+            else:
+                not_due.append(url)
+        return due, not_due
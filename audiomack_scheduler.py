@@ -0,0 +1,238 @@
+"""
+Adaptive request scheduler for the Audiomack scraper
+Owns the pacing of every page navigation: a token bucket per host whose rate
+adapts to response latency and 429/5xx answers (AIMD), exponential backoff
+with jitter between retries, and one retry budget shared by the whole run
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+THROTTLE_STATUSES = {429, 503}
+
+# Rate adaptation
+RATE_INCREASE = 0.05  # req/s added after every fast, successful response
+RATE_DECREASE = 0.5  # Rate multiplier after a 429/5xx or failed request
+SLOW_DECREASE = 0.8  # Rate multiplier when latency climbs past SLOW_FACTOR x baseline
+SLOW_FACTOR = 2.0
+LATENCY_FLOOR = 0.5  # Seconds; baselines below this are treated as this (noise on fast pages)
+DECREASE_COOLDOWN = 2.0  # Seconds between two decreases (in-flight failures count once)
+LATENCY_SMOOTHING = 0.2  # EWMA weight of the newest latency sample
+
+# Retries
+MAX_ATTEMPTS = 4  # Per navigation, including the first one
+BACKOFF_BASE = 2.0  # Seconds before the first retry, doubled for every next one
+BACKOFF_MAX = 60.0
+
+
+class NavigationError(Exception):
+    """A request still failed (or was throttled) after its retries"""
+
+    def __init__(self, url, reason):
+        super().__init__(f"{reason} for {url}")
+        self.url = url
+        self.reason = reason
+
+
+class RetryBudget:
+    """
+    Run-wide cap on retries: minimum plus ratio x requests made so far.
+    Keeps a bad stretch (site down, IP throttled) from multiplying the load.
+    """
+
+    def __init__(self, ratio=0.2, minimum=10):
+        self.ratio = ratio
+        self.minimum = minimum
+        self.requests = 0
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    @property
+    def remaining(self):
+        with self._lock:
+            return max(0, int(self.minimum + self.ratio * self.requests) - self.spent)
+
+    def spend(self):
+        """Take one retry from the budget; False when it is used up"""
+        with self._lock:
+            if self.spent >= int(self.minimum + self.ratio * self.requests):
+                return False
+            self.spent += 1
+            return True
+
+
+class HostState:
+    """Token bucket and adaptive rate for one host"""
+
+    def __init__(self, rate, min_rate, max_rate):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.latency = None
+        self.baseline = None
+
+    def reserve(self, now):
+        """Take a token, returning how long the caller must wait for it"""
+        if self.rate:
+            self.tokens = min(1.0, self.tokens + (now - self.updated) * self.rate)
+        else:
+            self.tokens = 1.0
+        self.updated = now
+        self.tokens -= 1.0
+
+        delay = -self.tokens / self.rate if self.tokens < 0 and self.rate else 0.0
+        return max(delay, self.paused_until - now)
+
+    def observe_latency(self, seconds):
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += LATENCY_SMOOTHING * (seconds - self.latency)
+        if self.baseline is None or self.latency < self.baseline:
+            self.baseline = self.latency
+        return self.latency > max(self.baseline, LATENCY_FLOOR) * SLOW_FACTOR
+
+    def increase(self):
+        if self.rate:
+            self.rate = min(self.max_rate, self.rate + RATE_INCREASE)
+
+    def decrease(self, factor, now):
+        if not self.rate or now - self.last_decrease < DECREASE_COOLDOWN:
+            return
+        self.rate = max(self.min_rate, self.rate * factor)
+        self.last_decrease = now
+
+
+class RequestScheduler:
+    """
+    Paces, observes and retries requests, per host and across all workers.
+
+    fetch(url, request) waits for a token, calls request() (which returns a
+    response with .status / .status_code, or None), feeds the latency and
+    status back into the host's rate, and retries failures with backoff while
+    the shared retry budget lasts. A rate of 0 disables pacing (retries and
+    backoff still apply).
+    """
+
+    def __init__(self, rate=2.0, max_rate=None, min_rate=0.2, retry_budget=None,
+                 max_attempts=MAX_ATTEMPTS):
+        self.rate = rate
+        self.max_rate = max(max_rate or rate * 4, rate)
+        self.min_rate = min(min_rate, rate) if rate else 0.0
+        self.retry_budget = retry_budget or RetryBudget()
+        self.max_attempts = max(1, max_attempts)
+        self.counts = Counter()
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url):
+        host = urlparse(url).netloc or 'audiomack.com'
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostState(self.rate, self.min_rate, self.max_rate)
+        return state
+
+    def acquire(self, url):
+        """Block until the host of url may be hit again"""
+        with self._lock:
+            delay = self._host(url).reserve(time.monotonic())
+        if delay > 0:
+            time.sleep(delay)
+
+    def observe(self, url, status, latency, retry_after=None):
+        """Adapt the host's rate to one finished request (status None = no response)"""
+        now = time.monotonic()
+        with self._lock:
+            state = self._host(url)
+            if status is None or status in THROTTLE_STATUSES or status >= 500:
+                self.counts['throttled' if status in THROTTLE_STATUSES else 'failed'] += 1
+                state.decrease(RATE_DECREASE, now)
+                if retry_after:
+                    state.paused_until = max(state.paused_until, now + retry_after)
+            elif state.observe_latency(latency):
+                self.counts['slow'] += 1
+                state.decrease(SLOW_DECREASE, now)
+            else:
+                state.increase()
+
+    def backoff(self, attempt, retry_after=None):
+        """Delay before retry number attempt (1-based): exponential, half of it jittered"""
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1))
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        return max(delay, retry_after or 0)
+
+    def fetch(self, url, request):
+        """Run request() for url under pacing and retries; raises NavigationError when it gives up"""
+        attempt = 0
+        while True:
+            attempt += 1
+            self.acquire(url)
+            self.retry_budget.record_request()
+            self._count('requests')
+
+            started = time.monotonic()
+            error = None
+            try:
+                response = request()
+            except Exception as e:
+                response, error = None, e
+            latency = time.monotonic() - started
+
+            status = _status(response)
+            retry_after = _retry_after(response)
+            if error is None and (status is None or status < 500) and status not in THROTTLE_STATUSES:
+                self.observe(url, status or 200, latency)
+                return response
+
+            self.observe(url, status, latency, retry_after)
+            reason = f"HTTP {status}" if error is None else (str(error).splitlines() or [type(error).__name__])[0]
+            if attempt >= self.max_attempts or not self.retry_budget.spend():
+                raise NavigationError(url, reason)
+
+            self._count('retries')
+            delay = self.backoff(attempt, retry_after)
+            print(f"      🔁 {reason}, retry {attempt}/{self.max_attempts - 1} in {delay:.1f}s")
+            time.sleep(delay)
+
+    def _count(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+    def print_summary(self):
+        with self._lock:
+            counts = dict(self.counts)
+            rates = {host: state.rate for host, state in self._hosts.items()}
+        if not counts.get('requests'):
+            return
+        print(f"\n🚦 Requests: {counts['requests']} | retries: {counts.get('retries', 0)} | "
+              f"throttled: {counts.get('throttled', 0)} | failed: {counts.get('failed', 0)} | "
+              f"slow: {counts.get('slow', 0)} | retry budget left: {self.retry_budget.remaining}")
+        for host, rate in sorted(rates.items()):
+            if rate:
+                print(f"  {host:<24} settled at {rate:.2f} req/s")
+
+
+def _status(response):
+    if response is None:
+        return None
+    return getattr(response, 'status', None) or getattr(response, 'status_code', None)
+
+
+def _retry_after(response):
+    """Seconds from a Retry-After header (delay-seconds form only), or None"""
+    try:
+        value = response.headers.get('retry-after')
+        return min(float(value), BACKOFF_MAX) if value else None
+    except (AttributeError, TypeError, ValueError):
+        return None
@@ -3,106 +3,154 @@ Audiomack Artist & Track Data Scraper - V6 L-I-BIZZLE EDITION
 NOW WITH IMAGE EXTRACTION: Profile pictures and album art
 """
 
-import csv
+import argparse
+import itertools
+import os
+import subprocess
+import sys
 import time
 from datetime import datetime
-from playwright.sync_api import sync_playwright
 import json
-import re
-
-# List of Liberian artists to track
-ARTISTS = [
-    "https://audiomack.com/vibeking-sio",
-    'https://audiomack.com/nahj',
-    'https://audiomack.com/spizeofficial',
-    'https://audiomack.com/will-flash',
-    'https://audiomack.com/stunn',
-    'https://audiomack.com/elvissaywon226',
-    'https://audiomack.com/fluxiimusic',
-    'https://audiomack.com/teddyride',
-    'https://audiomack.com/Jaredo',
-    'https://audiomack.com/troublecoming',
-    'https://audiomack.com/jzyno',
-    'https://audiomack.com/cralorboi_cic',
-    'https://audiomack.com/mccaro',
-    'https://audiomack.com/jboydeprophet-1',
-    'https://audiomack.com/christoph-the-change',
-    'https://audiomack.com/brickson_',
-    'https://audiomack.com/barsee-mocopala-kiloda',
-    'https://audiomack.com/mr-church1',
-    'https://audiomack.com/natif',
-    'https://audiomack.com/LilMore',
-    'https://audiomack.com/writerman_willy',
-    'https://audiomack.com/kpanto_',
-    'https://audiomack.com/boifattyofficial',
-    'https://audiomack.com/buckyraw',
-    'https://audiomack.com/kobazziee',
-    'https://audiomack.com/jslughtofficial',
-    'https://audiomack.com/j-rap-',
-    'https://audiomack.com/nuchie-meek-',
-    'https://audiomack.com/KELLz',
-    'https://audiomack.com/Fazari',
-]
+
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:
+    sync_playwright = None
+
+from audiomack_cache import DEFAULT_CACHE_DIR, ResponseCache
+from audiomack_catalog import TrackRegistry
+from audiomack_checkpoint import DEFAULT_CHECKPOINT_DIR, Checkpoint
+from audiomack_dom import ARTIST_DOM, TRACK_DOM, first_month_text, read_dom
+from audiomack_extractors import (extract_artist_stats, extract_member_since, extract_number,
+                                  extract_track_stats)
+from audiomack_http import (REQUIRED_ARTIST_FIELDS, REQUIRED_TRACK_FIELDS, USER_AGENT, HttpClient,
+                            missing_fields, parse_artist_html, parse_track_html)
+from audiomack_metrics import METRICS
+from audiomack_network import ResourceFilter, ResponseCapture, extract_track_data
+from audiomack_pool import PagePool
+from audiomack_readiness import WAIT_LOG, wait_for_more, wait_until_ready
+from audiomack_records import ArtistRecord, TrackRecord
+from audiomack_registry import DEFAULT_REGISTRY, ArtistRegistry, normalize_slug
+from audiomack_scheduler import RequestScheduler, RetryBudget
+from audiomack_shards import (DEFAULT_SHARD_DIR, merge_shards, parse_shard, shard_artists,
+                              shard_csv, shard_run_id)
+from audiomack_sinks import FORMATS, open_sinks
+from audiomack_state import DEFAULT_STATE_DB, TrackStateStore
+
+# Tracked artists, with their tier / refresh interval (see audiomack_registry)
+REGISTRY_PATH = DEFAULT_REGISTRY
 
 # Configuration
 MAX_TRACKS_PER_ARTIST = 0  # Set to 0 to scrape ALL tracks
 SCRAPE_FULL_CATALOG = True
 
-def extract_number(text):
-    """Extract numbers from text like '1.2K', '500', '1M' etc."""
-    if not text or text == "N/A":
-        return "N/A"
-    
-    text = text.replace(',', '').strip()
-    
-    match = re.search(r'([\d.]+)\s*([KMB]?)', text, re.IGNORECASE)
-    if match:
-        num = match.group(1)
-        suffix = match.group(2).upper()
-        
-        if suffix == 'K':
-            return str(int(float(num) * 1000))
-        elif suffix == 'M':
-            return str(int(float(num) * 1000000))
-        elif suffix == 'B':
-            return str(int(float(num) * 1000000000))
-        else:
-            return num
-    
-    return text
+# Catalog pagination on the /songs page: a 'Load More' button or infinite scroll
+MAX_CATALOG_PAGES = 200  # Pages loaded per catalog before giving up on reaching its end
+CATALOG_DEADLINE = 600  # Seconds spent paging one catalog before giving up
+SONG_LINK_SELECTOR = 'a[href*="/song/"]'
+LOAD_MORE_SELECTOR = ', '.join([
+    'button:has-text("Load More")',
+    'button:has-text("Show More")',
+    'button:has-text("View More")',
+    'a:has-text("Load More")',
+    'a:has-text("Show More")',
+    '[class*="load-more"]',
+    '[class*="show-more"]',
+])
+SONG_HREFS_JS = "els => els.map(el => el.getAttribute('href'))"
+SCROLL_TO_BOTTOM_JS = """() => {
+    const before = window.scrollY;
+    window.scrollTo(0, document.body.scrollHeight);
+    return window.scrollY > before;
+}"""
+
+# Read track stats from the JSON API responses the page loads (regexes become a fallback)
+USE_NETWORK_STATS = True
+TRACK_STAT_FIELDS = ('plays', 'likes', 'reposts', 'playlist_adds')
+
+# Read each page's DOM fields with one injected script instead of a locator call per field
+BATCH_DOM = True
+
+# Abort images, media, fonts and trackers in the browser (their URLs are still read)
+BLOCK_RESOURCES = True
+RESOURCE_ALLOWLIST = []  # Resource types or URL globs that are never blocked
+
+# Incremental mode: skip old, flat tracks using the persistent track-state store
+INCREMENTAL = False
+STATE_DB = DEFAULT_STATE_DB
+
+# Results are journaled here as they come in, so a crashed run can be resumed
+CHECKPOINT_DIR = DEFAULT_CHECKPOINT_DIR
+
+# Output formats streamed during the run: csv, json (JSON lines), parquet, arrow (columnar ones need pyarrow)
+OUTPUT_FORMATS = ['csv']
+
+# Browser state kept between runs (CI restores state/): static assets are served
+# from the response cache while fresh; a persistent profile also keeps cookies
+# and storage (None = a fresh profile every run)
+RESPONSE_CACHE_DIR = DEFAULT_CACHE_DIR
+PROFILE_DIR = None
 
-def extract_image_url(page, selectors):
+# Read pages from their server-rendered HTML over a keep-alive HTTP client and
+# only open them in the browser when a required field is missing there
+HTTP_FAST_PATH = True
+
+# Per-stage timings and empty-field counts, written next to the output as audiomack_metrics_<run_id>.jsonl
+WRITE_METRICS = True
+
+# Concurrency
+WORKERS = 1  # Parallel browser pages (1 = sequential, one page)
+PROCESSES = 1  # Shard processes, each with its own browser (1 = no sharding)
+SHARD_DIR = DEFAULT_SHARD_DIR  # Partial output of sharded runs, merged at the end
+RATE_LIMIT = 2.0  # Starting page navigations per second per host (0 = unlimited)
+MAX_RATE_LIMIT = 8.0  # The adaptive rate never probes above this
+RETRY_BUDGET = 0.2  # Retries allowed across the run, as a share of requests made
+
+# Shared by all workers; set up in main()
+SCHEDULER = RequestScheduler(RATE_LIMIT, MAX_RATE_LIMIT, retry_budget=RetryBudget(RETRY_BUDGET))
+RESOURCE_FILTER = ResourceFilter(RESOURCE_ALLOWLIST) if BLOCK_RESOURCES else None
+TRACK_STATE = None
+REGISTRY = None
+HTTP = None
+TRACKS = TrackRegistry()  # Which artist scrapes each track this run
+RESPONSE_CACHE = None
+PROFILE_SLOTS = itertools.count()
+
+def goto(page, url, timeout, page_type):
+    """Navigate to url, paced and retried by the request scheduler"""
+    with METRICS.span('navigate', page=page_type):
+        return SCHEDULER.fetch(url, lambda: page.goto(url, wait_until="domcontentloaded", timeout=timeout))
+
+def wait_ready(page, page_type):
+    """wait_until_ready, timed as the run's readiness stage"""
+    with METRICS.span('ready', page=page_type):
+        return wait_until_ready(page, page_type)
+
+def body_text(page, page_type):
+    """The page's body text, for the regex extractors"""
+    with METRICS.span('body_text', page=page_type):
+        return page.inner_text('body')
+
+def fetch_fast(url, page_type, parse, required):
     """
-    Extract image URL from page using multiple selector strategies
-    Returns the first valid image URL found
+    Fields of a page read over plain HTTP, or None when the browser is needed:
+    the request failed, the page is not server-rendered or a required field is missing
     """
-    for selector in selectors:
-        try:
-            if page.locator(selector).count() > 0:
-                element = page.locator(selector).first
-                
-                # Try getting src attribute
-                img_url = element.get_attribute('src')
-                if img_url and img_url.startswith('http'):
-                    return img_url
-                
-                # Try getting data-src (lazy loaded images)
-                img_url = element.get_attribute('data-src')
-                if img_url and img_url.startswith('http'):
-                    return img_url
-                
-                # Try getting background-image from style
-                style = element.get_attribute('style')
-                if style and 'background-image' in style:
-                    match = re.search(r'url\(["\']?([^"\']+)["\']?\)', style)
-                    if match:
-                        img_url = match.group(1)
-                        if img_url.startswith('http'):
-                            return img_url
-        except:
-            continue
-    
-    return "N/A"
+    try:
+        with METRICS.span('http', page=page_type):
+            html = HTTP.fetch_html(url, SCHEDULER)
+        if html is not None:
+            with METRICS.span('extract', page=f"{page_type}_http"):
+                fields = parse(html)
+            missing = missing_fields(fields, required)
+            if not missing:
+                METRICS.count(f"http.{page_type}.hit")
+                return fields
+            METRICS.count_missing(f"{page_type}_http", fields, required)
+    except Exception as e:
+        print(f"      ⚠️ HTTP fetch failed ({e}), using the browser")
+    METRICS.count(f"http.{page_type}.fallback")
+    return None
 
 def scrape_track_page(page, track_url, artist_name):
     """
@@ -113,28 +161,51 @@ def scrape_track_page(page, track_url, artist_name):
         full_url = f"https://audiomack.com{track_url}" if not track_url.startswith('http') else track_url
         
         print(f"    🎵 Scraping track: {full_url}")
-        page.goto(full_url, wait_until="domcontentloaded", timeout=30000)
-        time.sleep(2)
+        if HTTP is not None:
+            fields = fetch_fast(full_url, 'track', lambda html: parse_track_html(html, full_url),
+                                REQUIRED_TRACK_FIELDS)
+            if fields is not None:
+                track_data = TrackRecord(
+                    artist_name=artist_name,
+                    track_title=fields['track_title'],
+                    track_url=full_url,
+                    album_art=fields['album_art'],
+                    plays=fields['plays'],
+                    likes=fields['likes'],
+                    reposts=fields['reposts'],
+                    playlist_adds=fields['playlist_adds'],
+                    release_date=fields['release_date'],
+                )
+                METRICS.count_missing('track', track_data.as_json())
+                print(f"      ✓ Plays: {fields['plays']} | Likes: {fields['likes']} | "
+                      f"Released: {fields['release_date']} (HTTP)")
+                return track_data
+        
+        with ResponseCapture(page) as capture:
+            goto(page, full_url, timeout=30000, page_type='track')
+            wait_ready(page, 'track')
+        
+        api_data = extract_track_data(capture.payloads(), full_url) if USE_NETWORK_STATS else {}
         
-        all_text = page.inner_text('body')
+        # One DOM read for everything below; the body text dump is only
+        # included if the API data is missing stats
+        need_text = any(field not in api_data for field in TRACK_STAT_FIELDS)
+        with METRICS.span('dom', page='track'):
+            dom = read_dom(page, TRACK_DOM, with_body=need_text, batched=BATCH_DOM)
+        all_text = dom['body']
+        METRICS.count_missing('track_dom', dom, TRACK_DOM)
+        if USE_NETWORK_STATS:
+            METRICS.count_missing('track_api', api_data, TRACK_STAT_FIELDS)
         
         # Extract track title
-        track_title = "Unknown"
+        track_title = (dom['h1'] or "").strip() or "Unknown"
         try:
-            if page.locator('h1').count() > 0:
-                h1_text = page.locator('h1').first.inner_text().strip()
-                if h1_text and h1_text != "":
-                    track_title = h1_text
-            
             if track_title == "Unknown" or len(track_title) < 2:
-                try:
-                    title = page.title()
-                    if ' - ' in title:
-                        parts = title.split(' - ')
-                        if len(parts) > 1:
-                            track_title = parts[1].split('|')[0].strip()
-                except:
-                    pass
+                title = dom['page_title'] or ""
+                if ' - ' in title:
+                    parts = title.split(' - ')
+                    if len(parts) > 1:
+                        track_title = parts[1].split('|')[0].strip()
             
             if track_title == "Unknown" or len(track_title) < 2:
                 url_parts = full_url.rstrip('/').split('/')
@@ -149,139 +220,137 @@ def scrape_track_page(page, track_url, artist_name):
             except:
                 pass
         
-        # 🖼️ NEW: Extract album art / track cover image
-        # ---------- UPDATED SELECTORS ----------
-        album_art_selectors = [
-            'img.SinglePageMusicCardImage',
-            'img[data-testid="SinglePageMusicCardImage"]',
-        ]
-        # ---------------------------------------
-        album_art = extract_image_url(page, album_art_selectors)
+        # 🖼️ Album art / track cover image (selectors live in audiomack_dom.TRACK_DOM)
+        album_art = api_data.get('album_art') or dom['album_art'] or "N/A"
         
         if album_art != "N/A":
             print(f"      🖼️  Found album art: {album_art[:60]}...")
         
-        # Extract play count
-        plays = "N/A"
-        play_patterns = [
-            r'([\d,.KMB]+)\s*[Tt]otal\s*[Pp]lays?',
-            r'[Tt]otal\s*[Pp]lays?\s*[:\-]?\s*([\d,.KMB]+)',
-            r'(?<!Playlist\s)(?<!playlist\s)([\d,.KMB]+)\s*[Pp]lays?(?!\s*Adds)',
-        ]
-        
-        for pattern in play_patterns[:2]:
-            match = re.search(pattern, all_text, re.IGNORECASE)
-            if match:
-                plays = extract_number(match.group(1))
-                break
+        # Stats: structured API data first, page-text regexes only for what's missing
+        stats = {field: "N/A" for field in TRACK_STAT_FIELDS}
+        for field in TRACK_STAT_FIELDS:
+            if field in api_data:
+                stats[field] = extract_number(str(api_data[field]))
         
-        if plays == "N/A":
-            lines = all_text.split('\n')
-            for i, line in enumerate(lines):
-                if 'Plays' in line and 'Playlist' not in line and 'Added' not in line:
-                    combined = lines[max(0, i-1):i+2]
-                    for check_line in combined:
-                        match = re.search(r'([\d,.KMB]+)', check_line)
-                        if match:
-                            potential_plays = extract_number(match.group(1))
-                            if potential_plays != "N/A":
-                                plays = potential_plays
-                                break
-                    if plays != "N/A":
-                        break
-        
-        # Extract likes
-        likes = "N/A"
-        like_patterns = [
-            r'([\d,.KMB]+)\s*[Ff]avorites?',
-            r'([\d,.KMB]+)\s*[Ll]ikes?',
-            r'[Ff]avorites?\s*[:\-]?\s*([\d,.KMB]+)',
-            r'[Ll]ikes?\s*[:\-]?\s*([\d,.KMB]+)',
-        ]
-        for pattern in like_patterns:
-            match = re.search(pattern, all_text)
-            if match:
-                likes = extract_number(match.group(1))
-                break
-        
-        # Extract playlist adds
-        playlist_adds = "N/A"
-        playlist_patterns = [
-            r'([\d,.KMB]+)\s*[Pp]laylist\s*[Aa]dds?',
-            r'[Pp]laylist\s*[Aa]dds?\s*[:\-]?\s*([\d,.KMB]+)',
-        ]
-        for pattern in playlist_patterns:
-            match = re.search(pattern, all_text)
-            if match:
-                playlist_adds = extract_number(match.group(1))
-                break
+        if any(stats[field] == "N/A" for field in TRACK_STAT_FIELDS):
+            if all_text is None:
+                all_text = body_text(page, 'track')
+            with METRICS.span('extract', page='track'):
+                text_stats = extract_track_stats(all_text)
+            METRICS.count_missing('track_text', text_stats, TRACK_STAT_FIELDS)
+            for field in TRACK_STAT_FIELDS:
+                if stats[field] == "N/A":
+                    stats[field] = text_stats[field]
         
-        # Extract reposts
-        reposts = "N/A"
-        repost_patterns = [
-            r'([\d,.KMB]+)\s*[Rr]eposts?',
-            r'([\d,.KMB]+)\s*[Ss]hares?',
-            r'[Rr]eposts?\s*[:\-]?\s*([\d,.KMB]+)',
-        ]
-        for pattern in repost_patterns:
-            match = re.search(pattern, all_text)
-            if match:
-                reposts = extract_number(match.group(1))
-                break
+        plays = stats['plays']
+        likes = stats['likes']
+        reposts = stats['reposts']
+        playlist_adds = stats['playlist_adds']
         
         # Extract release date
-        release_date = "N/A"
+        release_date = api_data.get('release_date', "N/A")
         try:
-            release_date_selector = 'li.SinglePageMusicCardInfo-row:has-text("Release Date") .SinglePageMusicCardInfo-value span span'
-            if page.locator(release_date_selector).count() > 0:
-                release_date = page.locator(release_date_selector).first.inner_text().strip()
+            if release_date == "N/A" and dom['release_date']:
+                release_date = dom['release_date'].strip()
             
             if release_date == "N/A":
-                alt_selector = '.SinglePageMusicCardInfo-row .TooltipTitle span'
-                elements = page.locator(alt_selector).all()
-                for element in elements:
-                    text = element.inner_text().strip()
-                    if any(month in text for month in ['January', 'February', 'March', 'April', 'May', 'June', 
-                                                        'July', 'August', 'September', 'October', 'November', 'December']):
-                        release_date = text
-                        break
+                release_date = first_month_text(dom['info_values']) or "N/A"
             
             if release_date == "N/A":
-                lines = all_text.split('\n')
-                for i, line in enumerate(lines):
-                    if 'Release Date' in line or 'release date' in line.lower():
-                        for j in range(i, min(i+5, len(lines))):
-                            check_line = lines[j]
-                            date_match = re.search(r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}', check_line, re.IGNORECASE)
-                            if date_match:
-                                release_date = date_match.group(0)
-                                break
-                        if release_date != "N/A":
-                            break
-                            
+                if all_text is None:
+                    all_text = body_text(page, 'track')
+                with METRICS.span('extract', page='track'):
+                    release_date = extract_track_stats(all_text)['release_date']
+            
         except Exception as e:
             print(f"      Could not extract release date: {e}")
         
-        track_data = {
-            'artist_name': artist_name,
-            'track_title': track_title,
-            'track_url': full_url,
-            'album_art': album_art,  # 🖼️ NEW FIELD
-            'plays': plays,
-            'likes': likes,
-            'reposts': reposts,
-            'playlist_adds': playlist_adds,
-            'release_date': release_date,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
+        track_data = TrackRecord(
+            artist_name=artist_name,
+            track_title=track_title,
+            track_url=full_url,
+            album_art=album_art,  # 🖼️ NEW FIELD
+            plays=plays,
+            likes=likes,
+            reposts=reposts,
+            playlist_adds=playlist_adds,
+            release_date=release_date,
+        )
         
+        METRICS.count_missing('track', track_data.as_json())
         print(f"      ✓ Plays: {plays} | Likes: {likes} | Released: {release_date}")
         return track_data
         
     except Exception as e:
+        METRICS.count('failed.track')
         print(f"      ✗ Error scraping track: {str(e)}")
         return None
 
+def read_artist_page(page, url):
+    """Artist fields read from the page in the browser"""
+    goto(page, url, timeout=60000, page_type='artist')
+    
+    if not wait_ready(page, 'artist'):
+        print("  ⚠️ Page loaded slowly, continuing anyway...")
+    
+    # One DOM read: name, avatar, sidebar and the body text for the stats
+    with METRICS.span('dom', page='artist'):
+        dom = read_dom(page, ARTIST_DOM, with_body=True, batched=BATCH_DOM)
+    all_text = dom['body'] or ""
+    METRICS.count_missing('artist_dom', dom, ARTIST_DOM)
+    
+    # Extract artist name
+    artist_name = "Unknown"
+    try:
+        if dom['sidebar_name'] is not None:
+            artist_name = dom['sidebar_name'].strip()
+        elif dom['h1'] and dom['h1'].strip():
+            artist_name = dom['h1'].strip()
+        else:
+            title = dom['page_title'] or ""
+            if ' - ' in title:
+                artist_name = title.split(' - ')[0].strip()
+        
+        if artist_name == "Unknown":
+            url_parts = url.rstrip('/').split('/')
+            if len(url_parts) > 0:
+                artist_slug = url_parts[-1]
+                artist_name = artist_slug.replace('-', ' ').title()
+                
+    except Exception as e:
+        print(f"  ⚠️ Could not extract artist name: {e}")
+        try:
+            url_parts = url.rstrip('/').split('/')
+            artist_name = url_parts[-1].replace('-', ' ').title()
+        except:
+            pass
+    
+    print(f"  ✓ Artist: {artist_name}")
+    
+    # 🖼️ Artist profile image (selectors live in audiomack_dom.ARTIST_DOM)
+    profile_image = dom['profile_image'] or "N/A"
+    
+    if profile_image != "N/A":
+        print(f"  🖼️  Found profile image: {profile_image[:60]}...")
+    
+    # Followers, total plays, monthly listeners and member since in one pass
+    with METRICS.span('extract', page='artist'):
+        stats = extract_artist_stats(all_text)
+    METRICS.count_missing('artist_text', stats)
+    member_since = stats['member_since']
+    
+    if member_since == "N/A" and dom['sidebar']:
+        member_since = extract_member_since(dom['sidebar'])
+    
+    return {
+        'artist_name': artist_name,
+        'profile_image': profile_image,
+        'followers': stats['followers'],
+        'total_plays': stats['total_plays'],
+        'monthly_listeners': stats['monthly_listeners'],
+        'member_since': member_since,
+    }
+
 def scrape_artist_page(page, url):
     """
     Scrape data from artist page and their top tracks
@@ -290,133 +359,20 @@ def scrape_artist_page(page, url):
     print(f"\n🎵 Scraping: {url}")
     
     try:
-        page.goto(url, wait_until="domcontentloaded", timeout=60000)
-        time.sleep(5)
-        
-        try:
-            page.wait_for_selector('h1', timeout=10000)
-        except:
-            print("  ⚠️ Page loaded slowly, continuing anyway...")
-        
-        all_text = page.inner_text('body')
-        
-        # Extract artist name
-        artist_name = "Unknown"
-        try:
-            sidebar_link = page.locator('a.ArtistSidebar-name-link')
-            if sidebar_link.count() > 0:
-                artist_name = sidebar_link.first.inner_text().strip()
-            elif page.locator('h1').count() > 0:
-                h1_text = page.locator('h1').first.inner_text().strip()
-                if h1_text and h1_text != "":
-                    artist_name = h1_text
-            elif artist_name == "Unknown":
-                try:
-                    title = page.title()
-                    if ' - ' in title:
-                        artist_name = title.split(' - ')[0].strip()
-                except:
-                    pass
-            
-            if artist_name == "Unknown":
-                url_parts = url.rstrip('/').split('/')
-                if len(url_parts) > 0:
-                    artist_slug = url_parts[-1]
-                    artist_name = artist_slug.replace('-', ' ').title()
-                    
-        except Exception as e:
-            print(f"  ⚠️ Could not extract artist name: {e}")
-            try:
-                url_parts = url.rstrip('/').split('/')
-                artist_name = url_parts[-1].replace('-', ' ').title()
-            except:
-                pass
-        
-        print(f"  ✓ Artist: {artist_name}")
-        
-        # 🖼️ NEW: Extract artist profile image
-        # ---------- UPDATED SELECTORS ----------
-        profile_image_selectors = [
-            'img.ArtistAvatar',
-            # keep a fallback that still checks class contains ArtistAvatar if Audiomack varies
-            'img[class*="ArtistAvatar"]',
-        ]
-        # ---------------------------------------
-        profile_image = extract_image_url(page, profile_image_selectors)
-        
-        if profile_image != "N/A":
-            print(f"  🖼️  Found profile image: {profile_image[:60]}...")
-        
-        # Extract followers
-        followers = "N/A"
-        follower_patterns = [
-            r'([\d,.KMB]+)\s*[Ff]ollowers?',
-            r'[Ff]ollowers?\s*[:\-]?\s*([\d,.KMB]+)',
-            r'([\d,.KMB]+)\s*[Ff]ans?'
-        ]
-        
-        for pattern in follower_patterns:
-            match = re.search(pattern, all_text)
-            if match:
-                followers = extract_number(match.group(1))
-                break
-        
-        # Extract Total Account Plays
-        total_plays = "N/A"
-        plays_patterns = [
-            r'([\d,.KMB]+)\s*[Tt]otal\s*[Aa]ccount\s*[Pp]lays?',
-            r'[Tt]otal\s*[Aa]ccount\s*[Pp]lays?\s*[:\-]?\s*([\d,.KMB]+)',
-        ]
-        
-        for pattern in plays_patterns:
-            match = re.search(pattern, all_text)
-            if match:
-                total_plays = extract_number(match.group(1))
-                break
-        
-        # Extract Monthly Listeners
-        monthly_listeners = "N/A"
-        listener_patterns = [
-            r'([\d,.KMB]+)\s*[Mm]onthly\s*[Ll]isteners?',
-            r'[Mm]onthly\s*[Ll]isteners?\s*[:\-]?\s*([\d,.KMB]+)',
-        ]
-        
-        for pattern in listener_patterns:
-            match = re.search(pattern, all_text)
-            if match:
-                monthly_listeners = extract_number(match.group(1))
-                break
-        
-        # Extract Member Since date
-        member_since = "N/A"
-        try:
-            member_patterns = [
-                r'Member since:?\s*(\w+\s+\d{1,2},?\s+\d{4})',
-                r'Joined:?\s*(\w+\s+\d{1,2},?\s+\d{4})',
-                r'Member Since:?\s*(\w+\s+\d{1,2},?\s+\d{4})',
-            ]
-            
-            for pattern in member_patterns:
-                match = re.search(pattern, all_text, re.IGNORECASE)
-                if match:
-                    member_since = match.group(1)
-                    break
-            
-            if member_since == "N/A":
-                try:
-                    sidebar_selector = '.ArtistSidebar-info, .artist-info, [class*="sidebar"]'
-                    if page.locator(sidebar_selector).count() > 0:
-                        sidebar_text = page.locator(sidebar_selector).first.inner_text()
-                        for pattern in member_patterns:
-                            match = re.search(pattern, sidebar_text, re.IGNORECASE)
-                            if match:
-                                member_since = match.group(1)
-                                break
-                except:
-                    pass
-                    
-        except Exception as e:
-            print(f"  ⚠️ Could not extract member since: {e}")
+        fields = None
+        if HTTP is not None:
+            fields = fetch_fast(url, 'artist', lambda html: parse_artist_html(html, url),
+                                REQUIRED_ARTIST_FIELDS)
+            if fields is not None:
+                print(f"  ✓ Artist: {fields['artist_name']} (HTTP)")
+        if fields is None:
+            fields = read_artist_page(page, url)
+        artist_name = fields['artist_name']
+        profile_image = fields['profile_image']
+        followers = fields['followers']
+        total_plays = fields['total_plays']
+        monthly_listeners = fields['monthly_listeners']
+        member_since = fields['member_since']
         
         print(f"  📊 Followers: {followers}")
         print(f"  🎧 Total Account Plays: {total_plays}")
@@ -424,233 +380,711 @@ def scrape_artist_page(page, url):
         
         # Get FULL catalog by visiting /songs page
         print(f"\n  💿 Getting full catalog from /songs page...")
-        track_urls = get_full_catalog(page, url, artist_name)
+        track_urls, catalog_complete = get_full_catalog(page, url, artist_name)
         
         print(f"  🎵 Found {len(track_urls)} total tracks in catalog")
+        if not catalog_complete:
+            print(f"  ⚠️ Catalog enumeration was incomplete for {artist_name}")
         
-        artist_data = {
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'artist_name': artist_name,
-            'url': url,
-            'profile_image': profile_image,  # 🖼️ NEW FIELD
-            'followers': followers,
-            'total_plays': total_plays,
-            'monthly_listeners': monthly_listeners,
-            'member_since': member_since,
-            'tracks_found': len(track_urls)
-        }
+        artist_data = ArtistRecord(
+            artist_name=artist_name,
+            url=url,
+            profile_image=profile_image,  # 🖼️ NEW FIELD
+            followers=followers,
+            total_plays=total_plays,
+            monthly_listeners=monthly_listeners,
+            member_since=member_since,
+            tracks_found=len(track_urls),
+            catalog_complete=catalog_complete  # Not an output column, reported in the summary
+        )
         
+        METRICS.count_missing('artist', artist_data.as_json())
         print(f"  ✅ Artist data collected!")
         return artist_data, track_urls
         
     except Exception as e:
+        METRICS.count('failed.artist')
         print(f"  ❌ Error: {str(e)}")
-        return {
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'artist_name': 'Error',
-            'url': url,
-            'profile_image': 'N/A',  # 🖼️ NEW FIELD
-            'followers': 'Error',
-            'total_plays': 'Error',
-            'monthly_listeners': 'Error',
-            'member_since': 'N/A',
-            'tracks_found': 0,
-            'error': str(e)
-        }, []
+        return ArtistRecord.failure(url, e), []
+
+def song_urls(page):
+    """Absolute, de-duplicated song URLs on the page, read in one evaluate round-trip"""
+    track_urls = []
+    seen_urls = set()
+    for href in page.eval_on_selector_all(SONG_LINK_SELECTOR, SONG_HREFS_JS):
+        if not href or '/song/' not in href:
+            continue
+        if href.startswith('/'):
+            href = f"https://audiomack.com{href}"
+        if href not in seen_urls:
+            seen_urls.add(href)
+            track_urls.append(href)
+    return track_urls
 
 def get_full_catalog(page, artist_url, artist_name):
-    """Get complete artist catalog by visiting /songs page"""
+    """
+    Get complete artist catalog by visiting /songs page
+    Pages through it until no more songs appear, clicking 'Load More' when
+    there is a button and scrolling to the bottom otherwise.
+    Returns (track_urls, complete); complete is False when the listing could
+    not be walked to its end, including when MAX_CATALOG_PAGES or
+    CATALOG_DEADLINE stopped it.
+    """
     try:
         base_url = artist_url.rstrip('/')
         songs_url = f"{base_url}/songs"
         
         print(f"    → Navigating to: {songs_url}")
-        page.goto(songs_url, wait_until="domcontentloaded", timeout=60000)
-        time.sleep(3)
-        
-        track_urls = []
-        previous_count = 0
-        max_clicks = 10
-        clicks = 0
+        goto(page, songs_url, timeout=60000, page_type='catalog')
+        wait_ready(page, 'catalog')
         
-        while clicks < max_clicks:
-            current_tracks = page.locator('a[href*="/song/"]').all()
-            current_count = len(current_tracks)
-            
+        complete = True
+        current_count = page.locator(SONG_LINK_SELECTOR).count()
+        pages = 1
+        deadline = time.monotonic() + CATALOG_DEADLINE
+        while True:
             print(f"    → Found {current_count} tracks so far...")
-            
-            if current_count == previous_count and clicks > 0:
-                print(f"    ✓ No more tracks to load")
+            if pages >= MAX_CATALOG_PAGES or time.monotonic() >= deadline:
+                complete = False
+                print(f"    ⚠️ Stopped paging after {pages} pages - catalog may be incomplete")
                 break
             
-            previous_count = current_count
-            
-            load_more_found = False
-            load_more_selectors = [
-                'button:has-text("Load More")',
-                'button:has-text("Show More")',
-                'button:has-text("View More")',
-                'a:has-text("Load More")',
-                'a:has-text("Show More")',
-                '[class*="load-more"]',
-                '[class*="show-more"]'
-            ]
-            
-            for selector in load_more_selectors:
-                try:
-                    if page.locator(selector).count() > 0:
-                        print(f"    → Clicking 'Load More' button...")
-                        page.locator(selector).first.click()
-                        load_more_found = True
-                        time.sleep(2)
-                        break
-                except:
-                    continue
-            
-            if not load_more_found:
-                print(f"    ✓ No 'Load More' button found - all tracks loaded")
+            load_more = page.locator(LOAD_MORE_SELECTOR).first
+            clicked = load_more.count() > 0 and load_more.is_visible()
+            if clicked:
+                print(f"    → Clicking 'Load More' button...")
+                load_more.click()
+            elif not page.evaluate(SCROLL_TO_BOTTOM_JS):
+                print(f"    ✓ No 'Load More' button and nothing left to scroll - all tracks loaded")
                 break
             
-            clicks += 1
-        
-        all_track_elements = page.locator('a[href*="/song/"]').all()
-        seen_urls = set()
+            pages += 1
+            with METRICS.span('paginate', page='catalog'):
+                more = wait_for_more(page, SONG_LINK_SELECTOR, current_count)
+            if not more:
+                if not clicked:
+                    # The page still scrolled but nothing more arrived in time
+                    complete = False
+                    print(f"    ⚠️ Scrolling stopped returning tracks - catalog may be incomplete")
+                elif load_more.count() > 0 and load_more.is_visible():
+                    # The button is still offered but nothing more arrived
+                    complete = False
+                    print(f"    ⚠️ 'Load More' stopped returning tracks - catalog may be incomplete")
+                else:
+                    print(f"    ✓ No more tracks to load")
+                break
+            current_count = page.locator(SONG_LINK_SELECTOR).count()
         
-        for element in all_track_elements:
-            try:
-                href = element.get_attribute('href')
-                if href and '/song/' in href:
-                    if href.startswith('/'):
-                        href = f"https://audiomack.com{href}"
-                    
-                    if href not in seen_urls:
-                        seen_urls.add(href)
-                        track_urls.append(href)
-            except:
-                continue
+        with METRICS.span('dom', page='catalog'):
+            track_urls = song_urls(page)
+        METRICS.count('catalog.pages', pages)
+        if not complete:
+            METRICS.count('catalog.incomplete')
         
         if MAX_TRACKS_PER_ARTIST > 0:
             track_urls = track_urls[:MAX_TRACKS_PER_ARTIST]
         
-        return track_urls
+        return track_urls, complete
         
     except Exception as e:
+        METRICS.count('failed.catalog')
         print(f"    ⚠️ Error getting full catalog: {e}")
-        return get_tracks_from_main_page(page, artist_url)
+        return get_tracks_from_main_page(page, artist_url), False
 
 def get_tracks_from_main_page(page, artist_url):
     """Fallback: Get tracks from main artist page"""
     try:
-        track_urls = []
-        track_selectors = ['a[href*="/song/"]']
-        
-        for selector in track_selectors:
-            elements = page.locator(selector).all()
-            if len(elements) > 0:
-                for element in elements[:MAX_TRACKS_PER_ARTIST if MAX_TRACKS_PER_ARTIST > 0 else 999]:
-                    href = element.get_attribute('href')
-                    if href and '/song/' in href:
-                        if href.startswith('/'):
-                            href = f"https://audiomack.com{href}"
-                        if href not in track_urls:
-                            track_urls.append(href)
-                break
-        
+        track_urls = song_urls(page)
+        if MAX_TRACKS_PER_ARTIST > 0:
+            track_urls = track_urls[:MAX_TRACKS_PER_ARTIST]
         return track_urls
     except:
         return []
 
-def main():
-    """Main function to scrape all artists and their tracks"""
-    print("=" * 60)
-    print("🎵 L-I-BIZZLE SCRAPER V6 - WITH IMAGES")
-    print("=" * 60)
-    print(f"📊 Tracking {len(ARTISTS)} artists")
-    print(f"🎵 Full catalog mode: {'ENABLED' if SCRAPE_FULL_CATALOG else 'DISABLED'}")
-    if MAX_TRACKS_PER_ARTIST > 0:
-        print(f"⚠️  Limited to {MAX_TRACKS_PER_ARTIST} tracks per artist")
+def parse_args(argv=None):
+    """Parse command line options (defaults come from the configuration above)"""
+    parser = argparse.ArgumentParser(description="Scrape Audiomack artist and track data")
+    parser.add_argument('--workers', type=int, default=WORKERS,
+                        help="parallel browser pages (1 = sequential)")
+    parser.add_argument('--registry', default=REGISTRY_PATH, metavar='PATH',
+                        help="artist registry CSV (slug, tier, refresh_days, active)")
+    parser.add_argument('--processes', type=int, default=PROCESSES,
+                        help="split the artists across N scraper processes, then merge their output")
+    parser.add_argument('--shard', type=parse_shard, metavar='I/N',
+                        help="scrape only shard I of N of the artists (e.g. one CI matrix job); needs --run-id")
+    parser.add_argument('--run-id', help="run id shared by all shards of one run (default: start time)")
+    parser.add_argument('--shard-dir', default=SHARD_DIR, metavar='DIR',
+                        help="where shards write their partial output")
+    parser.add_argument('--rate-limit', type=float, default=RATE_LIMIT,
+                        help="starting navigations per second per host, adapted as the site responds (0 = unlimited)")
+    parser.add_argument('--max-rate', type=float, default=MAX_RATE_LIMIT,
+                        help="ceiling for the adaptive navigation rate per host")
+    parser.add_argument('--retry-budget', type=float, default=RETRY_BUDGET,
+                        help="retries allowed across the run, as a share of requests made")
+    parser.add_argument('--no-network-stats', dest='network_stats', action='store_false',
+                        default=USE_NETWORK_STATS,
+                        help="read track stats from page text only, ignoring API responses")
+    parser.add_argument('--no-http', dest='http_fast_path', action='store_false', default=HTTP_FAST_PATH,
+                        help="always open pages in the browser instead of reading their server-rendered HTML first")
+    parser.add_argument('--no-batch-dom', dest='batch_dom', action='store_false', default=BATCH_DOM,
+                        help="read page fields with one Playwright call each instead of one script per page")
+    parser.add_argument('--response-cache', default=RESPONSE_CACHE_DIR, metavar='DIR',
+                        help="on-disk cache for the scripts, stylesheets and fonts pages load")
+    parser.add_argument('--no-response-cache', dest='response_cache', action='store_const', const=None,
+                        help="download every asset again")
+    parser.add_argument('--profile-dir', default=PROFILE_DIR, metavar='DIR',
+                        help="keep browser profiles (cookies, storage) here between runs")
+    parser.add_argument('--no-block-resources', dest='block_resources', action='store_false',
+                        default=BLOCK_RESOURCES,
+                        help="load images, media, fonts and trackers like a normal browser")
+    parser.add_argument('--allow-resource', action='append', default=list(RESOURCE_ALLOWLIST),
+                        metavar='TYPE_OR_GLOB',
+                        help="never block this resource type or URL glob (repeatable)")
+    parser.add_argument('--incremental', action='store_true', default=INCREMENTAL,
+                        help="only visit new, recent or still-growing tracks; carry the rest over")
+    parser.add_argument('--state-db', default=STATE_DB, metavar='PATH',
+                        help="SQLite track-state store used by --incremental")
+    parser.add_argument('--resume', nargs='?', const='latest', metavar='JOURNAL',
+                        help="resume from a checkpoint journal (default: the newest one)")
+    parser.add_argument('--checkpoint-dir', default=CHECKPOINT_DIR, metavar='DIR',
+                        help="where checkpoint journals are written")
+    parser.add_argument('--format', dest='formats', action='append', choices=FORMATS,
+                        help="output format, repeatable (default: csv)")
+    parser.add_argument('--wait-log', metavar='PATH',
+                        help="write every readiness wait as JSON lines to PATH")
+    parser.add_argument('--no-metrics', dest='metrics', action='store_false', default=WRITE_METRICS,
+                        help="skip the per-stage timing report (audiomack_metrics_<run_id>.jsonl)")
+    args = parser.parse_args(argv)
+    args.formats = args.formats or list(OUTPUT_FORMATS)
+    if args.shard and not args.run_id:
+        parser.error("--shard needs --run-id so the shards of one run can be merged")
+    if args.shard and 'csv' not in args.formats:
+        # Shards are merged from their CSVs
+        args.formats.insert(0, 'csv')
+    return args
+
+def without_option(argv, option, takes_value=True):
+    """argv minus every occurrence of option (as '--opt value' or '--opt=value')"""
+    result = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg == option:
+            skip = takes_value
+        elif not arg.startswith(option + '='):
+            result.append(arg)
+    return result
+
+def run_shard_processes(args, argv, artists):
+    """
+    Run the scraper as args.processes shard processes sharing one run id,
+    then merge their output. Each shard logs to <shard-dir>/<shard run id>.log.
+    A failed shard can be re-run on its own and the run merged again.
+    """
+    count = args.processes
+    run_id = args.run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+    child_argv = argv
+    for option in ('--processes', '--shard', '--run-id'):
+        child_argv = without_option(child_argv, option)
+    os.makedirs(args.shard_dir, exist_ok=True)
+    
+    print(f"🧩 Run {run_id}: {len(artists)} artists across {count} shard processes")
+    children = []
+    for index in range(1, count + 1):
+        log_path = os.path.join(args.shard_dir, f"{shard_run_id(run_id, index, count)}.log")
+        log = open(log_path, 'w', encoding='utf-8')
+        command = [sys.executable, os.path.abspath(__file__), *child_argv,
+                   '--shard', f"{index}/{count}", '--run-id', run_id]
+        children.append((index, log_path, log, subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)))
+        print(f"  ▶️  Shard {index}/{count}: {len(shard_artists(artists, index, count))} artists, log {log_path}")
+    
+    failed = []
+    for index, log_path, log, process in children:
+        process.wait()
+        log.close()
+        output = shard_csv(args.shard_dir, 'artists', run_id, index, count)
+        if process.returncode != 0 or not os.path.exists(output):
+            failed.append(index)
+            print(f"  ❌ Shard {index}/{count} failed (exit code {process.returncode}), see {log_path}")
+        else:
+            print(f"  ✅ Shard {index}/{count} done")
+    
+    if failed:
+        print(f"\n⚠️  Re-run the failed shards, then merge:")
+        for index in failed:
+            print(f"   python {os.path.basename(__file__)} --shard {index}/{count} --run-id {run_id} --resume")
+        print(f"   python audiomack_shards.py --run-id {run_id} --shards {count} --registry {args.registry}")
+        return False
+    
+    for path in merge_shards(run_id, count, artists, args.shard_dir, '.', args.formats):
+        print(f"✅ Saved: {path}")
+    return True
+
+def launch_browser(p):
+    """
+    Launch Chromium and open the scraping context. Returns (browser, context);
+    with a persistent profile the context is also what gets closed.
+    """
+    launch_args = ['--disable-blink-features=AutomationControlled']
+    context_options = {
+        'user_agent': USER_AGENT,
+        'viewport': {'width': 1920, 'height': 1080}
+    }
+    
+    if PROFILE_DIR:
+        # Chromium locks a profile, so every browser of the run gets its own slot
+        profile = os.path.join(PROFILE_DIR, f"slot-{next(PROFILE_SLOTS)}")
+        context = p.chromium.launch_persistent_context(
+            profile, headless=True, args=launch_args, **context_options
+        )
+        browser = context
     else:
-        print(f"💿 Will scrape ALL tracks from each artist")
-    print(f"🖼️  NOW EXTRACTING: Profile pics & album art")
-    print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        browser = p.chromium.launch(headless=True, args=launch_args)
+        context = browser.new_context(**context_options)
+    
+    # The cache goes first: the filter runs before it and passes on what it lets through
+    if RESPONSE_CACHE is not None:
+        RESPONSE_CACHE.install(context)
+    if RESOURCE_FILTER is not None:
+        RESOURCE_FILTER.install(context)
+    
+    return browser, context
+
+def plan_tracks(track_urls, artist_name):
+    """
+    [(track_url, carried_row)] for a catalog. In incremental mode tracks that
+    aren't due get their stored row instead of a visit; otherwise all are None.
+    """
+    if TRACK_STATE is None:
+        return [(track_url, None) for track_url in track_urls]
+    
+    planned = [(track_url, row and TrackRecord.from_row(row))
+               for track_url, row in TRACK_STATE.plan(track_urls, artist_name)]
+    carried = sum(1 for _, row in planned if row is not None)
+    if carried:
+        print(f"  ♻️  {carried} unchanged tracks carried over, {len(planned) - carried} to scrape")
+    return planned
+
+def claim_tracks(artist_url, artist_name, track_urls):
+    """The tracks of a catalog this artist scrapes: songs another artist already listed this run are skipped"""
+    owned = TRACKS.claim_all(artist_url, artist_name, track_urls)
+    shared = len(track_urls) - len(owned)
+    if shared:
+        METRICS.count('tracks.shared', shared)
+        print(f"  🔗 {shared} tracks already listed by another artist this run, scraped once under them")
+    return owned
+
+def record_artist(artist_url, artist_data, track_urls):
+    """Remember a freshly scraped artist and its catalog in the state store (incremental mode)"""
+    if TRACK_STATE is not None and not is_failed_artist(artist_data):
+        TRACK_STATE.update_artist(normalize_slug(artist_url), artist_data.as_json(extras=True), track_urls)
+
+def carry_artists(artists, checkpoint):
+    """
+    Incremental mode: the stored rows of artists whose refresh interval hasn't
+    elapsed, which are written instead of scraping them. Artists already in the
+    checkpoint journal are left to the resume logic.
+    Returns {artist_url: (artist_row, track_rows)}; the scrape loops write
+    them at the artist's place in registry order.
+    """
+    if TRACK_STATE is None:
+        return {}
+    
+    due, not_due = REGISTRY.work_set(artists, TRACK_STATE.artist_last_scraped())
+    carried = {}
+    for artist_url in not_due:
+        stored = None if checkpoint.artist(artist_url) else TRACK_STATE.carry_artist(normalize_slug(artist_url))
+        if stored is None:
+            continue
+        artist_row, track_rows = stored
+        carried[artist_url] = (ArtistRecord.from_row(artist_row), [TrackRecord.from_row(row) for row in track_rows])
     
-    all_artist_data = []
-    all_track_data = []
+    if carried:
+        print(f"♻️  {len(carried)} artists not due for a refresh, carried over; "
+              f"{len(artists) - len(carried)} to scrape")
+    return carried
+
+def carried_tracks(artist_url, artist_data, track_rows):
+    """The stored track rows of a carried artist that are not already listed by another artist this run"""
+    return [row for row in track_rows if TRACKS.claim(row.track_url, artist_url, artist_data.artist_name)]
+
+def record_track(track_data):
+    """Remember a freshly scraped track in the state store (incremental mode)"""
+    if TRACK_STATE is not None and track_data:
+        TRACK_STATE.update(track_data.to_row())
+
+def is_failed_artist(artist_data):
+    return artist_data.failed
+
+def requeue(failed, what):
+    """
+    Failed items put back on the queue at the end of the run, one retry each
+    while the scheduler's retry budget lasts (the rest are given up on)
+    """
+    if failed:
+        print(f"\n🔁 Requeueing {len(failed)} failed {what} "
+              f"(retry budget left: {SCHEDULER.retry_budget.remaining})")
+    for index, item in enumerate(failed):
+        if not SCHEDULER.retry_budget.spend():
+            print(f"  ⚠️  Retry budget used up, giving up on {len(failed) - index} {what}")
+            return
+        yield item
+
+def scrape_tracks_sequential(page, checkpoint, track_sink, artist_url, artist_name, track_urls, failed_tracks):
+    """Scrape (or carry over) one artist's tracks, queueing failures for the requeue pass"""
+    track_urls = claim_tracks(artist_url, artist_name, track_urls)
+    if not track_urls:
+        return
+    print(f"\n  💿 Scraping {len(track_urls)} tracks for {artist_name}...")
+    for track_url, carried_row in plan_tracks(track_urls, artist_name):
+        done = checkpoint.track(artist_url, track_url)
+        if done or carried_row:
+            track_sink.write(done or carried_row)
+            if not done:
+                checkpoint.record_track(artist_url, carried_row)
+            continue
+        track_data = scrape_track_page(page, track_url, artist_name)
+        checkpoint.record_track(artist_url, track_data)
+        record_track(track_data)
+        if track_data:
+            track_sink.write(track_data)
+        else:
+            failed_tracks.append((artist_url, artist_name, track_url))
+
+def scrape_sequential(artists, checkpoint, artist_sink, track_sink, carried=None):
+    """
+    Scrape every artist, then their tracks, one at a time on a single page.
+    Pacing comes from the request scheduler; failed artists and tracks are
+    requeued once at the end of their phase, and a retried artist keeps its
+    place, so rows come out in the same order as scrape_concurrent writes
+    them. Carried artists (see carry_artists) are written in their place.
+    """
+    carried = carried or {}
+    failed_tracks = []
     
     with sync_playwright() as p:
         print("🌐 Launching browser...\n")
-        browser = p.chromium.launch(
-            headless=True,
-            args=['--disable-blink-features=AutomationControlled']
-        )
-        
-        context = browser.new_context(
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            viewport={'width': 1920, 'height': 1080}
-        )
-        
+        browser, context = launch_browser(p)
         page = context.new_page()
         
-        for i, artist_url in enumerate(ARTISTS, 1):
-            print(f"\n[{i}/{len(ARTISTS)}] " + "=" * 50)
+        artist_results = []
+        for i, artist_url in enumerate(artists, 1):
+            print(f"\n[{i}/{len(artists)}] " + "=" * 50)
             
-            artist_data, track_urls = scrape_artist_page(page, artist_url)
-            all_artist_data.append(artist_data)
+            if artist_url in carried:
+                print(f"\n♻️  {carried[artist_url][0].artist_name}: carried over")
+                artist_results.append(carried[artist_url])
+                continue
             
-            if track_urls:
-                print(f"\n  💿 Scraping {len(track_urls)} tracks for {artist_data['artist_name']}...")
-                for track_url in track_urls:
-                    track_data = scrape_track_page(page, track_url, artist_data['artist_name'])
-                    if track_data:
-                        all_track_data.append(track_data)
-                    time.sleep(1)
+            resumed = checkpoint.artist(artist_url)
+            if resumed:
+                print(f"\n⏭️  {resumed[0].artist_name}: restored from checkpoint")
+                artist_results.append(resumed)
+                continue
             
-            if i < len(ARTISTS):
-                print(f"\n  ⏸️ Waiting 3 seconds before next artist...")
-                time.sleep(3)
+            artist_data, track_urls = scrape_artist_page(page, artist_url)
+            if not is_failed_artist(artist_data):
+                checkpoint.record_artist(artist_url, artist_data, track_urls)
+                record_artist(artist_url, artist_data, track_urls)
+            artist_results.append((artist_data, track_urls))
+        
+        failed = [i for i, (artist_data, _) in enumerate(artist_results) if is_failed_artist(artist_data)]
+        for i in requeue(failed, 'artists'):
+            artist_data, track_urls = scrape_artist_page(page, artists[i])
+            checkpoint.record_artist(artists[i], artist_data, track_urls)
+            record_artist(artists[i], artist_data, track_urls)
+            artist_results[i] = (artist_data, track_urls)
+        
+        all_artist_data = [artist_data for artist_data, _ in artist_results]
+        for artist_data in all_artist_data:
+            artist_sink.write(artist_data)
+        
+        for artist_url, (artist_data, track_urls) in zip(artists, artist_results):
+            if artist_url in carried:
+                for track_row in carried_tracks(artist_url, artist_data, carried[artist_url][1]):
+                    track_sink.write(track_row)
+                continue
+            scrape_tracks_sequential(page, checkpoint, track_sink, artist_url,
+                                     artist_data.artist_name, track_urls, failed_tracks)
+        
+        for artist_url, artist_name, track_url in requeue(failed_tracks, 'tracks'):
+            track_data = scrape_track_page(page, track_url, artist_name)
+            checkpoint.record_track(artist_url, track_data)
+            record_track(track_data)
+            if track_data:
+                track_sink.write(track_data)
         
         browser.close()
     
-    # Save artist data with images
-    if all_artist_data:
-        artist_filename = f"audiomack_artists_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    return all_artist_data
+
+def journal_artist(checkpoint, artist_url):
+    """Future callback that journals a scrape_artist_page result as soon as it lands"""
+    def callback(future):
+        if future.exception() is None:
+            checkpoint.record_artist(artist_url, *future.result())
+    return callback
+
+def journal_track(checkpoint, artist_url):
+    """Future callback that journals a scrape_track_page result as soon as it lands"""
+    def callback(future):
+        if future.exception() is None:
+            checkpoint.record_track(artist_url, future.result())
+    return callback
+
+def scrape_concurrent(artists, workers, checkpoint, artist_sink, track_sink, carried=None):
+    """
+    Scrape artists, then all their tracks, across a pool of browser pages.
+    Pacing comes from the request scheduler instead of fixed sleeps; failed
+    artists and tracks are requeued once at the end of their phase.
+    Rows are streamed in the same order as scrape_sequential produces them,
+    each one as soon as it and everything before it has finished; carried
+    artists (see carry_artists) are written in their place.
+    """
+    carried = carried or {}
+    print(f"🌐 Launching {workers} browser workers...\n")
+    
+    with PagePool(workers, launch_browser) as pool:
+        artist_futures = []
+        for artist_url in artists:
+            if artist_url in carried or checkpoint.artist(artist_url):
+                artist_futures.append(None)
+                continue
+            future = pool.submit(scrape_artist_page, artist_url)
+            future.add_done_callback(journal_artist(checkpoint, artist_url))
+            artist_futures.append(future)
         
-        artist_fieldnames = ['timestamp', 'artist_name', 'url', 'profile_image', 'followers', 'total_plays', 'monthly_listeners', 'member_since', 'tracks_found']
+        artist_results = [
+            future.result() if future else carried[artist_url] if artist_url in carried
+            else checkpoint.artist(artist_url)
+            for artist_url, future in zip(artists, artist_futures)
+        ]
         
-        with open(artist_filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=artist_fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            writer.writerows(all_artist_data)
+        failed = [i for i, (artist_data, _) in enumerate(artist_results) if is_failed_artist(artist_data)]
+        retries = []
+        for i in requeue(failed, 'artists'):
+            future = pool.submit(scrape_artist_page, artists[i])
+            future.add_done_callback(journal_artist(checkpoint, artists[i]))
+            retries.append((i, future))
+        for i, future in retries:
+            artist_results[i] = future.result()
         
-        print("\n" + "=" * 60)
-        print(f"✅ Artist data saved to: {artist_filename}")
-        print(f"📈 Total artists scraped: {len(all_artist_data)}")
-    
-    # Save track data with album art
-    if all_track_data:
-        track_filename = f"audiomack_tracks_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        for artist_url, (artist_data, track_urls) in zip(artists, artist_results):
+            if artist_url not in carried:
+                record_artist(artist_url, artist_data, track_urls)
+        all_artist_data = [artist_data for artist_data, _ in artist_results]
+        for artist_data in all_artist_data:
+            artist_sink.write(artist_data)
         
-        track_fieldnames = ['timestamp', 'artist_name', 'track_title', 'track_url', 'album_art', 'plays', 'likes', 'reposts', 'playlist_adds', 'release_date']
+        planned = []
+        for artist_url, (artist_data, track_urls) in zip(artists, artist_results):
+            if artist_url in carried:
+                for track_row in carried_tracks(artist_url, artist_data, carried[artist_url][1]):
+                    planned.append((artist_url, artist_data.artist_name, track_row.track_url, track_row))
+                continue
+            owned = claim_tracks(artist_url, artist_data.artist_name, track_urls)
+            for track_url, carried_row in plan_tracks(owned, artist_data.artist_name):
+                done = checkpoint.track(artist_url, track_url)
+                if carried_row and not done:
+                    checkpoint.record_track(artist_url, carried_row)
+                planned.append((artist_url, artist_data.artist_name, track_url, done or carried_row))
+        
+        pending = sum(1 for *_, row in planned if not row)
+        print(f"\n💿 Scraping {pending} tracks with {workers} workers...")
         
-        with open(track_filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=track_fieldnames)
-            writer.writeheader()
-            writer.writerows(all_track_data)
+        track_futures = []
+        for artist_url, artist_name, track_url, row in planned:
+            if row:
+                track_futures.append(None)
+                continue
+            future = pool.submit(scrape_track_page, track_url, artist_name)
+            future.add_done_callback(journal_track(checkpoint, artist_url))
+            track_futures.append(future)
         
-        print(f"✅ Track data saved to: {track_filename}")
-        print(f"🎵 Total tracks scraped: {len(all_track_data)}")
+        failed_tracks = []
+        for (artist_url, artist_name, track_url, row), future in zip(planned, track_futures):
+            if row:
+                track_sink.write(row)
+                continue
+            track_data = future.result()
+            record_track(track_data)
+            if track_data:
+                track_sink.write(track_data)
+            else:
+                failed_tracks.append((artist_url, artist_name, track_url))
+        
+        retries = []
+        for artist_url, artist_name, track_url in requeue(failed_tracks, 'tracks'):
+            future = pool.submit(scrape_track_page, track_url, artist_name)
+            future.add_done_callback(journal_track(checkpoint, artist_url))
+            retries.append(future)
+        for future in retries:
+            track_data = future.result()
+            record_track(track_data)
+            if track_data:
+                track_sink.write(track_data)
+    
+    return all_artist_data
+
+def main(argv=None):
+    """Main function to scrape all artists and their tracks"""
+    global BATCH_DOM, HTTP, PROFILE_DIR, REGISTRY, RESOURCE_FILTER, RESPONSE_CACHE, SCHEDULER, TRACK_STATE
+    global TRACKS, USE_NETWORK_STATS
+    
+    argv = sys.argv[1:] if argv is None else argv
+    args = parse_args(argv)
+    REGISTRY = ArtistRegistry.load(args.registry)
+    artists = REGISTRY.urls()
+    if args.processes > 1 and not args.shard:
+        if not run_shard_processes(args, argv, artists):
+            sys.exit(1)
+        return
+    
+    run_id = args.run_id
+    output_dir = '.'
+    if args.shard:
+        index, count = args.shard
+        artists = shard_artists(artists, index, count)
+        run_id = shard_run_id(args.run_id, index, count)
+        output_dir = args.shard_dir
+        os.makedirs(output_dir, exist_ok=True)
+    
+    SCHEDULER = RequestScheduler(args.rate_limit, args.max_rate, retry_budget=RetryBudget(args.retry_budget))
+    RESOURCE_FILTER = ResourceFilter(args.allow_resource) if args.block_resources else None
+    RESPONSE_CACHE = ResponseCache(args.response_cache) if args.response_cache else None
+    PROFILE_DIR = args.profile_dir
+    if PROFILE_DIR and args.shard:
+        # Shard processes run side by side, so they cannot share profile slots
+        PROFILE_DIR = os.path.join(PROFILE_DIR, f"shard-{args.shard[0]}")
+    USE_NETWORK_STATS = args.network_stats
+    BATCH_DOM = args.batch_dom
+    TRACK_STATE = TrackStateStore(args.state_db) if args.incremental else None
+    HTTP = None
+    if args.http_fast_path:
+        try:
+            HTTP = HttpClient()
+        except ImportError as e:
+            print(f"⚠️  HTTP fast path disabled: {e}")
+    
+    print("=" * 60)
+    print("🎵 L-I-BIZZLE SCRAPER V6 - WITH IMAGES")
+    print("=" * 60)
+    print(f"📊 Tracking {len(artists)} artists from {args.registry}")
+    if args.shard:
+        print(f"🧩 Shard {args.shard[0]}/{args.shard[1]} of run {args.run_id}")
+    print(f"🎵 Full catalog mode: {'ENABLED' if SCRAPE_FULL_CATALOG else 'DISABLED'}")
+    if MAX_TRACKS_PER_ARTIST > 0:
+        print(f"⚠️  Limited to {MAX_TRACKS_PER_ARTIST} tracks per artist")
+    else:
+        print(f"💿 Will scrape ALL tracks from each artist")
+    print(f"🖼️  NOW EXTRACTING: Profile pics & album art")
+    if args.workers > 1:
+        print(f"⚡ Concurrent mode: {args.workers} workers")
+    if args.rate_limit:
+        print(f"🚦 Adaptive pacing: {args.rate_limit} req/s per host to start, up to {args.max_rate}")
+    if HTTP is not None:
+        print(f"🌐 HTTP fast path: {HTTP.protocol}, browser only for pages missing required fields")
+    if TRACK_STATE is not None:
+        print(f"♻️  Incremental mode: {TRACK_STATE.count()} known tracks in {args.state_db}")
+    
+    checkpoint = None
+    if args.resume:
+        journal = None if args.resume == 'latest' else args.resume
+        if journal is None and args.shard:
+            # A shard resumes its own journal, not the newest one of any shard
+            journal = os.path.join(args.checkpoint_dir, f"run_{run_id}.jsonl")
+        if journal is None or os.path.exists(journal):
+            checkpoint = Checkpoint.resume(journal, args.checkpoint_dir)
+        if checkpoint is None:
+            print("⚠️  No checkpoint to resume from, starting a fresh run")
+        else:
+            print(f"⏯️  Resuming run {checkpoint.run_id}: {checkpoint.artist_count} artists, "
+                  f"{checkpoint.track_count} tracks already done")
+    if checkpoint is None:
+        checkpoint = Checkpoint.start(args.checkpoint_dir, run_id)
+    print(f"💾 Checkpoint journal: {checkpoint.path}")
+    print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    
+    # Files are named after the run start (a resumed run keeps its original name)
+    artist_sink = open_sinks('artists', checkpoint.run_id, args.formats, output_dir)
+    track_sink = open_sinks('tracks', checkpoint.run_id, args.formats, output_dir)
+    link_sink = open_sinks('track_artists', checkpoint.run_id, args.formats, output_dir)
+    TRACKS = TrackRegistry(link_sink)
+    try:
+        carried = carry_artists(artists, checkpoint)
+        if args.workers > 1:
+            all_artist_data = scrape_concurrent(artists, args.workers, checkpoint, artist_sink, track_sink, carried)
+        else:
+            all_artist_data = scrape_sequential(artists, checkpoint, artist_sink, track_sink, carried)
+    finally:
+        artist_sink.close()
+        track_sink.close()
+        link_sink.close()
+    
+    if TRACK_STATE is not None:
+        TRACK_STATE.close()
+    if HTTP is not None:
+        HTTP.close()
+    
+    SCHEDULER.print_summary()
+    WAIT_LOG.print_summary()
+    if RESOURCE_FILTER is not None:
+        RESOURCE_FILTER.print_summary()
+    if RESPONSE_CACHE is not None:
+        RESPONSE_CACHE.print_summary()
+        RESPONSE_CACHE.prune()
+    METRICS.print_summary()
+    if args.wait_log:
+        WAIT_LOG.write(args.wait_log)
+        print(f"⏱️  Wait log saved to: {args.wait_log}")
+    if args.metrics:
+        spans_path, summary_path = METRICS.write_report(
+            os.path.join(output_dir, f"audiomack_metrics_{checkpoint.run_id}"),
+            extra={
+                'run_id': checkpoint.run_id,
+                'workers': args.workers,
+                'rows': {'artists': artist_sink.rows, 'tracks': track_sink.rows},
+                'requests': dict(SCHEDULER.counts),
+                'waits': WAIT_LOG.summary(),
+                'blocked': dict(RESOURCE_FILTER.blocked) if RESOURCE_FILTER is not None else {},
+                'response_cache': RESPONSE_CACHE.summary() if RESPONSE_CACHE is not None else {},
+            })
+        print(f"📏 Run metrics saved to: {spans_path} (summary: {summary_path})")
+    
+    if artist_sink.rows:
+        print("\n" + "=" * 60)
+        for path in artist_sink.paths:
+            print(f"✅ Artist data saved to: {path}")
+        print(f"📈 Total artists scraped: {artist_sink.rows}")
+    
+    if track_sink.rows:
+        for path in track_sink.paths:
+            print(f"✅ Track data saved to: {path}")
+        print(f"🎵 Total tracks scraped: {track_sink.rows}")
+        for path in link_sink.paths:
+            print(f"✅ Track-artist links saved to: {path}")
         print(f"⏰ Finished at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 60)
         
-        successful_artists = sum(1 for d in all_artist_data if d['artist_name'] != 'Error')
+        successful_artists = sum(1 for d in all_artist_data if not d.failed)
         print(f"\n📊 Summary:")
         print(f"  ✓ Artists successful: {successful_artists}")
         print(f"  ✗ Artists with errors: {len(all_artist_data) - successful_artists}")
-        print(f"  🎵 Tracks scraped: {len(all_track_data)}")
-        print(f"  📊 Avg tracks per artist: {len(all_track_data) / max(successful_artists, 1):.1f}")
+        print(f"  🎵 Tracks scraped: {track_sink.rows}")
+        print(f"  📊 Avg tracks per artist: {track_sink.rows / max(successful_artists, 1):.1f}")
+        if TRACKS.shared:
+            print(f"  🔗 Tracks on several artists' catalogs: {TRACKS.shared} (scraped once each)")
+        
+        incomplete = [d.artist_name for d in all_artist_data if d.catalog_complete is False]
+        if incomplete:
+            print(f"  ⚠️ Incomplete catalogs ({len(incomplete)}): {', '.join(incomplete)}")
         
     else:
         print("\n⚠️ No data collected")
+    
+    # Everything is on disk now, the journal is no longer needed
+    checkpoint.finish()
 
 if __name__ == "__main__":
     main()
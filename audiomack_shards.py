@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Sharded runs for the Audiomack scraper
+The artist list is split round-robin into N shards that run as separate
+processes (--processes N) or separate CI jobs (--shard I/N). Every shard
+writes its own partial CSVs under shards/, and merge_shards combines them
+into the usual audiomack_artists_<run_id> / audiomack_tracks_<run_id> files.
+
+Merge a run by hand (e.g. after re-running a failed shard):
+    python audiomack_shards.py --run-id 20251011_011316 --shards 4
+"""
+
+import argparse
+import csv
+import os
+
+from audiomack_catalog import canonical_track_url
+from audiomack_registry import DEFAULT_REGISTRY, ArtistRegistry
+from audiomack_sinks import FORMATS, open_sinks
+
+DEFAULT_SHARD_DIR = 'shards'
+
+
+def parse_shard(value):
+    """'2/4' -> (2, 4); shards are numbered from 1"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected I/N, got {value!r}")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {value!r} is out of range")
+    return index, count
+
+
+def shard_artists(artists, index, count):
+    """The artists shard index of count scrapes (round-robin, so shards stay balanced)"""
+    return artists[index - 1::count]
+
+
+def shard_run_id(run_id, index, count):
+    """Run id of one shard: names its checkpoint journal and partial output files"""
+    return f"{run_id}_shard{index}of{count}"
+
+
+def shard_csv(shard_dir, kind, run_id, index, count):
+    """Path of a shard's partial CSV for 'artists' or 'tracks'"""
+    return os.path.join(shard_dir, f"audiomack_{kind}_{shard_run_id(run_id, index, count)}.csv")
+
+
+def _read_rows(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def _first_per_track(keyed_rows):
+    """Sorted (key, row) track rows, keeping the first row of every canonical track URL"""
+    seen = set()
+    kept = []
+    for key, row in keyed_rows:
+        track = canonical_track_url(row['track_url'])
+        if track not in seen:
+            seen.add(track)
+            kept.append((key, row))
+    return kept
+
+
+def missing_shards(run_id, count, shard_dir=DEFAULT_SHARD_DIR):
+    """Shard numbers whose artist output is missing (not run, or crashed before any row)"""
+    return [index for index in range(1, count + 1)
+            if not os.path.exists(shard_csv(shard_dir, 'artists', run_id, index, count))]
+
+
+def merge_shards(run_id, count, artists, shard_dir=DEFAULT_SHARD_DIR, output_dir='.', formats=('csv',)):
+    """
+    Combine the partial outputs of all count shards of run_id.
+    Rows come out in artist-list order (tracks grouped under their artist, in
+    the order their shard scraped them), whatever order the shards finished in.
+    A track listed by artists of different shards is kept once, under the
+    first of them, which is also the primary artist in the merged links.
+    Returns the written paths, or None if a shard's output is missing.
+    """
+    missing = missing_shards(run_id, count, shard_dir)
+    if missing:
+        print(f"❌ Cannot merge run {run_id}: no output from shard(s) {', '.join(map(str, missing))} of {count}")
+        return None
+
+    position = {url: i for i, url in enumerate(artists)}
+    unknown = len(position)
+    artist_rows = []
+    track_rows = []
+    link_rows = []
+    for index in range(1, count + 1):
+        for n, row in enumerate(_read_rows(shard_csv(shard_dir, 'artists', run_id, index, count))):
+            artist_rows.append(((position.get(row['url'], unknown), index, n), row))
+        # A tracks row is under the artist the shard's links mark primary for it
+        # (not its display name, which two artists or every failed row can share)
+        owner = {}
+        for n, row in enumerate(_read_rows(shard_csv(shard_dir, 'track_artists', run_id, index, count))):
+            link_rows.append(((position.get(row['artist_url'], unknown), index, n), row))
+            if row['primary'] == 'True':
+                owner.setdefault(canonical_track_url(row['track_url']), row['artist_url'])
+        for n, row in enumerate(_read_rows(shard_csv(shard_dir, 'tracks', run_id, index, count))):
+            artist_url = owner.get(canonical_track_url(row['track_url']))
+            track_rows.append(((position.get(artist_url, unknown), index, n), row))
+
+    track_rows = _first_per_track(sorted(track_rows, key=lambda item: item[0]))
+    owners = set()
+    for _, row in sorted(link_rows, key=lambda item: item[0]):
+        key = canonical_track_url(row['track_url'])
+        row['primary'] = key not in owners
+        owners.add(key)
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for kind, rows in (('artists', artist_rows), ('tracks', track_rows), ('track_artists', link_rows)):
+        sink = open_sinks(kind, run_id, formats, output_dir)
+        try:
+            for _, row in sorted(rows, key=lambda item: item[0]):
+                sink.write(row)
+        finally:
+            sink.close()
+        paths.extend(sink.paths)
+
+    print(f"🧩 Merged {count} shards: {len(artist_rows)} artists, {len(track_rows)} tracks")
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge the shard outputs of a sharded scraper run")
+    parser.add_argument('--run-id', required=True, help="run id the shards were started with")
+    parser.add_argument('--shards', type=int, required=True, help="number of shards in the run")
+    parser.add_argument('--registry', default=DEFAULT_REGISTRY, help="artist registry the run used")
+    parser.add_argument('--shard-dir', default=DEFAULT_SHARD_DIR, help="where the shard outputs are")
+    parser.add_argument('--output-dir', default='.', help="where the merged files are written")
+    parser.add_argument('--format', dest='formats', action='append', choices=FORMATS,
+                        help="output format, repeatable (default: csv)")
+    args = parser.parse_args(argv)
+
+    artists = ArtistRegistry.load(args.registry).urls()
+    paths = merge_shards(args.run_id, args.shards, artists, args.shard_dir, args.output_dir,
+                         args.formats or ['csv'])
+    if paths is None:
+        raise SystemExit(1)
+    for path in paths:
+        print(f"✅ Saved: {path}")
+
+
+if __name__ == '__main__':
+    main()
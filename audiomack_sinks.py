@@ -0,0 +1,188 @@
+"""
+Streaming output sinks for the Audiomack scraper
+Rows are written to disk as soon as they are produced instead of in one
+bulk write at the end of the run. Every format is written from the typed
+records of audiomack_records, whose classes are the file schemas: CSV keeps
+the historical text format, JSON Lines and the columnar formats (Parquet,
+Arrow IPC) store counts as real integers.
+"""
+
+import csv
+import json
+import os
+
+from audiomack_metrics import METRICS
+from audiomack_records import RECORDS, to_record
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+ARTIST_FIELDS = RECORDS['artists'].columns()
+TRACK_FIELDS = RECORDS['tracks'].columns()
+# Every artist whose catalog lists a track (primary: the artist its tracks row is under)
+TRACK_ARTIST_FIELDS = RECORDS['track_artists'].columns()
+
+FIELDS = {kind: record_class.columns() for kind, record_class in RECORDS.items()}
+
+FORMATS = ('csv', 'json', 'parquet', 'arrow')
+EXTENSIONS = {'csv': 'csv', 'json': 'jsonl', 'parquet': 'parquet', 'arrow': 'arrow'}
+
+
+class CsvSink:
+    """Appends records to a CSV file, flushing after each one. The file is created on the first row."""
+
+    def __init__(self, path, fieldnames):
+        self.path = path
+        self.fieldnames = fieldnames
+        self.rows = 0
+        self._file = None
+        self._writer = None
+
+    def write(self, record):
+        if self._writer is None:
+            self._file = open(self.path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.fieldnames)
+        self._writer.writerow(record.csv_values())
+        self._file.flush()
+        self.rows += 1
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class JsonSink:
+    """Appends records to a JSON Lines file (counts as numbers, dates in ISO form), one object per line"""
+
+    def __init__(self, path, fieldnames):
+        self.path = path
+        self.fieldnames = fieldnames
+        self.rows = 0
+        self._file = None
+
+    def write(self, record):
+        if self._file is None:
+            self._file = open(self.path, 'w', encoding='utf-8')
+        self._file.write(json.dumps(record.as_json(), ensure_ascii=False) + '\n')
+        self._file.flush()
+        self.rows += 1
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class ColumnarSink:
+    """
+    Buffers records into record batches of batch_size and streams each batch
+    to a Parquet file (one row group per batch) or an Arrow IPC file. Count
+    columns are int64 (null when missing), the rest their CSV text.
+    """
+
+    def __init__(self, path, record_class, fmt='parquet', batch_size=500):
+        if pa is None:
+            raise ImportError(f"pyarrow is required for {fmt} output (pip install pyarrow)")
+        self.path = path
+        self.fieldnames = record_class.columns()
+        self.int_fields = record_class.int_columns()
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.schema = pa.schema([
+            (name, pa.int64() if name in self.int_fields else pa.string()) for name in self.fieldnames
+        ])
+        self.rows = 0
+        self._buffer = []
+        self._writer = None
+
+    def write(self, record):
+        self._buffer.append(record)
+        self.rows += 1
+        if len(self._buffer) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        texts = [record.csv_values() for record in self._buffer]
+        columns = []
+        for i, name in enumerate(self.fieldnames):
+            if name in self.int_fields:
+                columns.append([getattr(record, name) for record in self._buffer])
+            else:
+                columns.append([values[i] for values in texts])
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+            schema=self.schema
+        )
+        self._buffer = []
+
+        if self._writer is None:
+            if self.fmt == 'parquet':
+                self._writer = pq.ParquetWriter(self.path, self.schema)
+            else:
+                self._writer = pa.ipc.new_file(self.path, self.schema)
+        if self.fmt == 'parquet':
+            self._writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class MultiSink:
+    """
+    Fans every row out to one sink per output format. Rows can be records or
+    dicts (e.g. CSV rows when merging shards); dicts are turned into a record
+    of the sink's kind once, before any format is written.
+    """
+
+    def __init__(self, sinks, kind):
+        self.sinks = sinks
+        self.kind = kind
+        self.fieldnames = FIELDS[kind]
+
+    @property
+    def rows(self):
+        return self.sinks[0].rows if self.sinks else 0
+
+    @property
+    def paths(self):
+        return [sink.path for sink in self.sinks if sink.rows]
+
+    def write(self, row):
+        with METRICS.span('output'):
+            record = to_record(self.kind, row)
+            for sink in self.sinks:
+                sink.write(record)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def open_sinks(kind, run_id, formats=('csv',), directory='.'):
+    """
+    Sinks for 'artists', 'tracks' or 'track_artists' rows of one run, named
+    like the historical files: audiomack_<kind>_<run_id>.<ext>
+    """
+    sinks = []
+    for fmt in formats:
+        path = os.path.join(directory, f"audiomack_{kind}_{run_id}.{EXTENSIONS[fmt]}")
+        if fmt == 'csv':
+            sinks.append(CsvSink(path, FIELDS[kind]))
+        elif fmt == 'json':
+            sinks.append(JsonSink(path, FIELDS[kind]))
+        else:
+            sinks.append(ColumnarSink(path, RECORDS[kind], fmt=fmt))
+    return MultiSink(sinks, kind)
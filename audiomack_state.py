@@ -0,0 +1,232 @@
+"""
+Persistent track state for incremental scraping
+A SQLite store of every track's last-seen row, used to decide which tracks
+in a catalog actually need a fresh page visit on this run
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+from audiomack_extractors import parse_number
+
+DEFAULT_STATE_DB = 'state/track_state.db'
+
+# Shard processes (--shards) share the store: WAL lets them read while one
+# writes, and a writer waits BUSY_TIMEOUT seconds for the lock, then retries
+BUSY_TIMEOUT = 30
+LOCK_RETRIES = 5
+
+# Refresh policy
+NEW_RELEASE_DAYS = 30  # Released within this many days: refresh every run
+FLAT_DAILY_GROWTH = 0.002  # Plays growing slower than 0.2%/day count as flat
+STALE_REFRESH_DAYS = 7  # Old, flat tracks are still refreshed at least weekly
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+ROW_FIELDS = ('timestamp', 'artist_name', 'track_title', 'track_url', 'album_art',
+              'plays', 'likes', 'reposts', 'playlist_adds', 'release_date')
+STAT_FIELDS = ('plays', 'likes', 'reposts', 'playlist_adds')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracks (
+    track_url TEXT PRIMARY KEY,
+    timestamp TEXT,
+    artist_name TEXT,
+    track_title TEXT,
+    album_art TEXT,
+    plays TEXT,
+    likes TEXT,
+    reposts TEXT,
+    playlist_adds TEXT,
+    release_date TEXT,
+    first_seen TEXT NOT NULL,
+    last_changed TEXT NOT NULL,
+    daily_growth REAL
+);
+CREATE TABLE IF NOT EXISTS artists (
+    slug TEXT PRIMARY KEY,
+    last_scraped TEXT NOT NULL,
+    artist_row TEXT NOT NULL,
+    track_urls TEXT NOT NULL
+);
+"""
+
+
+def _parse_timestamp(value):
+    try:
+        return datetime.strptime(value, TIMESTAMP_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_release_date(value):
+    for fmt in ('%B %d, %Y', '%B %d %Y', '%b %d, %Y'):
+        try:
+            return datetime.strptime((value or '').strip(), fmt)
+        except ValueError:
+            continue
+    return None
+
+
+class TrackStateStore:
+    """
+    Last-seen stats, scrape time and release date for every track URL, and
+    the last artist row and catalog of every artist (keyed by registry slug).
+
+    New releases and tracks whose plays are still moving are refreshed every
+    run; old, flat tracks only every STALE_REFRESH_DAYS. Skipped tracks are
+    carried forward from their stored row, so output files stay complete.
+    """
+
+    def __init__(self, path=DEFAULT_STATE_DB):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._retry_locked(lambda: self._conn.execute('PRAGMA journal_mode=WAL'))
+        self._retry_locked(lambda: self._conn.executescript(SCHEMA))
+        self._conn.commit()
+
+    def _retry_locked(self, operation):
+        """Run operation, retrying with a growing pause while another process holds the database lock"""
+        for attempt in range(LOCK_RETRIES):
+            try:
+                return operation()
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) or attempt == LOCK_RETRIES - 1:
+                    raise
+                self._conn.rollback()
+                print(f"  ⚠️ Track state database locked, retrying ({attempt + 1}/{LOCK_RETRIES - 1})")
+                time.sleep(2 ** attempt)
+
+    def _write(self, sql, params):
+        """Execute and commit one write (callers hold self._lock)"""
+        def write():
+            self._conn.execute(sql, params)
+            self._conn.commit()
+        self._retry_locked(write)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get(self, track_url):
+        """Stored state for track_url as a dict, or None if never seen"""
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM tracks WHERE track_url = ?', (track_url,)).fetchone()
+        return dict(row) if row else None
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM tracks').fetchone()[0]
+
+    def is_due(self, state, now=None):
+        """Whether a stored track should be visited again on this run"""
+        now = now or datetime.now()
+
+        last_scraped = _parse_timestamp(state['timestamp'])
+        if last_scraped is None or now - last_scraped >= timedelta(days=STALE_REFRESH_DAYS):
+            return True
+
+        released = _parse_release_date(state['release_date'])
+        if released is None or now - released <= timedelta(days=NEW_RELEASE_DAYS):
+            return True
+
+        growth = state['daily_growth']
+        return growth is None or growth >= FLAT_DAILY_GROWTH
+
+    def plan(self, track_urls, artist_name, now=None):
+        """
+        Diff a catalog against the store.
+        Returns [(track_url, carried_row)] in catalog order, where carried_row
+        is None for new or due tracks (scrape them) and the stored row otherwise.
+        """
+        now = now or datetime.now()
+        planned = []
+        for track_url in track_urls:
+            state = self.get(track_url)
+            if state is None or self.is_due(state, now):
+                planned.append((track_url, None))
+            else:
+                row = {field: state[field] for field in ROW_FIELDS}
+                row['artist_name'] = artist_name
+                planned.append((track_url, row))
+        return planned
+
+    def update(self, track_data):
+        """Record a freshly scraped track row"""
+        now = track_data.get('timestamp') or datetime.now().strftime(TIMESTAMP_FORMAT)
+        previous = self.get(track_data['track_url'])
+
+        if previous is None:
+            first_seen = last_changed = now
+            daily_growth = None
+        else:
+            first_seen = previous['first_seen']
+            changed = any(str(track_data.get(f)) != str(previous[f]) for f in STAT_FIELDS)
+            last_changed = now if changed else previous['last_changed']
+            daily_growth = self._daily_growth(previous, track_data, now)
+
+        values = [str(track_data.get(field, 'N/A')) for field in ROW_FIELDS]
+        with self._lock:
+            self._write(
+                f"INSERT OR REPLACE INTO tracks ({', '.join(ROW_FIELDS)}, first_seen, last_changed, daily_growth) "
+                f"VALUES ({', '.join('?' * len(ROW_FIELDS))}, ?, ?, ?)",
+                values + [first_seen, last_changed, daily_growth]
+            )
+
+    @staticmethod
+    def _daily_growth(previous, track_data, now):
+        old_plays = parse_number(previous['plays'])
+        new_plays = parse_number(track_data.get('plays'))
+        then = _parse_timestamp(previous['timestamp'])
+        now = _parse_timestamp(now)
+        if not old_plays or new_plays is None or then is None or now is None:
+            return previous['daily_growth']
+
+        days = (now - then).total_seconds() / 86400
+        if days <= 0:
+            return previous['daily_growth']
+        return (new_plays - old_plays) / old_plays / days
+
+    def artist_last_scraped(self):
+        """{slug: timestamp} of every artist's last successful scrape"""
+        with self._lock:
+            rows = self._conn.execute('SELECT slug, last_scraped FROM artists').fetchall()
+        return {row['slug']: row['last_scraped'] for row in rows}
+
+    def update_artist(self, slug, artist_data, track_urls):
+        """Record a freshly scraped artist row and its catalog"""
+        now = artist_data.get('timestamp') or datetime.now().strftime(TIMESTAMP_FORMAT)
+        with self._lock:
+            self._write(
+                'INSERT OR REPLACE INTO artists (slug, last_scraped, artist_row, track_urls) VALUES (?, ?, ?, ?)',
+                (slug, now, json.dumps(artist_data, ensure_ascii=False), json.dumps(list(track_urls)))
+            )
+
+    def carry_artist(self, slug):
+        """
+        (artist_row, track_rows) stored for an artist that is not scraped on
+        this run, or None if it was never scraped. Track rows come from the
+        track store; tracks without a stored row are left out.
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM artists WHERE slug = ?', (slug,)).fetchone()
+        if row is None:
+            return None
+
+        artist_row = json.loads(row['artist_row'])
+        track_rows = []
+        for track_url in json.loads(row['track_urls']):
+            state = self.get(track_url)
+            if state is not None:
+                track_row = {field: state[field] for field in ROW_FIELDS}
+                track_row['artist_name'] = artist_row.get('artist_name')
+                track_rows.append(track_row)
+        return artist_row, track_rows
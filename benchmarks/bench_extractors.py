@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: compiled keyword extractors vs the old per-pattern loops
+Runs both over the saved page-text fixtures, checks they agree, and reports
+the per-page parse time of each
+
+Usage: python benchmarks/bench_extractors.py [--number N]
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from audiomack_extractors import extract_artist_stats, extract_number, extract_track_stats
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+# ---------- Baseline: the loops scrape_track_page / scrape_artist_page used to run ----------
+
+def legacy_track_stats(all_text):
+    plays = "N/A"
+    play_patterns = [
+        r'([\d,.KMB]+)\s*[Tt]otal\s*[Pp]lays?',
+        r'[Tt]otal\s*[Pp]lays?\s*[:\-]?\s*([\d,.KMB]+)',
+        r'(?<!Playlist\s)(?<!playlist\s)([\d,.KMB]+)\s*[Pp]lays?(?!\s*Adds)',
+    ]
+    for pattern in play_patterns[:2]:
+        match = re.search(pattern, all_text, re.IGNORECASE)
+        if match:
+            plays = extract_number(match.group(1))
+            break
+    if plays == "N/A":
+        lines = all_text.split('\n')
+        for i, line in enumerate(lines):
+            if 'Plays' in line and 'Playlist' not in line and 'Added' not in line:
+                combined = lines[max(0, i-1):i+2]
+                for check_line in combined:
+                    match = re.search(r'([\d,.KMB]+)', check_line)
+                    if match:
+                        potential_plays = extract_number(match.group(1))
+                        if potential_plays != "N/A":
+                            plays = potential_plays
+                            break
+                if plays != "N/A":
+                    break
+
+    likes = "N/A"
+    like_patterns = [
+        r'([\d,.KMB]+)\s*[Ff]avorites?',
+        r'([\d,.KMB]+)\s*[Ll]ikes?',
+        r'[Ff]avorites?\s*[:\-]?\s*([\d,.KMB]+)',
+        r'[Ll]ikes?\s*[:\-]?\s*([\d,.KMB]+)',
+    ]
+    for pattern in like_patterns:
+        match = re.search(pattern, all_text)
+        if match:
+            likes = extract_number(match.group(1))
+            break
+
+    playlist_adds = "N/A"
+    playlist_patterns = [
+        r'([\d,.KMB]+)\s*[Pp]laylist\s*[Aa]dds?',
+        r'[Pp]laylist\s*[Aa]dds?\s*[:\-]?\s*([\d,.KMB]+)',
+    ]
+    for pattern in playlist_patterns:
+        match = re.search(pattern, all_text)
+        if match:
+            playlist_adds = extract_number(match.group(1))
+            break
+
+    reposts = "N/A"
+    repost_patterns = [
+        r'([\d,.KMB]+)\s*[Rr]eposts?',
+        r'([\d,.KMB]+)\s*[Ss]hares?',
+        r'[Rr]eposts?\s*[:\-]?\s*([\d,.KMB]+)',
+    ]
+    for pattern in repost_patterns:
+        match = re.search(pattern, all_text)
+        if match:
+            reposts = extract_number(match.group(1))
+            break
+
+    release_date = "N/A"
+    lines = all_text.split('\n')
+    for i, line in enumerate(lines):
+        if 'Release Date' in line or 'release date' in line.lower():
+            for j in range(i, min(i+5, len(lines))):
+                date_match = re.search(r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}', lines[j], re.IGNORECASE)
+                if date_match:
+                    release_date = date_match.group(0)
+                    break
+            if release_date != "N/A":
+                break
+
+    return {'plays': plays, 'likes': likes, 'reposts': reposts,
+            'playlist_adds': playlist_adds, 'release_date': release_date}
+
+
+def legacy_artist_stats(all_text):
+    results = {}
+    groups = {
+        'followers': [
+            r'([\d,.KMB]+)\s*[Ff]ollowers?',
+            r'[Ff]ollowers?\s*[:\-]?\s*([\d,.KMB]+)',
+            r'([\d,.KMB]+)\s*[Ff]ans?'
+        ],
+        'total_plays': [
+            r'([\d,.KMB]+)\s*[Tt]otal\s*[Aa]ccount\s*[Pp]lays?',
+            r'[Tt]otal\s*[Aa]ccount\s*[Pp]lays?\s*[:\-]?\s*([\d,.KMB]+)',
+        ],
+        'monthly_listeners': [
+            r'([\d,.KMB]+)\s*[Mm]onthly\s*[Ll]isteners?',
+            r'[Mm]onthly\s*[Ll]isteners?\s*[:\-]?\s*([\d,.KMB]+)',
+        ],
+    }
+    for field, patterns in groups.items():
+        results[field] = "N/A"
+        for pattern in patterns:
+            match = re.search(pattern, all_text)
+            if match:
+                results[field] = extract_number(match.group(1))
+                break
+
+    results['member_since'] = "N/A"
+    member_patterns = [
+        r'Member since:?\s*(\w+\s+\d{1,2},?\s+\d{4})',
+        r'Joined:?\s*(\w+\s+\d{1,2},?\s+\d{4})',
+        r'Member Since:?\s*(\w+\s+\d{1,2},?\s+\d{4})',
+    ]
+    for pattern in member_patterns:
+        match = re.search(pattern, all_text, re.IGNORECASE)
+        if match:
+            results['member_since'] = match.group(1)
+            break
+    return results
+
+
+# --------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--number', type=int, default=2000, help="parses per fixture and implementation")
+    args = parser.parse_args()
+
+    print(f"{'fixture':<28} {'legacy µs':>10} {'compiled µs':>12} {'speedup':>8}")
+    for path in sorted(glob.glob(os.path.join(FIXTURES, '*.txt'))):
+        name = os.path.basename(path)
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+
+        if name.startswith('artist'):
+            legacy, compiled = legacy_artist_stats, extract_artist_stats
+        else:
+            legacy, compiled = legacy_track_stats, extract_track_stats
+
+        expected, actual = legacy(text), compiled(text)
+        if expected != actual:
+            print(f"❌ {name}: results differ\n   legacy:   {expected}\n   compiled: {actual}")
+            sys.exit(1)
+
+        legacy_time = timeit.timeit(lambda: legacy(text), number=args.number) / args.number * 1e6
+        compiled_time = timeit.timeit(lambda: compiled(text), number=args.number) / args.number * 1e6
+        print(f"{name:<28} {legacy_time:>10.1f} {compiled_time:>12.1f} {legacy_time / compiled_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: parse_number row by row vs parse_number_column
+Normalizes the count columns of the historical track CSVs both ways, checks
+they agree, and reports the time of each (needs pandas)
+
+Usage: python benchmarks/bench_numbers.py [--files N]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pandas as pd
+
+from audiomack_extractors import parse_number, parse_number_column
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+COLUMNS = ['plays', 'likes', 'reposts', 'playlist_adds']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--files', type=int, default=0, help="only read the newest N track files (0 = all)")
+    args = parser.parse_args()
+
+    paths = sorted(p for p in glob.glob(os.path.join(DATA_DIR, 'audiomack_tracks_*.csv'))
+              if 'latest' not in p and 'with_growth' not in p)
+    if args.files:
+        paths = paths[-args.files:]
+    frame = pd.concat([pd.read_csv(p, dtype=str, keep_default_na=False) for p in paths], ignore_index=True)
+    print(f"{len(paths)} files, {len(frame):,} rows")
+
+    print(f"{'column':<16} {'rows s':>8} {'vector s':>9} {'speedup':>8}")
+    for column in COLUMNS:
+        values = frame[column]
+
+        start = time.perf_counter()
+        expected = [parse_number(v) for v in values]
+        row_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = parse_number_column(values)
+        vector_time = time.perf_counter() - start
+
+        actual = [None if pd.isna(v) else int(v) for v in actual]
+        if expected != actual:
+            print(f"❌ {column}: results differ")
+            sys.exit(1)
+        print(f"{column:<16} {row_time:>8.2f} {vector_time:>9.2f} {row_time / vector_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Growth metrics for the dashboard
+Joins the newest artist/track snapshot in data/ against the snapshots from
+about 1, 7 and 30 days earlier (by artist URL and track URL) and writes
+audiomack_artists_with_growth_<run_id>.csv / audiomack_tracks_with_growth_<run_id>.csv,
+which /api/growth serves. Every column of the snapshot is kept; per window
+the files add the delta, the growth rate (%) and the actual span in days.
+
+Only the snapshots that are compared are read: the index is built from the
+timestamps in the file names, so a data/ folder with months of history costs
+three extra CSV reads per kind, not hundreds.
+
+Usage: python compute_growth.py [--data-dir data]
+"""
+
+import argparse
+import bisect
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from audiomack_extractors import parse_number_column
+from audiomack_history import KEYS, RUN_ID_FORMAT, SNAPSHOT_RE
+
+DATA_DIR = 'data'
+
+# Window label -> days back from the newest snapshot
+WINDOWS = {'1d': 1, '7d': 7, '30d': 30}
+# A window uses the snapshot closest to its target, if within this share of its length
+WINDOW_TOLERANCE = 0.5
+
+METRICS = {
+    'artists': ['followers', 'total_plays'],
+    'tracks': ['plays', 'likes', 'playlist_adds'],
+}
+
+# hotness_score blends how fast a track gains plays with how fast that is relative to its size
+HOTNESS_WEIGHTS = {'plays_velocity': 0.7, 'plays_growth_7d': 0.3}
+
+
+class SnapshotIndex:
+    """Timestamped snapshot files in a directory, per kind, found by name only"""
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        self._snapshots = {kind: [] for kind in KEYS}
+        for name in os.listdir(data_dir):
+            match = SNAPSHOT_RE.match(name)
+            if match:
+                kind, run_id = match.groups()
+                self._snapshots[kind].append((datetime.strptime(run_id, RUN_ID_FORMAT), name))
+        for snapshots in self._snapshots.values():
+            snapshots.sort()
+
+    def latest(self, kind):
+        """(time, path) of the newest snapshot, or None"""
+        snapshots = self._snapshots[kind]
+        if not snapshots:
+            return None
+        when, name = snapshots[-1]
+        return when, os.path.join(self.data_dir, name)
+
+    def nearest(self, kind, target, tolerance):
+        """(time, path) of the snapshot closest to target, if within tolerance of it"""
+        snapshots = self._snapshots[kind]
+        i = bisect.bisect_left(snapshots, (target, ''))
+        candidates = snapshots[max(0, i - 1):i + 1]
+        if not candidates:
+            return None
+        when, name = min(candidates, key=lambda item: abs(item[0] - target))
+        if abs(when - target) > tolerance:
+            return None
+        return when, os.path.join(self.data_dir, name)
+
+
+def _join_key(urls):
+    return urls.str.strip().str.rstrip('/').str.lower()
+
+
+def read_snapshot(path, kind):
+    """A snapshot as strings, plus a join-key column; one row per key (last one wins)"""
+    frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+    frame['_key'] = _join_key(frame[KEYS[kind]])
+    return frame.drop_duplicates('_key', keep='last')
+
+
+def add_growth(frame, kind, index, now):
+    """Add delta / growth / span columns for every window to the newest snapshot frame"""
+    metrics = METRICS[kind]
+    current = {metric: parse_number_column(frame[metric]) for metric in metrics}
+
+    for label, days in WINDOWS.items():
+        found = index.nearest(kind, now - timedelta(days=days), timedelta(days=days * WINDOW_TOLERANCE))
+        if found is None or found[0] >= now:
+            print(f"⚠️  No {kind} snapshot from about {days} day(s) ago, skipping {label}")
+            for metric in metrics:
+                frame[f'{metric}_change_{label}'] = pd.NA
+                frame[f'{metric}_growth_{label}'] = pd.NA
+            frame[f'days_{label}'] = pd.NA
+            continue
+
+        when, path = found
+        span = (now - when).total_seconds() / 86400
+        print(f"📅 {label}: {os.path.basename(path)} ({span:.1f} days)")
+        previous = read_snapshot(path, kind).set_index('_key')
+        for metric in metrics:
+            before = parse_number_column(previous[metric]).reindex(frame['_key']).set_axis(frame.index)
+            change = current[metric] - before
+            frame[f'{metric}_change_{label}'] = change
+            frame[f'{metric}_growth_{label}'] = (change.astype('Float64') * 100 / before.where(before > 0)).round(2)
+        # Rows that are new since then have nothing to compare against
+        frame[f'days_{label}'] = pd.Series(round(span, 2), index=frame.index).where(
+            frame['_key'].isin(previous.index))
+    return frame
+
+
+def add_track_scores(frame):
+    """plays_velocity (plays/day over the shortest window) and a 0-100 hotness_score"""
+    velocity = pd.Series(pd.NA, index=frame.index, dtype='Float64')
+    for label in WINDOWS:
+        if f'plays_change_{label}' not in frame:
+            continue
+        per_day = frame[f'plays_change_{label}'].astype('Float64') / frame[f'days_{label}'].astype('Float64')
+        velocity = velocity.fillna(per_day)
+    frame['plays_velocity'] = velocity.clip(lower=0).round(1)
+
+    score = pd.Series(0.0, index=frame.index)
+    for column, weight in HOTNESS_WEIGHTS.items():
+        ranks = frame[column].astype('Float64').rank(pct=True)
+        score += ranks.fillna(0).astype(float) * weight
+    frame['hotness_score'] = (score * 100).round(1)
+    return frame
+
+
+def compute_growth(data_dir=DATA_DIR):
+    """Write the with_growth files for the newest snapshots; returns the written paths"""
+    if not os.path.isdir(data_dir):
+        print(f"❌ Error: {data_dir} directory not found")
+        return []
+
+    index = SnapshotIndex(data_dir)
+    paths = []
+    for kind in KEYS:
+        latest = index.latest(kind)
+        if latest is None:
+            print(f"⚠️  No {kind} snapshots in {data_dir}")
+            continue
+        now, path = latest
+        print(f"\n📈 {kind.title()} growth for {os.path.basename(path)}")
+
+        frame = add_growth(read_snapshot(path, kind), kind, index, now)
+        if kind == 'tracks':
+            frame = add_track_scores(frame)
+
+        output = os.path.join(data_dir, f"audiomack_{kind}_with_growth_{now.strftime(RUN_ID_FORMAT)}.csv")
+        frame.drop(columns='_key').to_csv(output, index=False)
+        print(f"✅ Saved: {output} ({len(frame)} rows)")
+        paths.append(output)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute day/week/month growth from the snapshots in data/")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="directory with the timestamped snapshots")
+    args = parser.parse_args()
+
+    if not compute_growth(args.data_dir):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""
+artwork_key: one key per image, whatever size it is served at
+Run: python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from audiomack_artwork import artwork_key
+
+COVER = 'https://i.audiomack.com/vibeking-sio/3af34ac4ae.webp'
+
+
+def test_sizes_of_one_image_share_a_key():
+    assert artwork_key(f'{COVER}?width=416') == artwork_key(COVER)
+    assert artwork_key(f'{COVER}?width=416&height=416') == \
+        artwork_key('https://I.Audiomack.com/vibeking-sio/3af34ac4ae.webp?width=128')
+
+
+def test_artwork_versions_get_their_own_keys():
+    assert artwork_key(f'{COVER}?v=1&width=416') != artwork_key(f'{COVER}?v=2&width=416')
+    assert artwork_key(f'{COVER}?width=416&v=2') == artwork_key(f'{COVER}?v=2')
+
+
+def test_missing_image():
+    assert artwork_key('N/A') == 'N/A'
+    assert artwork_key(None) == 'N/A'
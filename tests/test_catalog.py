@@ -0,0 +1,56 @@
+"""
+TrackRegistry: each song goes to the first artist whose catalog lists it
+Run: python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from audiomack_catalog import TrackRegistry, canonical_track_url
+
+A = 'https://audiomack.com/a'
+B = 'https://audiomack.com/b'
+SONG = 'https://audiomack.com/a/song/feature'
+
+
+class ListSink:
+    def __init__(self):
+        self.rows = []
+
+    def write(self, row):
+        self.rows.append(row)
+
+
+def test_canonical_track_url():
+    assert canonical_track_url(' /A/song/Feature/ ') == SONG
+    assert canonical_track_url('https://www.audiomack.com/a/song/feature?share=1#top') == SONG
+
+
+def test_first_artist_claims_a_shared_track():
+    sink = ListSink()
+    tracks = TrackRegistry(sink)
+
+    assert tracks.claim_all(A, 'A', [SONG, 'https://audiomack.com/a/song/solo']) == [
+        SONG, 'https://audiomack.com/a/song/solo']
+    # b lists the same song under another spelling of its URL
+    assert tracks.claim_all(B, 'B', ['/a/song/feature/', 'https://audiomack.com/b/song/solo']) == [
+        'https://audiomack.com/b/song/solo']
+
+    assert (tracks.tracks, tracks.shared) == (3, 1)
+    assert [(row['artist_url'], row['track_url'], row['primary']) for row in sink.rows] == [
+        (A, SONG, True),
+        (A, 'https://audiomack.com/a/song/solo', True),
+        (B, '/a/song/feature/', False),
+        (B, 'https://audiomack.com/b/song/solo', True),
+    ]
+
+
+def test_a_track_listed_twice_in_one_catalog_is_recorded_once():
+    sink = ListSink()
+    tracks = TrackRegistry(sink)
+
+    assert tracks.claim_all(A, 'A', [SONG, SONG + '/']) == [SONG]
+    assert len(sink.rows) == 1
+    assert tracks.shared == 0
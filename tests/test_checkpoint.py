@@ -0,0 +1,73 @@
+"""
+Checkpoint journal: what a resumed run gets back
+Run: python -m pytest tests
+"""
+
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from audiomack_checkpoint import Checkpoint
+from audiomack_records import ArtistRecord, TrackRecord
+
+ARTIST_URL = 'https://audiomack.com/a'
+TRACK_URLS = ['https://audiomack.com/a/song/1', 'https://audiomack.com/a/song/2']
+
+
+def test_resume_restores_typed_artists_and_tracks(tmp_path):
+    checkpoint = Checkpoint.start(str(tmp_path), '20260822_040110')
+    artist = ArtistRecord(artist_name='A', url=ARTIST_URL, followers='1.2K', catalog_complete=False)
+    checkpoint.record_artist(ARTIST_URL, artist, TRACK_URLS)
+    checkpoint.record_track(ARTIST_URL, TrackRecord(artist_name='A', track_url=TRACK_URLS[0], plays='500',
+                                                    release_date='July 4, 2023'))
+    checkpoint.close()
+
+    resumed = Checkpoint.resume(directory=str(tmp_path))
+
+    assert resumed.run_id == '20260822_040110'
+    restored, track_urls = resumed.artist(ARTIST_URL)
+    assert track_urls == TRACK_URLS
+    assert restored.followers == 1200
+    assert restored.catalog_complete is False
+    track = resumed.track(ARTIST_URL, TRACK_URLS[0])
+    assert track.plays == 500
+    assert track.release_date == datetime(2023, 7, 4).date()
+    assert resumed.track(ARTIST_URL, TRACK_URLS[1]) is None
+    resumed.close()
+
+
+def test_failures_are_not_journaled(tmp_path):
+    checkpoint = Checkpoint.start(str(tmp_path), 'run')
+    checkpoint.record_artist(ARTIST_URL, ArtistRecord.failure(ARTIST_URL, 'timeout'), [])
+    checkpoint.record_track(ARTIST_URL, None)
+    checkpoint.close()
+
+    resumed = Checkpoint.resume(checkpoint.path)
+
+    assert resumed.artist(ARTIST_URL) is None
+    assert (resumed.artist_count, resumed.track_count) == (0, 0)
+    resumed.close()
+
+
+def test_resume_skips_a_half_written_last_line(tmp_path):
+    checkpoint = Checkpoint.start(str(tmp_path), 'run')
+    checkpoint.record_artist(ARTIST_URL, ArtistRecord(artist_name='A', url=ARTIST_URL), TRACK_URLS)
+    checkpoint.close()
+    with open(checkpoint.path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "track", "artist_url": "https://audiomack.com/a", "da')
+
+    resumed = Checkpoint.resume(checkpoint.path)
+    resumed.record_track(ARTIST_URL, TrackRecord(artist_name='A', track_url=TRACK_URLS[1]))
+    resumed.close()
+
+    # The crash's partial line is terminated, so the appended record reads back
+    again = Checkpoint.resume(checkpoint.path)
+    assert again.artist(ARTIST_URL)[1] == TRACK_URLS
+    assert again.track(ARTIST_URL, TRACK_URLS[1]) is not None
+    again.close()
+
+
+def test_resume_without_a_journal(tmp_path):
+    assert Checkpoint.resume(directory=str(tmp_path)) is None
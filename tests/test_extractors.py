@@ -0,0 +1,54 @@
+"""
+parse_number, parse_number_column and extract_number must read a count the same way
+Run: python -m pytest tests
+"""
+
+import os
+import sys
+from decimal import Decimal, InvalidOperation
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from audiomack_extractors import extract_number, parse_number, parse_number_column
+
+# (text, count); None where there is no number
+CASES = [
+    ('500', 500),
+    ('131,000', 131000),
+    ('1.2K', 1200),
+    ('1.15K', 1150),
+    ('2.5m', 2500000),
+    ('3B', 3000000000),
+    ('.5K', 500),
+    ('12Kb', 12000),
+    ('500.', 500),
+    ('1.5', 1),
+    ('1.49K Favorites', 1490),
+    ('1.2.3K', None),
+    ('N/A', None),
+    ('Error', None),
+    ('', None),
+]
+
+
+def extracted_count(text):
+    """The count extract_number's text stands for (None when it gave no number back)"""
+    value = extract_number(text)
+    try:
+        return int(Decimal(value))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+@pytest.mark.parametrize('text, count', CASES)
+def test_parsers_agree(text, count):
+    assert parse_number(text) == count
+    assert extracted_count(text) == count
+
+
+def test_column_matches_scalar():
+    pd = pytest.importorskip('pandas')
+    column = parse_number_column([text for text, _ in CASES])
+    assert [None if pd.isna(value) else int(value) for value in column] == [count for _, count in CASES]
@@ -0,0 +1,69 @@
+"""
+HistoryStore: one segment per stretch of runs with unchanged values
+Run: python -m pytest tests
+"""
+
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from audiomack_history import HistoryStore
+
+COLUMNS = ['timestamp', 'artist_name', 'track_title', 'track_url', 'plays', 'likes', 'reposts', 'playlist_adds']
+ONE = 'https://audiomack.com/a/song/one'
+TWO = 'https://audiomack.com/a/song/two'
+NOW = datetime(2026, 9, 1)
+
+
+def track(url, plays, run_id):
+    return {'timestamp': f'{run_id[:4]}-{run_id[4:6]}-{run_id[6:8]} 04:00:00', 'artist_name': 'A',
+            'track_title': url.rsplit('/', 1)[-1], 'track_url': url,
+            'plays': plays, 'likes': '1', 'reposts': '0', 'playlist_adds': '0'}
+
+
+def ingest(store, run_id, *rows):
+    return store.ingest('tracks', run_id, COLUMNS, [track(url, plays, run_id) for url, plays in rows])
+
+
+def test_unchanged_runs_extend_one_segment(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.db'))
+    ingest(store, '20260801_040000', (ONE, '100'), (TWO, '5'))
+    ingest(store, '20260802_040000', (ONE, '100'), (TWO, '5'))
+    ingest(store, '20260803_040000', (ONE, '150'), (TWO, '5'))
+    ingest(store, '20260804_040000', (ONE, '100'), (TWO, '5'))
+
+    segments = [(first, last, row['plays']) for first, last, row in store.series('tracks', ONE, now=NOW)]
+    assert segments == [
+        ('20260801_040000', '20260802_040000', '100'),
+        ('20260803_040000', '20260803_040000', '150'),
+        # Back to an earlier value is a new segment, not the old one reopened
+        ('20260804_040000', '20260804_040000', '100'),
+    ]
+    (first, last, row), = store.series('tracks', TWO.upper() + '/', now=NOW)
+    assert (first, last) == ('20260801_040000', '20260804_040000')
+    # The row carries the newest scrape time of its segment
+    assert row['timestamp'] == '2026-08-04 04:00:00'
+    store.close()
+
+
+def test_latest_rows_rebuild_the_newest_run_in_order(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.db'))
+    ingest(store, '20260801_040000', (ONE, '100'), (TWO, '5'))
+    ingest(store, '20260802_040000', (TWO, '6'), (ONE, '100'))
+
+    columns, rows = store.latest_rows('tracks')
+
+    assert columns == COLUMNS
+    assert rows == [track(TWO, '6', '20260802_040000'), track(ONE, '100', '20260802_040000')]
+    store.close()
+
+
+def test_old_or_repeated_runs_are_skipped(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.db'))
+    assert ingest(store, '20260802_040000', (ONE, '100'))
+    assert not ingest(store, '20260802_040000', (ONE, '200'))
+    assert not ingest(store, '20260801_040000', (ONE, '300'))
+    assert [row['plays'] for _, _, row in store.series('tracks', ONE, now=NOW)] == ['100']
+    store.close()
@@ -0,0 +1,38 @@
+"""
+parse_artist_html reads the avatar the browser path reads, not the share card
+Run: python -m pytest tests
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from audiomack_http import parse_artist_html
+
+ARTIST_URL = 'https://audiomack.com/vibeking-sio'
+AVATAR = 'https://assets.audiomack.com/vibeking-sio/avatar.jpeg'
+SHARE_CARD = 'https://assets.audiomack.com/vibeking-sio/share.jpeg'
+
+
+def artist_page(state=None):
+    script = (f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(state)}</script>'
+              if state is not None else '')
+    return (f'<html><head><meta property="og:image" content="{SHARE_CARD}">{script}</head>'
+            '<body><h1>SIO</h1><div>1.2K Followers</div></body></html>')
+
+
+def test_profile_image_is_the_avatar_from_the_page_state():
+    state = {'props': {'pageProps': {
+        'artist': {'url_slug': 'vibeking-sio', 'name': 'SIO', 'image': AVATAR},
+        # A song of the artist's, with its own artwork under the same slug
+        'music': [{'url_slug': 'vibeking-sio', 'title': 'Nobody Ugly', 'image': 'https://x/cover.webp'}],
+    }}}
+    assert parse_artist_html(artist_page(state), ARTIST_URL)['profile_image'] == AVATAR
+
+
+def test_profile_image_falls_back_to_og_image():
+    assert parse_artist_html(artist_page(), ARTIST_URL)['profile_image'] == SHARE_CARD
+    other = {'artist': {'url_slug': 'someone-else', 'name': 'X', 'image': AVATAR}}
+    assert parse_artist_html(artist_page(other), ARTIST_URL)['profile_image'] == SHARE_CARD
@@ -0,0 +1,74 @@
+"""
+Artifact publishing and snapshot cleanup of update_latest_files over a
+throwaway data directory
+Run: python -m pytest tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import update_latest_files
+from audiomack_manifest import Manifest
+
+ARTISTS_CSV = (
+    "timestamp,artist_name,url,profile_image,followers,total_plays,monthly_listeners,member_since,tracks_found\n"
+    "2026-08-22 04:01:10,A,https://audiomack.com/a,N/A,10,100,5,2020,1\n"
+)
+TRACKS_CSV = (
+    "timestamp,artist_name,track_title,track_url,album_art,plays,likes,reposts,playlist_adds,release_date\n"
+    "2026-08-22 04:01:10,A,One,https://audiomack.com/a/song/one,N/A,100,5,1,0,\"July 4, 2023\"\n"
+)
+GROWTH_CSV = "artist_name,url,followers,followers_growth\nA,https://audiomack.com/a,10,2\n"
+
+
+def write(directory, name, body):
+    with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+        f.write(body)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    write(tmp_path, 'audiomack_artists_latest.csv', ARTISTS_CSV)
+    write(tmp_path, 'audiomack_tracks_latest.csv', TRACKS_CSV)
+    return str(tmp_path)
+
+
+def test_publish_with_identical_data_rewrites_nothing(data_dir):
+    write(data_dir, 'audiomack_artists_with_growth_20260822_040110.csv', GROWTH_CSV)
+    first = update_latest_files.publish_artifacts(data_dir, Manifest.load(data_dir))
+    assert 'growth.json' in first and 'index.json' in first
+
+    # Next run: same data under a new run id
+    write(data_dir, 'audiomack_artists_with_growth_20260823_040110.csv', GROWTH_CSV)
+    assert update_latest_files.publish_artifacts(data_dir, Manifest.load(data_dir)) == []
+
+
+def test_publish_rewrites_changed_artifact_and_index(data_dir):
+    write(data_dir, 'audiomack_artists_with_growth_20260822_040110.csv', GROWTH_CSV)
+    update_latest_files.publish_artifacts(data_dir, Manifest.load(data_dir))
+
+    write(data_dir, 'audiomack_artists_with_growth_20260823_040110.csv', GROWTH_CSV.replace(',2\n', ',3\n'))
+    assert update_latest_files.publish_artifacts(data_dir, Manifest.load(data_dir)) == ['growth.json', 'index.json']
+
+
+def test_cleanup_measures_age_from_the_newest_run(data_dir):
+    # Every run is months before today; only the artists run 59 days before the newest is old
+    for run_id in ('20260101_040000', '20260201_040000', '20260220_040000', '20260301_040000'):
+        write(data_dir, f'audiomack_artists_{run_id}.csv', ARTISTS_CSV)
+    write(data_dir, 'audiomack_tracks_20260101_040000.csv', TRACKS_CSV)
+    manifest = Manifest.load(data_dir)
+
+    update_latest_files.cleanup_old_files(manifest, days=30)
+
+    manifest.refresh()
+    assert sorted(manifest.data['snapshots']) == [
+        'audiomack_artists_20260201_040000.csv',
+        'audiomack_artists_20260220_040000.csv',
+        'audiomack_artists_20260301_040000.csv',
+        # Old, but the newest tracks snapshot
+        'audiomack_tracks_20260101_040000.csv',
+    ]
@@ -0,0 +1,88 @@
+"""
+Readiness waits against a fake page: what they wait for, and what they record
+Run: python -m pytest tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import audiomack_readiness
+from audiomack_readiness import COUNT_GREW_JS, TEXT_READY_JS, WaitRecorder, wait_for_more, wait_until_ready
+
+
+class FakePage:
+    """Records every wait; the ones named in fail time out"""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.waits = []
+
+    def _wait(self, name, *args, **kwargs):
+        self.waits.append((name, args, kwargs))
+        if name in self.fail:
+            raise TimeoutError(f"{name} timed out")
+
+    def wait_for_selector(self, selector, **kwargs):
+        self._wait('selector', selector, **kwargs)
+
+    def wait_for_function(self, script, **kwargs):
+        self._wait('function', script, **kwargs)
+
+    def wait_for_load_state(self, state, **kwargs):
+        self._wait('load_state', state, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def wait_log(monkeypatch):
+    log = WaitRecorder()
+    monkeypatch.setattr(audiomack_readiness, 'WAIT_LOG', log)
+    return log
+
+
+def test_artist_page_waits_for_its_heading_and_stats(wait_log):
+    page = FakePage()
+
+    assert wait_until_ready(page, 'artist')
+
+    assert [(name, args) for name, args, _ in page.waits] == [
+        ('selector', ('h1',)), ('function', (TEXT_READY_JS,))]
+    assert page.waits[1][2]['arg'] == r'followers?\b'
+    # Every wait gets what is left of one overall timeout, never 0 (Playwright's "forever")
+    assert all(0 < kwargs['timeout'] <= 10000 for _, _, kwargs in page.waits)
+    assert [(r['page_type'], r['ready']) for r in wait_log.records] == [('artist', True)]
+
+
+def test_a_page_that_never_gets_ready_falls_back_to_network_idle(wait_log):
+    page = FakePage(fail={'selector'})
+
+    assert not wait_until_ready(page, 'track')
+
+    assert [(name, args) for name, args, _ in page.waits] == [
+        ('selector', ('h1',)), ('load_state', ('networkidle',))]
+    assert page.waits[1][2]['timeout'] == 2000
+    assert [(r['page_type'], r['ready']) for r in wait_log.records] == [('track', False)]
+
+
+def test_wait_for_more_watches_the_count_grow(wait_log):
+    page = FakePage()
+    assert wait_for_more(page, 'a[href*="/song/"]', 20)
+    (name, args, kwargs), = page.waits
+    assert args == (COUNT_GREW_JS,)
+    assert kwargs['arg'] == ['a[href*="/song/"]', 20]
+    assert kwargs['polling'] == 'mutation'
+
+    assert not wait_for_more(FakePage(fail={'function'}), 'a', 20)
+    assert [r['ready'] for r in wait_log.records] == [True, False]
+
+
+def test_summary_per_page_type():
+    log = WaitRecorder()
+    for seconds, ready in ((1.0, True), (2.0, True), (10.0, False)):
+        log.record('track', seconds, ready)
+
+    summary = log.summary()['track']
+    assert (summary['count'], summary['timeouts'], summary['max']) == (3, 1, 10.0)
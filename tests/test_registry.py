@@ -0,0 +1,27 @@
+"""
+ArtistRegistry.load over a small registry file
+Run: python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from audiomack_registry import TIER_REFRESH_DAYS, ArtistRegistry
+
+
+def test_bad_values_fall_back_to_the_tier_with_a_warning(tmp_path, capsys):
+    path = tmp_path / 'artists.csv'
+    path.write_text('slug,tier,refresh_days,active\n'
+                    'KELLz,hot,1.5,yes\n'
+                    'vibeking-sio,long_tail,weekly,yes\n'
+                    'someone,famous,,yes\n', encoding='utf-8')
+
+    registry = ArtistRegistry.load(str(path))
+
+    assert [entry.refresh_days for entry in registry.active()] == [
+        1.5, TIER_REFRESH_DAYS['long_tail'], TIER_REFRESH_DAYS['regular']]
+    warnings = capsys.readouterr().out
+    assert f"{path}:3: invalid refresh_days 'weekly' for vibeking-sio" in warnings
+    assert f"{path}:4: unknown tier 'famous' for someone" in warnings
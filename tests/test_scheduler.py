@@ -0,0 +1,119 @@
+"""
+RequestScheduler and RetryBudget arithmetic (sleeps and jitter patched out)
+Run: python -m pytest tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import audiomack_scheduler
+from audiomack_scheduler import (BACKOFF_MAX, DECREASE_COOLDOWN, RATE_DECREASE, RATE_INCREASE, HostState,
+                                 NavigationError, RequestScheduler, RetryBudget)
+
+URL = 'https://audiomack.com/a'
+
+
+class Response:
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Seconds the scheduler slept, in order (without sleeping, and without jitter)"""
+    slept = []
+    monkeypatch.setattr(audiomack_scheduler.time, 'sleep', slept.append)
+    monkeypatch.setattr(audiomack_scheduler.random, 'uniform', lambda low, high: high)
+    return slept
+
+
+def test_retry_budget_grows_with_requests():
+    budget = RetryBudget(ratio=0.2, minimum=2)
+    assert [budget.spend() for _ in range(3)] == [True, True, False]
+
+    for _ in range(10):
+        budget.record_request()
+    # minimum 2 + 0.2 x 10 requests = 4, 2 of them spent
+    assert budget.remaining == 2
+    assert [budget.spend() for _ in range(3)] == [True, True, False]
+    assert budget.remaining == 0
+
+
+def test_token_bucket_spaces_requests_at_the_rate():
+    host = HostState(rate=2.0, min_rate=0.2, max_rate=8.0)
+    host.updated = 100.0
+
+    assert host.reserve(100.0) == 0.0  # The bucket starts with one token
+    assert host.reserve(100.0) == pytest.approx(0.5)
+    assert host.reserve(100.0) == pytest.approx(1.0)
+    # Idle time refills at most one token
+    assert host.reserve(110.0) == 0.0
+
+
+def test_rate_adapts_additively_up_and_multiplicatively_down():
+    host = HostState(rate=2.0, min_rate=0.2, max_rate=2.12)
+    host.increase()
+    assert host.rate == pytest.approx(2.0 + RATE_INCREASE)
+    host.increase()
+    host.increase()
+    assert host.rate == 2.12  # Capped at max_rate
+
+    host.decrease(RATE_DECREASE, now=100.0)
+    assert host.rate == pytest.approx(2.12 * RATE_DECREASE)
+    # In-flight failures inside the cooldown count once
+    host.decrease(RATE_DECREASE, now=100.0 + DECREASE_COOLDOWN / 2)
+    assert host.rate == pytest.approx(2.12 * RATE_DECREASE)
+    for i in range(1, 10):
+        host.decrease(RATE_DECREASE, now=100.0 + i * DECREASE_COOLDOWN)
+    assert host.rate == 0.2  # Never below min_rate
+
+
+def test_backoff_doubles_up_to_the_cap(sleeps):
+    scheduler = RequestScheduler(rate=0)
+    assert [scheduler.backoff(attempt) for attempt in (1, 2, 3)] == [2.0, 4.0, 8.0]
+    assert scheduler.backoff(20) == BACKOFF_MAX
+    assert scheduler.backoff(1, retry_after=30) == 30
+
+
+def test_fetch_retries_throttled_requests(sleeps):
+    responses = [Response(503), Response(429), Response(200)]
+    scheduler = RequestScheduler(rate=0, retry_budget=RetryBudget(minimum=10))
+
+    assert scheduler.fetch(URL, lambda: responses.pop(0)).status == 200
+    assert sleeps == [2.0, 4.0]
+    assert (scheduler.counts['requests'], scheduler.counts['retries'], scheduler.counts['throttled']) == (3, 2, 2)
+    assert scheduler.retry_budget.spent == 2
+
+
+def test_retry_after_pauses_the_host(sleeps):
+    scheduler = RequestScheduler(rate=0)
+    scheduler.observe(URL, 429, latency=0.1, retry_after=5)
+
+    scheduler.acquire(URL)
+    assert sleeps == [pytest.approx(5.0, abs=0.5)]
+    assert scheduler.backoff(1, retry_after=5) == 5
+
+
+def test_fetch_gives_up_when_the_budget_is_spent(sleeps):
+    scheduler = RequestScheduler(rate=0, retry_budget=RetryBudget(ratio=0, minimum=1))
+
+    with pytest.raises(NavigationError) as error:
+        scheduler.fetch(URL, lambda: Response(500))
+    assert error.value.reason == 'HTTP 500'
+    assert scheduler.counts['requests'] == 2  # The first attempt and the one retry the budget allowed
+
+
+def test_fetch_stops_after_max_attempts(sleeps):
+    def request():
+        raise TimeoutError('Timeout 60000ms exceeded.\nCall log: ...')
+
+    scheduler = RequestScheduler(rate=0, retry_budget=RetryBudget(minimum=10), max_attempts=3)
+    with pytest.raises(NavigationError) as error:
+        scheduler.fetch(URL, request)
+    assert error.value.reason == 'Timeout 60000ms exceeded.'
+    assert scheduler.counts['requests'] == 3
@@ -0,0 +1,179 @@
+"""
+Scrape loops of audiomack_scraper_v5 with the browser replaced by fakes
+Run: python -m pytest tests
+"""
+
+import os
+import sys
+import contextlib
+from concurrent.futures import Future
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import audiomack_scraper_v5 as scraper
+from audiomack_catalog import TrackRegistry
+from audiomack_checkpoint import Checkpoint
+from audiomack_records import ArtistRecord, TrackRecord
+
+ARTISTS = ['https://audiomack.com/a', 'https://audiomack.com/b', 'https://audiomack.com/c']
+CATALOGS = {
+    'https://audiomack.com/a': ['https://audiomack.com/a/song/1', 'https://audiomack.com/a/song/2'],
+    'https://audiomack.com/b': ['https://audiomack.com/b/song/1', 'https://audiomack.com/a/song/1'],
+    'https://audiomack.com/c': ['https://audiomack.com/c/song/1'],
+}
+
+
+class FakePool:
+    """PagePool stand-in that runs every task inline on a fake page"""
+
+    def __init__(self, workers, launch):
+        self.workers = workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(None, *args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+class FakeBrowser:
+    def new_page(self):
+        return None
+
+    def close(self):
+        pass
+
+
+@contextlib.contextmanager
+def fake_playwright():
+    yield None
+
+
+class ListSink:
+    def __init__(self):
+        self.rows = []
+
+    def write(self, row):
+        self.rows.append(row)
+
+
+@pytest.fixture
+def fake_browser(monkeypatch, tmp_path):
+    failures = set()
+
+    def scrape_artist_page(page, url):
+        if url in failures:
+            failures.discard(url)  # Fails once, the requeue then succeeds
+            return ArtistRecord.failure(url, 'timeout'), []
+        return ArtistRecord(artist_name=url.rsplit('/', 1)[-1], url=url, followers='10'), CATALOGS[url]
+
+    def scrape_track_page(page, track_url, artist_name):
+        return TrackRecord(artist_name=artist_name, track_url=track_url, plays='5')
+
+    monkeypatch.setattr(scraper, 'PagePool', FakePool)
+    monkeypatch.setattr(scraper, 'sync_playwright', fake_playwright)
+    monkeypatch.setattr(scraper, 'launch_browser', lambda p: (FakeBrowser(), FakeBrowser()))
+    monkeypatch.setattr(scraper, 'scrape_artist_page', scrape_artist_page)
+    monkeypatch.setattr(scraper, 'scrape_track_page', scrape_track_page)
+    monkeypatch.setattr(scraper, 'TRACKS', TrackRegistry())
+    monkeypatch.setattr(scraper, 'TRACK_STATE', None)
+    checkpoint = Checkpoint.start(str(tmp_path), 'test')
+    yield checkpoint, failures
+    checkpoint.close()
+
+
+def scrape_sequential(checkpoint, artist_sink, track_sink, carried=None):
+    return scraper.scrape_sequential(ARTISTS, checkpoint, artist_sink, track_sink, carried)
+
+
+def scrape_concurrent(checkpoint, artist_sink, track_sink, carried=None):
+    return scraper.scrape_concurrent(ARTISTS, 2, checkpoint, artist_sink, track_sink, carried)
+
+
+SCRAPE_LOOPS = pytest.mark.parametrize('scrape', [scrape_sequential, scrape_concurrent])
+
+
+@SCRAPE_LOOPS
+def test_writes_every_artist_and_track_in_registry_order(fake_browser, scrape):
+    checkpoint, failures = fake_browser
+    failures.add(ARTISTS[0])
+    artist_sink, track_sink = ListSink(), ListSink()
+
+    artists = scrape(checkpoint, artist_sink, track_sink)
+
+    assert [row.url for row in artists] == ARTISTS
+    assert [row.url for row in artist_sink.rows] == ARTISTS
+    # a is retried at the end of the artist phase, but keeps its place: the
+    # song b shares with it is still written once, under a
+    assert [(row.artist_name, row.track_url) for row in track_sink.rows] == [
+        ('a', 'https://audiomack.com/a/song/1'),
+        ('a', 'https://audiomack.com/a/song/2'),
+        ('b', 'https://audiomack.com/b/song/1'),
+        ('c', 'https://audiomack.com/c/song/1'),
+    ]
+
+
+@SCRAPE_LOOPS
+def test_writes_carried_artists_in_their_place(fake_browser, scrape):
+    checkpoint, _ = fake_browser
+    carried_url = ARTISTS[1]
+    carried = {carried_url: (ArtistRecord(artist_name='b', url=carried_url),
+                             [TrackRecord(artist_name='b', track_url='https://audiomack.com/b/song/9')])}
+    artist_sink, track_sink = ListSink(), ListSink()
+
+    scrape(checkpoint, artist_sink, track_sink, carried)
+
+    assert [row.url for row in artist_sink.rows] == ARTISTS
+    assert [row.track_url for row in track_sink.rows] == [
+        'https://audiomack.com/a/song/1',
+        'https://audiomack.com/a/song/2',
+        'https://audiomack.com/b/song/9',
+        'https://audiomack.com/c/song/1',
+    ]
+
+
+class EndlessCatalog:
+    """/songs page whose 'Load More' button keeps returning another page of songs"""
+
+    def __init__(self):
+        self.songs = 20
+
+    def locator(self, selector):
+        return self
+
+    @property
+    def first(self):
+        return self
+
+    def count(self):
+        return self.songs
+
+    def is_visible(self):
+        return True
+
+    def click(self):
+        self.songs += 20
+
+
+def test_catalog_paging_stops_at_the_page_limit(monkeypatch):
+    catalog = EndlessCatalog()
+    monkeypatch.setattr(scraper, 'MAX_CATALOG_PAGES', 5)
+    monkeypatch.setattr(scraper, 'goto', lambda *args, **kwargs: None)
+    monkeypatch.setattr(scraper, 'wait_ready', lambda *args: True)
+    monkeypatch.setattr(scraper, 'wait_for_more', lambda *args: True)
+    monkeypatch.setattr(scraper, 'song_urls', lambda page: [f'/a/song/{i}' for i in range(page.songs)])
+
+    track_urls, complete = scraper.get_full_catalog(catalog, 'https://audiomack.com/a', 'a')
+
+    assert not complete
+    assert len(track_urls) == 100
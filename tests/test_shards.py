@@ -0,0 +1,77 @@
+"""
+merge_shards: merged rows in registry order, whatever the shards wrote
+Run: python -m pytest tests
+"""
+
+import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from audiomack_records import ArtistRecord, TrackArtistRecord, TrackRecord
+from audiomack_shards import merge_shards, shard_artists, shard_run_id
+from audiomack_sinks import open_sinks
+
+RUN_ID = '20260822_040110'
+ARTISTS = [f'https://audiomack.com/{slug}' for slug in ('a', 'b', 'c', 'd')]
+# d also lists a's first song; both a and c are shown as 'Same Name'
+CATALOGS = {
+    ARTISTS[0]: ['https://audiomack.com/a/song/1'],
+    ARTISTS[1]: ['https://audiomack.com/b/song/1'],
+    ARTISTS[2]: ['https://audiomack.com/c/song/1'],
+    ARTISTS[3]: ['https://audiomack.com/d/song/1', 'https://audiomack.com/a/song/1'],
+}
+NAMES = {ARTISTS[0]: 'Same Name', ARTISTS[1]: 'B', ARTISTS[2]: 'Same Name', ARTISTS[3]: 'D'}
+
+
+def write_shard(shard_dir, index, count, artists):
+    """One shard's partial output, its artists in reverse order of the registry"""
+    run_id = shard_run_id(RUN_ID, index, count)
+    sinks = {kind: open_sinks(kind, run_id, ('csv',), shard_dir) for kind in ('artists', 'tracks', 'track_artists')}
+    for url in reversed(artists):
+        sinks['artists'].write(ArtistRecord(artist_name=NAMES[url], url=url))
+        for track_url in CATALOGS[url]:
+            sinks['tracks'].write(TrackRecord(artist_name=NAMES[url], track_url=track_url))
+            sinks['track_artists'].write(TrackArtistRecord(track_url=track_url, artist_url=url,
+                                                           artist_name=NAMES[url], primary=True))
+    for sink in sinks.values():
+        sink.close()
+
+
+def read(output_dir, kind):
+    with open(os.path.join(output_dir, f'audiomack_{kind}_{RUN_ID}.csv'), newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def test_merge_orders_rows_by_registry_and_keeps_shared_tracks_once(tmp_path):
+    shard_dir, output_dir = str(tmp_path / 'shards'), str(tmp_path / 'data')
+    os.makedirs(shard_dir)
+    # Shard 2 finishing first must not matter
+    for index in (2, 1):
+        write_shard(shard_dir, index, 2, shard_artists(ARTISTS, index, 2))
+
+    assert merge_shards(RUN_ID, 2, ARTISTS, shard_dir, output_dir) is not None
+
+    assert [row['url'] for row in read(output_dir, 'artists')] == ARTISTS
+    # Each track sits under the artist whose shard marked it primary, not
+    # under the first artist with the same display name
+    assert [row['track_url'] for row in read(output_dir, 'tracks')] == [
+        'https://audiomack.com/a/song/1',
+        'https://audiomack.com/b/song/1',
+        'https://audiomack.com/c/song/1',
+        'https://audiomack.com/d/song/1',
+    ]
+    links = [(row['artist_url'][-1], row['track_url'], row['primary']) for row in read(output_dir, 'track_artists')]
+    assert links == [
+        ('a', 'https://audiomack.com/a/song/1', 'True'),
+        ('b', 'https://audiomack.com/b/song/1', 'True'),
+        ('c', 'https://audiomack.com/c/song/1', 'True'),
+        ('d', 'https://audiomack.com/d/song/1', 'True'),
+        ('d', 'https://audiomack.com/a/song/1', 'False'),
+    ]
+
+
+def test_merge_refuses_a_missing_shard(tmp_path):
+    write_shard(str(tmp_path), 1, 2, shard_artists(ARTISTS, 1, 2))
+    assert merge_shards(RUN_ID, 2, ARTISTS, str(tmp_path), str(tmp_path)) is None
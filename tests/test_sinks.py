@@ -0,0 +1,79 @@
+"""
+Output sinks: every format holds the same rows, counts typed where it can
+Run: python -m pytest tests
+"""
+
+import csv
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from audiomack_records import TrackRecord
+from audiomack_sinks import TRACK_FIELDS, open_sinks
+
+ROWS = [
+    TrackRecord(timestamp='2026-08-22 04:01:10', artist_name='A', track_title='One',
+                track_url='https://audiomack.com/a/song/one', plays='1.2K', likes='15',
+                release_date='July 4, 2023'),
+    # A CSV-style dict row, as merge_shards writes them; missing counts stay missing
+    {'timestamp': '2026-08-22 04:01:12', 'artist_name': 'A', 'track_title': 'Two',
+     'track_url': 'https://audiomack.com/a/song/two', 'plays': 'N/A', 'likes': '3'},
+]
+
+
+def write(tmp_path, formats):
+    sink = open_sinks('tracks', '20260822_040110', formats, str(tmp_path))
+    for row in ROWS:
+        sink.write(row)
+    sink.close()
+    return sink
+
+
+def test_csv_keeps_the_historical_text(tmp_path):
+    sink = write(tmp_path, ('csv',))
+
+    assert sink.rows == 2
+    assert sink.paths == [str(tmp_path / 'audiomack_tracks_20260822_040110.csv')]
+    with open(sink.paths[0], newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+    assert reader.fieldnames == TRACK_FIELDS
+    assert [(row['plays'], row['likes'], row['release_date']) for row in rows] == [
+        ('1200', '15', 'July 4, 2023'), ('N/A', '3', 'N/A')]
+
+
+def test_json_lines_have_typed_counts(tmp_path):
+    sink = write(tmp_path, ('json',))
+
+    assert sink.paths == [str(tmp_path / 'audiomack_tracks_20260822_040110.jsonl')]
+    with open(sink.paths[0], encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    assert list(rows[0]) == TRACK_FIELDS
+    assert [(row['plays'], row['likes'], row['release_date']) for row in rows] == [
+        (1200, 15, '2023-07-04'), (None, 3, 'N/A')]
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'arrow'])
+def test_columnar_formats_have_int64_counts(tmp_path, fmt):
+    pa = pytest.importorskip('pyarrow')
+    sink = write(tmp_path, (fmt,))
+
+    if fmt == 'parquet':
+        table = pytest.importorskip('pyarrow.parquet').read_table(sink.paths[0])
+    else:
+        table = pa.ipc.open_file(sink.paths[0]).read_all()
+    assert table.column_names == TRACK_FIELDS
+    assert table.schema.field('plays').type == pa.int64()
+    assert table.column('plays').to_pylist() == [1200, None]
+    assert table.column('release_date').to_pylist() == ['July 4, 2023', 'N/A']
+
+
+def test_nothing_is_created_without_rows(tmp_path):
+    sink = open_sinks('tracks', '20260822_040110', ('csv', 'json'), str(tmp_path))
+    sink.close()
+    assert sink.paths == []
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,89 @@
+"""
+TrackStateStore: which tracks an incremental run visits, and sharing the
+store between shard processes
+Run: python -m pytest tests
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from audiomack_state import FLAT_DAILY_GROWTH, TrackStateStore
+
+NOW = datetime(2026, 8, 25, 4, 0, 0)
+TRACK = {'timestamp': '2026-08-22 04:01:10', 'artist_name': 'A', 'track_title': 'One',
+         'track_url': 'https://audiomack.com/a/song/one', 'plays': '100'}
+
+
+def test_write_waits_for_another_writer(tmp_path):
+    path = str(tmp_path / 'track_state.db')
+    store = TrackStateStore(path)
+    other = sqlite3.connect(path, check_same_thread=False)
+    other.execute('BEGIN IMMEDIATE')  # Another shard mid-write
+    timer = threading.Timer(0.5, other.commit)
+    timer.start()
+    try:
+        store.update(TRACK)
+    finally:
+        timer.join()
+        other.close()
+    assert store.get(TRACK['track_url'])['plays'] == '100'
+    assert store._conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    store.close()
+
+
+def stored(store, plays_then, plays_now, release_date='July 4, 2023', then='2026-08-22 04:00:00',
+           now='2026-08-24 04:00:00'):
+    """The state of TRACK after two scrapes, then and now"""
+    store.update({**TRACK, 'timestamp': then, 'plays': plays_then, 'release_date': release_date})
+    store.update({**TRACK, 'timestamp': now, 'plays': plays_now, 'release_date': release_date})
+    return store.get(TRACK['track_url'])
+
+
+def test_daily_growth_between_scrapes(tmp_path):
+    store = TrackStateStore(str(tmp_path / 'track_state.db'))
+    state = stored(store, '1K', '1.1K')
+    # 10% over two days
+    assert state['daily_growth'] == 0.05
+    assert (state['first_seen'], state['last_changed']) == ('2026-08-22 04:00:00', '2026-08-24 04:00:00')
+    store.close()
+
+
+def test_only_old_flat_recent_tracks_are_carried(tmp_path):
+    store = TrackStateStore(str(tmp_path / 'track_state.db'))
+    flat = stored(store, '1,000,000', '1,000,000')
+    assert flat['daily_growth'] == 0 < FLAT_DAILY_GROWTH
+    assert not store.is_due(flat, NOW)
+
+    assert store.is_due({**flat, 'daily_growth': FLAT_DAILY_GROWTH}, NOW)  # Still growing
+    assert store.is_due({**flat, 'release_date': 'August 1, 2026'}, NOW)  # New release
+    assert store.is_due({**flat, 'release_date': 'N/A'}, NOW)
+    assert store.is_due({**flat, 'timestamp': '2026-08-18 04:00:00'}, NOW)  # Not refreshed for a week
+
+    new_url = 'https://audiomack.com/a/song/new'
+    planned = store.plan([new_url, TRACK['track_url']], 'A renamed', NOW)
+    assert [(url, row is None) for url, row in planned] == [(new_url, True), (TRACK['track_url'], False)]
+    # A carried row is the stored one, under the artist's current name
+    assert planned[1][1]['plays'] == '1,000,000'
+    assert planned[1][1]['artist_name'] == 'A renamed'
+    store.close()
+
+
+def test_carry_artist_returns_the_stored_rows(tmp_path):
+    store = TrackStateStore(str(tmp_path / 'track_state.db'))
+    store.update(TRACK)
+    missing = 'https://audiomack.com/a/song/never-scraped'
+    store.update_artist('a', {'timestamp': '2026-08-22 04:00:00', 'artist_name': 'A'},
+                        [TRACK['track_url'], missing])
+
+    artist_row, track_rows = store.carry_artist('a')
+
+    assert artist_row['artist_name'] == 'A'
+    assert [row['track_url'] for row in track_rows] == [TRACK['track_url']]
+    assert store.artist_last_scraped() == {'a': '2026-08-22 04:00:00'}
+    assert store.carry_artist('b') is None
+    store.close()
@@ -3,88 +3,535 @@
 Update Latest Files Script
 Copies the most recent CSV files to "latest" versions for production use
 Run this after the scraper completes
+
+The newest snapshot is the one with the newest run id in data/manifest.json
+(audiomack_manifest.py), not the newest file on disk. It only replaces its
+latest file when its data changed: rows are compared by URL with the
+timestamp column ignored, and what changed is written to data/changelog.json.
+Latest files, artifacts and the manifest are written to a temp file and
+renamed into place.
+
+With --from-history the latest files are rebuilt from the history store
+(audiomack_history.py) instead, e.g. after the snapshot CSVs were cleaned up
+
+Either way the API artifacts in data/api/ are then published: the exact JSON
+payloads of /api/data, /api/tracks and /api/growth plus a summary with
+per-artist rollups, leaderboards and sorted indexes (/api/summary), and an
+index.json with the content hash (ETag) of each, so the routes serve a file
+instead of parsing CSVs on every request. --publish-only just does that step.
+The artifacts are rebuilt on every run, since they also depend on the growth
+files and the artwork index, but a file is only rewritten when its content
+changed, so an unchanged run touches nothing and there is nothing to commit
+or deploy.
 """
 
+import argparse
+import csv
+import hashlib
+import json
 import os
 import glob
-import shutil
-from datetime import datetime
+import re
+from datetime import datetime, timedelta, timezone
+from decimal import ROUND_HALF_UP, Decimal
+
+from audiomack_artwork import ArtworkCache, artwork_key
+from audiomack_catalog import canonical_track_url
+from audiomack_history import DEFAULT_HISTORY_DB, RUN_ID_FORMAT, HistoryStore
+from audiomack_manifest import Manifest, atomic_copy, atomic_write
+
+# Columns that differ on every run without the data changing
+VOLATILE_COLUMNS = ("timestamp",)
+ROW_KEYS = {"artists": "url", "tracks": "track_url"}
+CHANGELOG = "changelog.json"
+
+def _row_key(kind, row):
+    return (row.get(ROW_KEYS[kind]) or "").strip().rstrip("/").lower()
+
+def _normalized(kind, rows):
+    """{key: rows without volatile columns}; a key that repeats keeps all its rows, in a fixed order"""
+    normalized = {}
+    for row in rows:
+        stable = {c: v for c, v in row.items() if c not in VOLATILE_COLUMNS}
+        normalized.setdefault(_row_key(kind, row), []).append(stable)
+    for key, versions in normalized.items():
+        versions.sort(key=lambda row: json.dumps(row, sort_keys=True, ensure_ascii=False))
+    return normalized
+
+def content_hash(kind, rows):
+    """Hash of a snapshot's data, ignoring volatile columns and row order"""
+    normalized = _normalized(kind, rows)
+    body = json.dumps(sorted(normalized.items()), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+def diff_rows(kind, old_rows, new_rows):
+    """Added / removed / changed rows between two snapshots, by URL"""
+    old = _normalized(kind, old_rows)
+    new = _normalized(kind, new_rows)
+    changed = []
+    for key in new.keys() & old.keys():
+        if old[key] == new[key]:
+            continue
+        before, after = old[key][-1], new[key][-1]
+        fields = {c: [before.get(c), v] for c, v in after.items() if before.get(c) != v}
+        changed.append({ROW_KEYS[kind]: key, "changes": fields})
+    return {
+        "added": sorted(new.keys() - old.keys()),
+        "removed": sorted(old.keys() - new.keys()),
+        "changed": sorted(changed, key=lambda item: item[ROW_KEYS[kind]]),
+    }
 
-def update_latest_files():
-    """Copy newest CSV files to 'latest' versions"""
+def update_latest_file(manifest, kind, force=False):
+    """
+    Copy the newest <kind> snapshot (by run id, from the manifest) to its
+    'latest' file if its data differs, replacing it atomically.
+    Returns (source, diff), with diff None when nothing changed (or no snapshot).
+    """
+    source = manifest.newest_path(kind)
+    if source is None:
+        print(f"\n⚠️  No {kind} CSV files found")
+        return None, None
+
+    latest_name = f"audiomack_{kind}_latest.csv"
+    dest = os.path.join(manifest.data_dir, latest_name)
+    new_rows = _read_csv(source)
+    old_rows = _read_csv(dest) if os.path.exists(dest) else []
+
+    if not force and old_rows and content_hash(kind, old_rows) == content_hash(kind, new_rows):
+        print(f"\nℹ️  {kind.title()} unchanged, keeping {latest_name}")
+        print(f"   Source: {os.path.basename(source)}")
+        if manifest.latest(kind) is None:
+            manifest.set_latest(kind, latest_name)
+        return source, None
+
+    diff = diff_rows(kind, old_rows, new_rows)
+    atomic_copy(source, dest)
+    manifest.set_latest(kind, latest_name, os.path.basename(source))
+    print(f"\n✅ {kind.title()} File Updated:")
+    print(f"   Source:  {os.path.basename(source)}")
+    print(f"   Dest:    audiomack_{kind}_latest.csv")
+    print(f"   Size:    {os.path.getsize(dest):,} bytes")
+    print(f"   Changes: {len(diff['added'])} added, {len(diff['removed'])} removed, "
+          f"{len(diff['changed'])} changed")
+    return source, diff
+
+def write_changelog(data_dir, sources, diffs):
+    """Machine-readable summary of what the last publish changed"""
+    changelog = {"generated": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")}
+    for kind, diff in diffs.items():
+        changelog[kind] = {"source": os.path.basename(sources[kind]) if sources[kind] else None,
+                           "changed": diff is not None}
+        if diff is not None:
+            changelog[kind].update(diff)
+    path = os.path.join(data_dir, CHANGELOG)
+    atomic_write(path, lambda f: json.dump(changelog, f, indent=2, ensure_ascii=False))
+    print(f"📝 Changelog: {path}")
+
+def update_latest_files(force=False):
+    """
+    Copy newest CSV files to 'latest' versions, but only when their data
+    changed (the timestamp column is ignored), then publish the artifacts,
+    so unchanged runs leave the repository untouched. Returns (success, changed).
+    """
     data_dir = "data"
     
     if not os.path.exists(data_dir):
         print(f"❌ Error: {data_dir} directory not found")
-        return False
+        return False, False
     
     print("=" * 60)
     print("📂 Updating Latest CSV Files")
     print("=" * 60)
-    
-    # Find latest artist file
-    artist_files = glob.glob(f"{data_dir}/audiomack_artists_*.csv")
-    artist_files = [f for f in artist_files if "latest" not in f]
-    
-    if artist_files:
-        # Sort by modification time (newest first)
-        latest_artist = max(artist_files, key=os.path.getctime)
-        dest_artist = f"{data_dir}/audiomack_artists_latest.csv"
-        shutil.copy2(latest_artist, dest_artist)
-        print(f"\n✅ Artist File Updated:")
-        print(f"   Source: {os.path.basename(latest_artist)}")
-        print(f"   Dest:   audiomack_artists_latest.csv")
-        print(f"   Size:   {os.path.getsize(dest_artist):,} bytes")
-    else:
-        print("\n⚠️  No artist CSV files found")
-    
-    # Find latest tracks file
-    track_files = glob.glob(f"{data_dir}/audiomack_tracks_*.csv")
-    track_files = [f for f in track_files if "latest" not in f]
-    
-    if track_files:
-        latest_track = max(track_files, key=os.path.getctime)
-        dest_track = f"{data_dir}/audiomack_tracks_latest.csv"
-        shutil.copy2(latest_track, dest_track)
-        print(f"\n✅ Track File Updated:")
-        print(f"   Source: {os.path.basename(latest_track)}")
-        print(f"   Dest:   audiomack_tracks_latest.csv")
-        print(f"   Size:   {os.path.getsize(dest_track):,} bytes")
-    else:
-        print("\n⚠️  No track CSV files found")
+
+    manifest = Manifest.load(data_dir)
+    sources, diffs = {}, {}
+    for kind in ("artists", "tracks"):
+        sources[kind], diffs[kind] = update_latest_file(manifest, kind, force)
+    changed = any(diff is not None for diff in diffs.values())
     
     # Optional: Clean up old files (keep last 30 days)
     print("\n" + "=" * 60)
-    cleanup_old_files(data_dir, days=30)
+    cleanup_old_files(manifest, days=30)
+    manifest.refresh()
+    manifest.save()
+
+    print("\n" + "=" * 60)
+    if changed:
+        write_changelog(data_dir, sources, diffs)
+    else:
+        print("ℹ️  Latest data unchanged since the last publish")
+    rewritten = publish_artifacts(data_dir, manifest)
     
+    return True, changed or bool(rewritten)
+
+def regenerate_latest_files(history_db=DEFAULT_HISTORY_DB):
+    """Write the 'latest' files from the newest run in the history store"""
+    data_dir = "data"
+
+    if not os.path.exists(history_db):
+        print(f"❌ Error: history store {history_db} not found")
+        return False
+
+    print("=" * 60)
+    print("🗄️  Regenerating Latest CSV Files from History")
+    print("=" * 60)
+
+    os.makedirs(data_dir, exist_ok=True)
+    manifest = Manifest.load(data_dir)
+    store = HistoryStore(history_db)
+    try:
+        for kind in ("artists", "tracks"):
+            latest = store.latest_rows(kind)
+            if latest is None:
+                print(f"\n⚠️  No {kind} runs in {history_db}")
+                continue
+            columns, rows = latest
+
+            def write(f):
+                writer = csv.DictWriter(f, fieldnames=columns)
+                writer.writeheader()
+                writer.writerows(rows)
+            atomic_write(f"{data_dir}/audiomack_{kind}_latest.csv", write)
+            manifest.set_latest(kind, f"audiomack_{kind}_latest.csv", run_id=store.last_run(kind))
+            print(f"\n✅ {kind.title()} File Regenerated:")
+            print(f"   Run:    {store.last_run(kind)}")
+            print(f"   Dest:   audiomack_{kind}_latest.csv")
+            print(f"   Rows:   {len(rows):,}")
+    finally:
+        store.close()
+    manifest.save()
+
+    print("\n" + "=" * 60)
+    publish_artifacts(data_dir, manifest)
+
     return True
 
-def cleanup_old_files(data_dir, days=30):
-    """Remove CSV files older than specified days"""
-    cutoff_time = datetime.now().timestamp() - (days * 86400)
-    
-    all_csv_files = glob.glob(f"{data_dir}/audiomack_*.csv")
-    all_csv_files = [f for f in all_csv_files if "latest" not in f]
+ARTIFACT_DIR = "api"
+LEADERBOARD_SIZE = 50
+ENGAGEMENT_MIN_PLAYS = 1000  # Tracks below this are left out of the engagement leaderboard
+# Payload fields naming the run's snapshot files, left out of the ETag
+VOLATILE_PAYLOAD_FIELDS = ("artistFile", "trackFile")
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+def _js_int(value):
+    """parseInt() as the dashboard does it: leading digits, 0 when there are none"""
+    match = re.match(r"\s*([+-]?\d+)", str(value or ""))
+    return int(match.group(1)) if match else 0
+
+def _engagement_rate(plays, likes, reposts):
+    """Same value and 2-decimal string as the routes' calculateEngagementRate"""
+    p = _js_int(plays)
+    if p == 0:
+        return "0.00"
+    rate = (_js_int(likes) + _js_int(reposts)) / p * 100
+    return str(Decimal(rate).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+def _last_scraped(rows):
+    """Newest row timestamp in ISO form (not the file time, so unchanged data republishes identically)"""
+    stamps = [row.get("timestamp") or "" for row in rows]
+    return max(stamps).replace(" ", "T") if any(stamps) else None
+
+def _thumbnail(artwork, row, column):
+    """Local thumbnail URL of a row's image (None when not cached, the card then uses the CDN URL)"""
+    if artwork is None:
+        return None
+    return artwork.thumbnail_url(row.get(f"{column}_key") or artwork_key(row.get(column)))
+
+def build_artist_payload(path, artwork=None):
+    """Payload of /api/data for an artists CSV"""
+    rows = _read_csv(path)
+    artists = []
+    for row in rows:
+        artists.append({
+            "timestamp": row.get("timestamp"),
+            "artist_name": row.get("artist_name"),
+            "url": row.get("url"),
+            "profile_image": row.get("profile_image") or "N/A",
+            "followers": row.get("followers"),
+            "total_plays": row.get("total_plays"),
+            "monthly_listeners": row.get("monthly_listeners") or row.get("total_plays"),
+            "top_tracks_count": _js_int(row.get("top_tracks_count")) or _js_int(row.get("tracks_found")),
+            "member_since": row.get("member_since"),
+            "top_tracks": json.loads(row["top_tracks"]) if row.get("top_tracks") else [],
+            "profile_image_thumb": _thumbnail(artwork, row, "profile_image"),
+        })
+    return {
+        "data": artists,
+        "filename": os.path.basename(path),
+        "lastUpdated": _last_scraped(rows),
+        "source": "artifact",
+        "count": len(artists),
+    }
+
+def build_track_payload(path, artwork=None):
+    """Payload of /api/tracks for a tracks CSV"""
+    rows = _read_csv(path)
+    tracks = []
+    for row in rows:
+        tracks.append({
+            "timestamp": row.get("timestamp"),
+            "artist_name": row.get("artist_name"),
+            "track_title": row.get("track_title"),
+            "track_url": row.get("track_url"),
+            "album_art": row.get("album_art") or "N/A",
+            "plays": row.get("plays"),
+            "likes": row.get("likes"),
+            "reposts": row.get("reposts"),
+            "playlist_adds": row.get("playlist_adds"),
+            "release_date": row.get("release_date"),
+            "engagement_rate": _engagement_rate(row.get("plays"), row.get("likes"), row.get("reposts")),
+            "album_art_thumb": _thumbnail(artwork, row, "album_art"),
+        })
+    return {
+        "tracks": tracks,
+        "filename": os.path.basename(path),
+        "lastUpdated": _last_scraped(rows),
+        "source": "artifact",
+        "totalTracks": len(tracks),
+    }
+
+def build_growth_payload(manifest):
+    """Payload of /api/growth from the newest with_growth files"""
+    artist_file = manifest.newest_path("artists_with_growth")
+    track_file = manifest.newest_path("tracks_with_growth")
+    return {
+        "artists": _read_csv(artist_file) if artist_file else [],
+        "tracks": _read_csv(track_file) if track_file else [],
+        "hasGrowthData": bool(artist_file or track_file),
+        "artistFile": os.path.basename(artist_file) if artist_file else None,
+        "trackFile": os.path.basename(track_file) if track_file else None,
+    }
+
+def _release_key(value):
+    try:
+        return datetime.strptime((value or "").strip(), "%B %d, %Y")
+    except ValueError:
+        return datetime.min
+
+def read_track_artists(manifest):
+    """Canonical track URL -> URLs of the artists listing it, from the newest links file ({} if none)"""
+    path = manifest.newest_path("track_artists")
+    links = {}
+    if path:
+        for row in _read_csv(path):
+            links.setdefault(canonical_track_url(row["track_url"]), []).append(row["artist_url"])
+    return links
+
+def build_summary(artist_payload, track_payload, links=None):
+    """
+    Per-artist rollups, leaderboards and sorted indexes, with real numbers.
+    With links (read_track_artists), a song counts for every artist whose
+    catalog lists it, not only the one its row is under.
+    """
+    artists = artist_payload["data"]
+    tracks = track_payload["tracks"]
+    track_plays = [_js_int(t["plays"]) for t in tracks]
+    track_engagement = [float(t["engagement_rate"]) for t in tracks]
+
+    names = {artist["url"]: artist["artist_name"] for artist in artists}
+    by_artist = {}
+    for i, track in enumerate(tracks):
+        by_artist.setdefault(track["artist_name"], set()).add(i)
+        for artist_url in (links or {}).get(canonical_track_url(track["track_url"]), ()):
+            if artist_url in names:
+                by_artist.setdefault(names[artist_url], set()).add(i)
+    by_artist = {name: sorted(positions) for name, positions in by_artist.items()}
+
+    summaries = {}
+    for artist in artists:
+        positions = by_artist.get(artist["artist_name"], [])
+        top = max(positions, key=lambda i: track_plays[i], default=None)
+        catalog_plays = sum(track_plays[i] for i in positions)
+        summaries[artist["url"]] = {
+            "artist_name": artist["artist_name"],
+            "followers": _js_int(artist["followers"]),
+            "total_plays": _js_int(artist["total_plays"]),
+            "track_count": len(positions),
+            "catalog_plays": catalog_plays,
+            "avg_track_plays": round(catalog_plays / len(positions)) if positions else 0,
+            "avg_engagement": round(sum(track_engagement[i] for i in positions) / len(positions), 2)
+            if positions else 0,
+            "top_track": {
+                "track_title": tracks[top]["track_title"],
+                "track_url": tracks[top]["track_url"],
+                "plays": track_plays[top],
+            } if top is not None else None,
+        }
+
+    indexes = {
+        "tracks_by_plays": sorted(range(len(tracks)), key=lambda i: -track_plays[i]),
+        "tracks_by_engagement": sorted(range(len(tracks)), key=lambda i: -track_engagement[i]),
+        "tracks_by_release_date": sorted(range(len(tracks)),
+                                         key=lambda i: _release_key(tracks[i]["release_date"]), reverse=True),
+        "artists_by_followers": sorted(range(len(artists)), key=lambda i: -_js_int(artists[i]["followers"])),
+        "artists_by_total_plays": sorted(range(len(artists)), key=lambda i: -_js_int(artists[i]["total_plays"])),
+    }
+
+    def track_entry(i):
+        return {"position": i, "artist_name": tracks[i]["artist_name"], "track_title": tracks[i]["track_title"],
+                "track_url": tracks[i]["track_url"], "plays": track_plays[i],
+                "engagement_rate": track_engagement[i]}
+
+    def artist_entry(i):
+        return {"position": i, "artist_name": artists[i]["artist_name"], "url": artists[i]["url"],
+                "followers": _js_int(artists[i]["followers"]), "total_plays": _js_int(artists[i]["total_plays"])}
+
+    leaderboards = {
+        "top_tracks_by_plays": [track_entry(i) for i in indexes["tracks_by_plays"][:LEADERBOARD_SIZE]],
+        "top_tracks_by_engagement": [track_entry(i) for i in indexes["tracks_by_engagement"]
+                                     if track_plays[i] >= ENGAGEMENT_MIN_PLAYS][:LEADERBOARD_SIZE],
+        "top_artists_by_followers": [artist_entry(i) for i in indexes["artists_by_followers"][:LEADERBOARD_SIZE]],
+        "top_artists_by_total_plays": [artist_entry(i)
+                                       for i in indexes["artists_by_total_plays"][:LEADERBOARD_SIZE]],
+    }
+
+    return {
+        "artistFile": artist_payload["filename"],
+        "trackFile": track_payload["filename"],
+        "totals": {
+            "artists": len(artists),
+            "tracks": len(tracks),
+            "followers": sum(s["followers"] for s in summaries.values()),
+            "track_plays": sum(track_plays),
+        },
+        "artists": summaries,
+        "leaderboards": leaderboards,
+        "indexes": indexes,
+    }
+
+def _write_if_changed(path, body):
+    """Atomically write body (bytes) to path unless it already holds exactly that; True if written"""
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            if f.read() == body:
+                return False
+    atomic_write(path, lambda f: f.write(body), binary=True)
+    return True
+
+def _write_artifact(directory, name, payload, previous=None):
+    """
+    Write one JSON artifact if its content changed.
+    The ETag hashes the payload without its VOLATILE_PAYLOAD_FIELDS, which
+    name the run's snapshot files, so a run over identical data keeps the
+    previous index entry (and file) instead of rewriting both.
+    Returns (index entry with ETag = content hash, whether the file was rewritten).
+    """
+    stable = {key: value for key, value in payload.items() if key not in VOLATILE_PAYLOAD_FIELDS}
+    digest = hashlib.sha256(json.dumps(stable, ensure_ascii=False, separators=(",", ":"))
+                            .encode("utf-8")).hexdigest()
+    path = os.path.join(directory, f"{name}.json")
+    if previous and previous.get("sha256") == digest and os.path.exists(path):
+        return previous, False
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    written = _write_if_changed(path, body)
+    entry = {"file": f"{name}.json", "etag": f'"{digest[:32]}"', "sha256": digest, "bytes": len(body)}
+    return entry, written
+
+def _read_index(directory):
+    """Artifact entries of the published index.json ({} if there is none)"""
+    path = os.path.join(directory, "index.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("artifacts", {})
+
+def publish_artifacts(data_dir="data", manifest=None):
+    """
+    Precompute the JSON payloads the API routes serve, plus their ETags.
+    Returns the names of the files that were rewritten ([] if all were up to
+    date), or None when there are no latest files to publish.
+    """
+    manifest = manifest or Manifest.load(data_dir)
+    artist_file = f"{data_dir}/audiomack_artists_latest.csv"
+    track_file = f"{data_dir}/audiomack_tracks_latest.csv"
+    if not (os.path.exists(artist_file) and os.path.exists(track_file)):
+        print("⚠️  No latest CSV files, API artifacts not published")
+        return None
+
+    print("📦 Publishing API Artifacts")
+    directory = os.path.join(data_dir, ARTIFACT_DIR)
+    os.makedirs(directory, exist_ok=True)
+
+    artwork = ArtworkCache()
+    artist_payload = build_artist_payload(artist_file, artwork)
+    track_payload = build_track_payload(track_file, artwork)
+    payloads = {
+        "artists": artist_payload,
+        "tracks": track_payload,
+        "growth": build_growth_payload(manifest),
+        "summary": build_summary(artist_payload, track_payload, read_track_artists(manifest)),
+    }
+
+    previous = _read_index(directory)
+    index = {"artifacts": {}}
+    rewritten = []
+    for name, payload in payloads.items():
+        entry, written = _write_artifact(directory, name, payload, previous.get(name))
+        index["artifacts"][name] = entry
+        if written:
+            rewritten.append(entry["file"])
+        print(f"   {entry['file']:<14} {entry['bytes']:>10,} bytes  ETag {entry['etag']}"
+              f"{'' if written else '  (unchanged)'}")
+    # Last, so the index never points at an artifact that is not written yet
+    if _write_if_changed(os.path.join(directory, "index.json"), json.dumps(index, indent=2).encode("utf-8")):
+        rewritten.append("index.json")
+
+    if rewritten:
+        print(f"✅ Artifacts written to {directory}/: {', '.join(rewritten)}")
+    else:
+        print(f"ℹ️  Artifacts in {directory}/ already up to date")
+    return rewritten
+
+def cleanup_old_files(manifest, days=30):
+    """
+    Remove snapshot CSVs whose run (run id in the manifest, not the file
+    time, which a git checkout resets) is more than days older than the
+    newest run in the manifest. Age is not measured from today, so a data
+    directory that has not been scraped for a while keeps its last days of
+    runs. The newest snapshot of each kind is always kept.
+    """
+    snapshots = manifest.data["snapshots"]
+    if not snapshots:
+        print("ℹ️  No snapshots to clean up")
+        return
+    newest_run = max(entry["run_id"] for entry in snapshots.values())
+    cutoff = (datetime.strptime(newest_run, RUN_ID_FORMAT) - timedelta(days=days)).strftime(RUN_ID_FORMAT)
+    newest = {manifest.newest(kind) for kind in {entry["kind"] for entry in snapshots.values()}}
     
     removed_count = 0
     removed_size = 0
     
-    for file_path in all_csv_files:
-        if os.path.getctime(file_path) < cutoff_time:
-            try:
-                file_size = os.path.getsize(file_path)
-                os.remove(file_path)
-                removed_count += 1
-                removed_size += file_size
-                print(f"🗑️  Removed: {os.path.basename(file_path)} ({file_size:,} bytes)")
-            except Exception as e:
-                print(f"❌ Error removing {file_path}: {e}")
+    for name, entry in sorted(snapshots.items(), key=lambda item: item[1]["run_id"]):
+        if entry["run_id"] >= cutoff or name in newest:
+            continue
+        file_path = os.path.join(manifest.data_dir, name)
+        try:
+            file_size = os.path.getsize(file_path)
+            os.remove(file_path)
+            removed_count += 1
+            removed_size += file_size
+            print(f"🗑️  Removed: {name} (run {entry['run_id']}, {file_size:,} bytes)")
+        except Exception as e:
+            print(f"❌ Error removing {file_path}: {e}")
     
     if removed_count > 0:
         print(f"\n✅ Cleaned up {removed_count} old file(s)")
         print(f"   Freed up: {removed_size:,} bytes ({removed_size / 1024 / 1024:.2f} MB)")
     else:
-        print("ℹ️  No old files to clean up (all files < {days} days old)")
+        print(f"ℹ️  No old files to clean up (all runs within {days} days of run {newest_run})")
+
+def _run_id_of(manifest, name):
+    """Run id a data file holds: its own for a snapshot, its source's for a latest file"""
+    entry = manifest.data["snapshots"].get(name)
+    if entry:
+        return entry["run_id"]
+    for latest in manifest.data["latest"].values():
+        if latest.get("file") == name:
+            return latest.get("run_id") or ""
+    return ""
 
 def show_current_files():
     """Display current files in data directory"""
@@ -94,8 +541,11 @@ def show_current_files():
     print("📊 Current Data Files:")
     print("=" * 60)
     
+    manifest = Manifest.load(data_dir, refresh=False)
     all_files = glob.glob(f"{data_dir}/*.csv")
-    all_files.sort(key=os.path.getctime, reverse=True)
+    # Latest files first, then the snapshots, newest run first
+    all_files.sort(key=lambda path: ("latest" in path, _run_id_of(manifest, os.path.basename(path)),
+                                     os.path.basename(path)), reverse=True)
     
     if not all_files:
         print("No CSV files found")
@@ -104,21 +554,39 @@ def show_current_files():
     for file_path in all_files:
         filename = os.path.basename(file_path)
         size = os.path.getsize(file_path)
-        mtime = datetime.fromtimestamp(os.path.getmtime(file_path))
+        run_id = _run_id_of(manifest, filename)
         
         # Highlight "latest" files
         marker = "⭐" if "latest" in filename else "  "
         
         print(f"{marker} {filename}")
-        print(f"   Size: {size:,} bytes | Modified: {mtime.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"   Size: {size:,} bytes | Run: {run_id or 'unknown'}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update the audiomack_*_latest.csv files")
+    parser.add_argument("--from-history", action="store_true",
+                        help="rebuild them from the history store instead of the newest CSVs")
+    parser.add_argument("--history-db", default=DEFAULT_HISTORY_DB, help="history store path")
+    parser.add_argument("--force", action="store_true",
+                        help="update and publish even when the data did not change")
+    parser.add_argument("--publish-only", action="store_true",
+                        help="only publish the API artifacts from the current latest files")
+    args = parser.parse_args()
+
     print("\n")
-    success = update_latest_files()
+    changed = True
+    if args.publish_only:
+        success = publish_artifacts() is not None
+    elif args.from_history:
+        success = regenerate_latest_files(args.history_db)
+    else:
+        success, changed = update_latest_files(args.force)
     show_current_files()
     
     print("\n" + "=" * 60)
-    if success:
+    if success and not changed:
+        print("ℹ️  No data changes - nothing to commit")
+    elif success:
         print("✅ Update complete!")
         print("\nNext steps:")
         print("1. Run: git add data/audiomack_*_latest.csv")